@@ -0,0 +1,59 @@
+"""content history keyset indexes
+
+Composite indexes backing keyset (cursor) pagination of /content/history, which reads
+WHERE user_id = ? [AND content_type = ?] ORDER BY created_at DESC, id. Built
+CONCURRENTLY so existing generated_content tables stay writable; IF NOT EXISTS because
+create_tables() already creates them on fresh dev databases.
+
+Revision ID: 3f2a9c1d7b40
+Revises:
+Create Date: 2026-10-17 03:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_generated_content_user_type_created",
+            "generated_content",
+            ["user_id", "content_type", sa.text("created_at DESC"), "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_generated_content_user_created",
+            "generated_content",
+            ["user_id", sa.text("created_at DESC"), "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_generated_content_user_created",
+            table_name="generated_content",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_generated_content_user_type_created",
+            table_name="generated_content",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""content analytics content_id index
+
+content_analytics.content_id references generated_content ON DELETE CASCADE but had no
+index, so every deleted content row scanned the whole analytics table (deleting a large
+library was O(rows x analytics)). Also serves the per-user analytics export join.
+
+Revision ID: 8c41d2e5a9f3
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-17 03:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d2e5a9f3'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_content_analytics_content_id",
+            "content_analytics",
+            ["content_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_content_analytics_content_id",
+            table_name="content_analytics",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,65 @@
+"""content search vector
+
+Full-text search over generated_content for /content/search: a stored generated tsvector
+(title A, summary B, tags C, first 100k chars of content D) with a GIN index, plus a
+trigram GIN index on title for fuzzy matches when the pg_trgm extension is available
+(it is a contrib module; without it search is full-text only). Adding a stored generated
+column rewrites the table under an ACCESS EXCLUSIVE lock - run it in a maintenance window
+on large tables. The indexes are built CONCURRENTLY afterwards. IF [NOT] EXISTS because
+create_tables() already creates all of this on fresh dev databases.
+
+Revision ID: b7e19f04c6a2
+Revises: 8c41d2e5a9f3
+Create Date: 2026-10-17 04:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e19f04c6a2'
+down_revision: Union[str, Sequence[str], None] = '8c41d2e5a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+    "setweight(json_to_tsvector('english', coalesce(tags, '[]'::json), '[\"string\"]'), 'C') || "
+    "setweight(to_tsvector('english', left(coalesce(content, ''), 100000)), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "ALTER TABLE generated_content ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    trigram = op.get_bind().exec_driver_sql(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    ).scalar()
+    if trigram:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_generated_content_search_vector "
+            "ON generated_content USING gin (search_vector)"
+        )
+        if trigram:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_generated_content_title_trgm "
+                "ON generated_content USING gin (title gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_generated_content_title_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_generated_content_search_vector")
+    # ✅ pg_trgm is left installed: other schemas may use it
+    op.execute("ALTER TABLE generated_content DROP COLUMN IF EXISTS search_vector")
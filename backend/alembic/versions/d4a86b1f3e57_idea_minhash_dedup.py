@@ -0,0 +1,45 @@
+"""idea minhash dedup
+
+Near-duplicate detection for generated ideas: a nullable MinHash signature column on
+generated_content (adding it does not rewrite the table) and content_minhash_bands, one row
+per LSH band keyed by a hash of (user, band), with an index on content_id for ON DELETE
+CASCADE. Ideas saved before this revision have no signature and are never reported as
+duplicates. IF [NOT] EXISTS because create_tables() already creates all of this on fresh
+dev databases.
+
+Revision ID: d4a86b1f3e57
+Revises: b7e19f04c6a2
+Create Date: 2026-10-17 05:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a86b1f3e57'
+down_revision: Union[str, Sequence[str], None] = 'b7e19f04c6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE generated_content ADD COLUMN IF NOT EXISTS minhash bytea")
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS content_minhash_bands ("
+        "band_key bigint NOT NULL, "
+        "content_id uuid NOT NULL REFERENCES generated_content (id) ON DELETE CASCADE, "
+        "PRIMARY KEY (band_key, content_id))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_content_minhash_bands_content_id "
+        "ON content_minhash_bands (content_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS content_minhash_bands")
+    op.execute("ALTER TABLE generated_content DROP COLUMN IF EXISTS minhash")
@@ -1,25 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_db
-from app.models.analytics import AnalyticsData
 from app.schemas.analytics import AnalyticsResponse
-from app.core.security import get_current_active_user
-from app.models.user import User
+from app.core.security import get_current_principal
+from app.core.token_cache import UserSnapshot
+from app.services import analytics_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[AnalyticsResponse])
-def get_user_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_user_analytics(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    analytics = (
-        db.query(AnalyticsData)
-        .filter(AnalyticsData.user_id == current_user.id)
-        .all()
-    )
+    analytics = await analytics_service.get_user_analytics(db, current_user.id)
     if not analytics:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -29,19 +25,12 @@ def get_user_analytics(
 
 
 @router.get("/{platform}", response_model=AnalyticsResponse)
-def get_platform_analytics(
+async def get_platform_analytics(
     platform: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    analytics = (
-        db.query(AnalyticsData)
-        .filter(
-            AnalyticsData.user_id == current_user.id,
-            AnalyticsData.platform == platform
-        )
-        .first()
-    )
+    analytics = await analytics_service.get_platform_analytics(db, current_user.id, platform)
     if not analytics:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,46 +1,84 @@
-import os
+import json
 import traceback
 import logging
 import asyncio
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from fastapi import (
-    APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
 # Core & Models
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User
+from app.core.config import settings
+from app.core.cursor import (
+    InvalidCursorError,
+    KeysetPosition,
+    SearchPosition,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.security import get_current_principal
+from app.core.token_cache import UserSnapshot
 from app.models.content import GeneratedContent, ContentType
 from app.schemas.content import (
     ContentIdeaRequest,
     ContentIdeaResponse,
+    ContentIdeaBatchRequest,
+    ContentIdeaBatchItem,
+    ContentIdeaBatchResponse,
     VideoRepurposeResponse,
     ContentHistoryResponse,
+    ContentSearchResult,
+    RepurposeJobResponse,
+    RepurposeJobStatus,
 )
 from app.services.ai_service import ai_service
 from app.services.content_service import content_service
+from app.services.export_service import MEDIA_TYPES, export_service
+from app.services.idea_dedup import idea_dedup, idea_signature
+from app.services.search_service import search_service
+from app.services.idea_batching import IdeaJob
+from app.services.job_registry import job_registry
+from app.services.quota_service import quota_service
+from app.services.media_ingest import IngestedUpload, media_ingestor
+from app.services.repurpose_service import repurpose_service
+from app.core.celery_app import celery_app, process_repurpose_job
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# ✅ Celery state -> public job state
+JOB_STATES = {
+    "PENDING": "queued",
+    "STARTED": "running",
+    "PROGRESS": "running",
+    "SUCCESS": "completed",
+    "FAILED": "failed",
+    "FAILURE": "failed",
+}
+JOB_EVENTS_POLL_SECONDS = 1
+
 # =========================================================
 # ✅ GENERATE CONTENT IDEAS (ASYNC)
 # =========================================================
-@router.post("/generate-ideas", response_model=List[ContentIdeaResponse])
-async def generate_content_ideas(
-    request: ContentIdeaRequest,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    logger.info(f"===== [DEBUG] Generating content ideas for user: {current_user.email} =====")
+def _idea_context(request: ContentIdeaRequest, current_user: UserSnapshot):
+    def safe_str(field): return str(field) if field else ""
+    niche = request.niche or safe_str(current_user.primary_niche)
+    audience = request.audience or safe_str(current_user.target_audience)
+    return niche, audience
+
 
-    if not current_user.can_generate_content_ideas():
+async def _reserve_ideas_quota(db: AsyncSession, current_user: UserSnapshot, amount: int = 1):
+    reservation = await quota_service.reserve(db, current_user.id, "content_ideas", amount=amount)
+    if reservation is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
@@ -49,55 +87,81 @@ async def generate_content_ideas(
                 "upgrade_required": True
             }
         )
+    return reservation
+
+
+def _idea_row(user_id: UUID, request: ContentIdeaRequest, idea: Dict) -> Dict:
+    """GeneratedContent row for content_service.bulk_insert_rows (id comes back from the insert)."""
+    return {
+        "user_id": user_id,
+        "content_type": ContentType.IDEA,
+        "title": idea.get("title", ""),
+        "content": idea.get("description", ""),
+        "minhash": idea_signature(idea.get("title", ""), idea.get("description", "")),
+        "content_metadata": {
+            "topic": request.topic,
+            "niche": request.niche,
+            "platform": request.platform,
+            "engagement_potential": idea.get("engagement_score", 0)
+        }
+    }
+
+
+def _idea_response(content_id: UUID, request: ContentIdeaRequest, idea: Dict) -> ContentIdeaResponse:
+    return ContentIdeaResponse(
+        id=content_id,
+        title=idea.get("title", ""),
+        description=idea.get("description", ""),
+        engagement_score=idea.get("engagement_score", 0),
+        hashtags=idea.get("hashtags", []),
+        platform_optimized=request.platform
+    )
 
-    def safe_str(field): return str(field) if field else ""
+
+@router.post("/generate-ideas", response_model=List[ContentIdeaResponse])
+async def generate_content_ideas(
+    request: ContentIdeaRequest,
+    current_user: UserSnapshot = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    logger.info(f"===== [DEBUG] Generating content ideas for user: {current_user.email} =====")
+
+    reservation = await _reserve_ideas_quota(db, current_user)
 
     try:
-        niche = request.niche or safe_str(current_user.primary_niche)
-        audience = request.audience or safe_str(current_user.target_audience)
+        niche, audience = _idea_context(request, current_user)
 
         logger.info(f"STAGE ✅: Requesting AI Service: Topic={request.topic}, Niche={niche}, Audience={audience}")
-        ideas = await ai_service.generate_content_ideas(
-            topic=request.topic,
-            niche=niche,
-            audience=audience,
-            count=min(request.count, 10),
-            platform=request.platform
-        )
-
-        saved_ideas: List[ContentIdeaResponse] = []
-
-        for idea in ideas:
-            content_id = uuid4()
-            user_id = UUID(str(current_user.id))
-            content_record = GeneratedContent(
-                id=content_id,
-                user_id=user_id,
-                content_type=ContentType.IDEA,
-                title=idea.get("title", ""),
-                content=idea.get("description", ""),
-                metadata={
-                    "topic": request.topic,
-                    "niche": request.niche,
-                    "platform": request.platform,
-                    "engagement_potential": idea.get("engagement_score", 0)
-                }
+        if settings.IDEA_DEDUP_ENABLED:
+            # ✅ Ideas repeating the user's library are dropped and re-asked
+            ideas = await ai_service.generate_fresh_content_ideas(
+                topic=request.topic,
+                niche=niche,
+                audience=audience,
+                find_repeats=idea_dedup.repeat_filter(db, current_user.id),
+                count=min(request.count, 10),
+                platform=request.platform,
+                use_cache=request.use_cache
             )
-            db.add(content_record)
-
-            saved_ideas.append(
-                ContentIdeaResponse(
-                    id=content_id,
-                    title=idea.get("title", ""),
-                    description=idea.get("description", ""),
-                    engagement_score=idea.get("engagement_score", 0),
-                    hashtags=idea.get("hashtags", []),
-                    platform_optimized=request.platform
-                )
+        else:
+            ideas = await ai_service.generate_content_ideas(
+                topic=request.topic,
+                niche=niche,
+                audience=audience,
+                count=min(request.count, 10),
+                platform=request.platform,
+                use_cache=request.use_cache
             )
 
-        current_user.increment_content_ideas_used()
-        await db.commit()
+        # ✅ One multi-row INSERT ... RETURNING id for every idea
+        content_ids = await content_service.bulk_insert_rows(
+            db, [_idea_row(current_user.id, request, idea) for idea in ideas]
+        )
+        saved_ideas = [_idea_response(content_id, request, idea) for content_id, idea in zip(content_ids, ideas)]
+        if saved_ideas:
+            quota_service.commit(reservation)
+        else:
+            await quota_service.refund(db, reservation)
 
         logger.info(f"✅ Successfully generated & saved {len(saved_ideas)} ideas for {current_user.email}")
         return saved_ideas
@@ -106,26 +170,185 @@ async def generate_content_ideas(
         logger.error(f"❌ Error generating content ideas: {e}")
         logger.error(traceback.format_exc())
         await db.rollback()
+        await quota_service.refund(db, reservation)
         raise HTTPException(status_code=500, detail="Failed to generate content ideas.")
 
 
 # =========================================================
-# ✅ REPURPOSE VIDEO CONTENT (ASYNC)
+# ✅ GENERATE CONTENT IDEAS - BATCH (Many topics, one request)
 # =========================================================
-@router.post("/repurpose-video", response_model=VideoRepurposeResponse)
-async def repurpose_video_content(
-    video_file: UploadFile = File(...),
-    title: str = Form(...),
-    description: Optional[str] = Form(None),
-    target_platforms: str = Form("youtube,instagram,tiktok"),
-    tone: str = Form("professional"),
-    current_user: User = Depends(get_current_user),
+@router.post("/generate-ideas/batch", response_model=ContentIdeaBatchResponse)
+async def generate_content_ideas_batch(
+    request: ContentIdeaBatchRequest,
+    current_user: UserSnapshot = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    trace_id = f"repurpose-{uuid4()}"
-    logger.info(f"===== [TRACE {trace_id}] Starting video repurpose for {current_user.email} =====")
+    """
+    One quota reservation for all items (one unit each, given back for items left without
+    ideas), packed LLM calls, one bulk insert.
+    """
+    if len(request.items) > settings.AI_IDEA_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.AI_IDEA_BATCH_MAX_ITEMS} items per batch"
+        )
+
+    reservation = await _reserve_ideas_quota(db, current_user, amount=len(request.items))
 
-    if not current_user.can_repurpose_video():
+    try:
+        jobs = []
+        for item in request.items:
+            niche, audience = _idea_context(item, current_user)
+            jobs.append(IdeaJob(item.topic, niche, audience, min(item.count, 10), item.platform, item.use_cache))
+
+        results, completions = await ai_service.generate_content_ideas_batch(jobs, user_id=current_user.id)
+        if settings.IDEA_DEDUP_ENABLED:
+            # ✅ Repeats of the library or of another item's ideas are dropped, then re-asked per item
+            repeats = iter(await idea_dedup.find_repeats(db, current_user.id, [idea for ideas in results for idea in ideas]))
+            flags = [[next(repeats) for _ in ideas] for ideas in results]
+            find_repeats = idea_dedup.repeat_filter(db, current_user.id)
+            results = await asyncio.gather(*(
+                ai_service.refill_repeated_ideas(
+                    job.topic, job.niche, job.audience, job.count, job.platform,
+                    fresh=[idea for idea, repeat in zip(ideas, item_flags) if not repeat],
+                    repeated_titles=[idea["title"] for idea, repeat in zip(ideas, item_flags) if repeat],
+                    find_repeats=find_repeats,
+                    use_cache=job.use_cache
+                )
+                for job, ideas, item_flags in zip(jobs, results, flags)
+            ))
+
+        rows = [_idea_row(current_user.id, item, idea) for item, ideas in zip(request.items, results) for idea in ideas]
+        content_ids = iter(await content_service.bulk_insert_rows(db, rows))
+        batch_items = [
+            ContentIdeaBatchItem(topic=item.topic, ideas=[_idea_response(next(content_ids), item, idea) for idea in ideas])
+            for item, ideas in zip(request.items, results)
+        ]
+        empty = sum(not ideas for ideas in results)
+        if empty:
+            # ✅ One unit back per topic that ended with no ideas
+            await quota_service.refund(db, reservation, amount=empty)
+        quota_service.commit(reservation)
+
+        logger.info(
+            f"✅ Batch generated & saved {len(rows)} ideas for {len(jobs)} topics "
+            f"({completions} completions) for {current_user.email}"
+        )
+        return ContentIdeaBatchResponse(results=batch_items, total_ideas=len(rows), completions=completions)
+
+    except Exception as e:
+        logger.error(f"❌ Error generating batched content ideas: {e}")
+        logger.error(traceback.format_exc())
+        await db.rollback()
+        await quota_service.refund(db, reservation)
+        raise HTTPException(status_code=500, detail="Failed to generate content ideas.")
+
+
+# =========================================================
+# ✅ GENERATE CONTENT IDEAS - STREAMING (SSE)
+# =========================================================
+@router.post("/generate-ideas/stream")
+async def stream_content_ideas(
+    request: ContentIdeaRequest,
+    current_user: UserSnapshot = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Server-sent events: one `idea` event per idea as soon as it is generated and saved, then `done`."""
+    reservation = await _reserve_ideas_quota(db, current_user)
+    niche, audience = _idea_context(request, current_user)
+
+    count = min(request.count, 10)
+
+    async def event_stream():
+        saved: List[Dict] = []
+        repeated_titles: List[str] = []
+        # ✅ Own session: the request-scoped one is not guaranteed to outlive the handler
+        async with AsyncSessionLocal() as session:
+
+            async def save(idea: Dict) -> str:
+                content_ids = await content_service.bulk_insert_rows(session, [_idea_row(current_user.id, request, idea)])
+                saved.append(idea)
+                return f"event: idea\ndata: {_idea_response(content_ids[0], request, idea).model_dump_json()}\n\n"
+
+            try:
+                async for idea in ai_service.stream_content_ideas(
+                    topic=request.topic,
+                    niche=niche,
+                    audience=audience,
+                    count=count,
+                    platform=request.platform,
+                    use_cache=request.use_cache
+                ):
+                    # ✅ Saved ideas are indexed as they go, so this also catches repeats within the stream
+                    if settings.IDEA_DEDUP_ENABLED and (await idea_dedup.find_repeats(session, current_user.id, [idea]))[0]:
+                        repeated_titles.append(idea["title"])
+                        continue
+                    yield await save(idea)
+
+                if repeated_titles:
+                    # ✅ Repeats are re-asked once the stream ends; replacements follow as more `idea` events
+                    streamed = len(saved)
+                    ideas = await ai_service.refill_repeated_ideas(
+                        request.topic, niche, audience, count, request.platform,
+                        fresh=list(saved),
+                        repeated_titles=repeated_titles,
+                        find_repeats=idea_dedup.repeat_filter(session, current_user.id),
+                        use_cache=request.use_cache
+                    )
+                    for idea in ideas[streamed:]:
+                        yield await save(idea)
+
+                if saved:
+                    quota_service.commit(reservation)
+                else:
+                    await quota_service.refund(session, reservation)
+                logger.info(f"✅ Streamed & saved {len(saved)} ideas for {current_user.email}")
+                yield f"event: done\ndata: {json.dumps({'count': len(saved)})}\n\n"
+
+            except Exception as e:
+                logger.error(f"❌ Error streaming content ideas: {e}")
+                logger.error(traceback.format_exc())
+                await session.rollback()
+                if not saved:
+                    await quota_service.refund(session, reservation)
+                yield f"event: error\ndata: {json.dumps({'detail': 'Failed to generate content ideas.', 'count': len(saved)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+    )
+
+
+# =========================================================
+# ✅ REPURPOSE VIDEO CONTENT (ASYNC)
+# =========================================================
+# ✅ The body is streamed by media_ingestor, so document the multipart form by hand
+REPURPOSE_FORM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["video_file", "title"],
+                    "properties": {
+                        "video_file": {"type": "string", "format": "binary"},
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                        "target_platforms": {"type": "string", "default": "youtube,instagram,tiktok"},
+                        "tone": {"type": "string", "default": "professional"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+async def _reserve_video_quota(db: AsyncSession, current_user: UserSnapshot):
+    reservation = await quota_service.reserve(db, current_user.id, "video_repurposes")
+    if reservation is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
@@ -134,119 +357,267 @@ async def repurpose_video_content(
                 "upgrade_required": True
             }
         )
+    return reservation
 
-    valid_ext = (".mp4", ".m4a", ".mp3", ".wav", ".webm", ".mpeg", ".ogg", ".flac")
-    if not video_file.filename.lower().endswith(valid_ext):
-        raise HTTPException(status_code=400, detail="File must be a valid audio/video format")
 
-    try:
-        transcript = None
-        max_retries = 2
-        for attempt in range(1, max_retries + 1):
-            try:
-                logger.info(f"[TRACE {trace_id}] STAGE ✅: Transcription attempt {attempt}...")
-                transcript = await ai_service.transcribe_video(video_file)
-                if transcript and len(transcript.strip()) > 20:
-                    logger.info(f"[TRACE {trace_id}] STAGE ✅: Transcription succeeded")
-                    break
-                else:
-                    raise Exception("Transcript too short or empty.")
-            except Exception as e:
-                logger.error(f"[TRACE {trace_id}] ❌ Whisper attempt {attempt} failed: {e}")
-                if attempt == max_retries:
-                    raise HTTPException(status_code=500, detail="Failed to transcribe video after retries.")
-                await asyncio.sleep(2)
+def _parse_platforms(target_platforms: str) -> List[str]:
+    return [p.strip().lower() for p in target_platforms.split(",") if p.strip()]
 
-        platforms = [p.strip().lower() for p in target_platforms.split(",") if p.strip()]
-        logger.info(f"[TRACE {trace_id}] STAGE ✅: Starting repurposing for platforms: {platforms}")
-        repurposed_content = {}
 
-        for platform in platforms:
-            try:
-                repurposed = await ai_service.repurpose_content(
-                    transcript=transcript,
-                    original_title=title,
-                    original_description=description or "",
-                    target_platforms=[platform],
-                    tone=tone
-                )
-                repurposed_content[platform] = repurposed.get(platform, "")
-                logger.info(f"[TRACE {trace_id}] STAGE ✅: Repurposing success for {platform}")
-            except Exception as e:
-                logger.error(f"[TRACE {trace_id}] ❌ Repurposing failed for {platform}: {e}")
-                repurposed_content[platform] = f"Fallback snippet: {transcript[:120]}..."
-
-        content_id = uuid4()
-        user_id = UUID(str(current_user.id))
-
-        content_record = GeneratedContent(
-            id=content_id,
-            user_id=user_id,
-            content_type=ContentType.REPURPOSED_VIDEO,
-            title=title,
-            content=transcript,
-            metadata={
-                "trace_id": trace_id,
-                "original_file": video_file.filename,
-                "platforms": platforms,
-                "tone": tone,
-                "repurposed_content": repurposed_content
-            }
-        )
-        db.add(content_record)
-        current_user.increment_video_repurposing_used()
-        await db.commit()
+async def _ingest_repurpose_form(request: Request) -> IngestedUpload:
+    upload = await media_ingestor.ingest(request, file_field="video_file")
+    if not upload.fields.get("title", "").strip():
+        upload.media.discard()
+        raise HTTPException(status_code=422, detail="Form field 'title' is required")
+    return upload
 
-        logger.info(f"[TRACE {trace_id}] ✅ Video repurposed successfully for {current_user.email}")
 
-        return VideoRepurposeResponse(
-            id=content_id,
-            original_title=title,
-            transcript=transcript,
-            repurposed_content=repurposed_content,
-            platforms_generated=platforms
+@router.post("/repurpose-video", response_model=VideoRepurposeResponse, openapi_extra=REPURPOSE_FORM_OPENAPI)
+async def repurpose_video_content(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    trace_id = f"repurpose-{uuid4()}"
+    logger.info(f"===== [TRACE {trace_id}] Starting video repurpose for {current_user.email} =====")
+
+    # ✅ Check quota before accepting the body so over-limit users never upload
+    reservation = await _reserve_video_quota(db, current_user)
+    upload = None
+
+    try:
+        upload = await _ingest_repurpose_form(request)
+        form = upload.fields
+        response = await repurpose_service.run(
+            db=db,
+            user_id=current_user.id,
+            media=upload.media,
+            original_filename=upload.filename,
+            title=form["title"],
+            description=form.get("description"),
+            platforms=_parse_platforms(form.get("target_platforms", "youtube,instagram,tiktok")),
+            tone=form.get("tone", "professional"),
+            trace_id=trace_id
         )
+        quota_service.commit(reservation)
+
+        logger.info(f"[TRACE {trace_id}] ✅ Video repurposed successfully for {current_user.email}")
+        return response
 
     except HTTPException:
+        await quota_service.refund(db, reservation)
         raise
     except Exception as e:
         logger.error(f"[TRACE {trace_id}] ❌ Pipeline error: {e}")
         logger.error(traceback.format_exc())
         await db.rollback()
+        await quota_service.refund(db, reservation)
         raise HTTPException(status_code=500, detail=f"Failed to process video: {str(e)}")
 
+    finally:
+        if upload:
+            upload.media.discard()
+
+
+# =========================================================
+# ✅ REPURPOSE VIDEO - BACKGROUND JOB MODE
+# =========================================================
+@router.post(
+    "/repurpose-video/jobs",
+    response_model=RepurposeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=REPURPOSE_FORM_OPENAPI
+)
+async def submit_repurpose_video_job(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Store the upload, enqueue the pipeline on Celery and return a job id immediately."""
+    reservation = await _reserve_video_quota(db, current_user)
+    job_id = str(uuid4())
+
+    try:
+        upload = await _ingest_repurpose_form(request)
+    except Exception:
+        await quota_service.refund(db, reservation)
+        raise
+
+    try:
+        form = upload.fields
+        job = {
+            "user_id": str(current_user.id),
+            "trace_id": f"repurpose-{job_id}",
+            "media_path": upload.media.path,
+            "media_size": upload.media.size,
+            "media_sha256": upload.media.sha256,
+            "original_filename": upload.filename,
+            "title": form["title"],
+            "description": form.get("description"),
+            "platforms": _parse_platforms(form.get("target_platforms", "youtube,instagram,tiktok")),
+            "tone": form.get("tone", "professional")
+        }
+        # ✅ Owner first: the job may finish (eager) before apply_async returns
+        await job_registry.register(job_id, current_user.id)
+        # ✅ apply_async blocks on the broker (or runs the task when eager), so keep it off the loop
+        await asyncio.to_thread(process_repurpose_job.apply_async, args=[job], task_id=job_id)
+        quota_service.commit(reservation)
+        logger.info(f"[TRACE repurpose-{job_id}] STAGE ✅: Job enqueued for {current_user.email}")
+
+    except Exception as e:
+        logger.error(f"❌ Failed to enqueue repurpose job: {e}")
+        await quota_service.refund(db, reservation)
+        upload.media.discard()
+        raise HTTPException(status_code=500, detail="Failed to enqueue video job")
+
+    return RepurposeJobResponse(
+        job_id=job_id,
+        status_url=f"/api/v1/content/jobs/{job_id}",
+        events_url=f"/api/v1/content/jobs/{job_id}/events"
+    )
+
+
+async def _read_job_status(job_id: str) -> RepurposeJobStatus:
+    def read_result():
+        result = celery_app.AsyncResult(job_id)
+        return result.state, result.info
+
+    state, info = await asyncio.to_thread(read_result)
+    info = info if isinstance(info, dict) else {}
+
+    return RepurposeJobStatus(
+        job_id=job_id,
+        state=JOB_STATES.get(state, state.lower()),
+        stage=info.get("stage", "queued"),
+        progress=info.get("progress", 0),
+        result=info.get("result"),
+        error=info.get("error")
+    )
+
+
+async def _get_job_status(job_id: str, current_user: UserSnapshot) -> RepurposeJobStatus:
+    # ✅ Celery says PENDING for any id it has never seen: only ids issued to this user exist
+    try:
+        owner = await job_registry.owner(job_id)
+    except Exception as e:
+        logger.error(f"❌ Job registry lookup failed for {job_id}: {e}")
+        raise HTTPException(status_code=503, detail="Job status temporarily unavailable")
+    if owner != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await _read_job_status(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=RepurposeJobStatus)
+async def get_repurpose_job_status(
+    job_id: str,
+    current_user: UserSnapshot = Depends(get_current_principal)
+):
+    return await _get_job_status(job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_repurpose_job_events(
+    job_id: str,
+    current_user: UserSnapshot = Depends(get_current_principal)
+):
+    """
+    Server-sent events: one `progress` event per stage change, then `done` - or `timeout`
+    after JOB_EVENTS_MAX_SECONDS (the job keeps running; reconnect or poll /jobs/{job_id}).
+    """
+    first_status = await _get_job_status(job_id, current_user)
+
+    async def event_stream():
+        job_status, last_payload = first_status, None
+        deadline = asyncio.get_running_loop().time() + settings.JOB_EVENTS_MAX_SECONDS
+        while True:
+            payload = job_status.model_dump_json()
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+            if job_status.state in ("completed", "failed"):
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            if asyncio.get_running_loop().time() >= deadline:
+                yield f"event: timeout\ndata: {payload}\n\n"
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+            job_status = await _read_job_status(job_id)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+    )
+
 
 # =========================================================
 # ✅ CONTENT HISTORY (ASYNC)
 # =========================================================
 @router.get("/history", response_model=List[ContentHistoryResponse])
 async def get_content_history(
+    response: Response,
     content_type: Optional[str] = None,
     limit: int = 20,
     offset: int = 0,
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    collapse_duplicates: bool = False,
+    current_user: UserSnapshot = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    Newest first. Pass the X-Next-Cursor header of one page as `cursor` to get the next
+    (constant cost at any depth, stable under inserts); `offset` still works without it.
+    With collapse_duplicates, near-duplicate ideas are shown once (the newest) with
+    duplicate_count set; this mode pages by cursor only.
+    """
+    if collapse_duplicates and offset:
+        raise HTTPException(status_code=400, detail="collapse_duplicates pages by cursor, not offset")
+    after = None
+    if cursor:
+        if offset:
+            raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+        try:
+            after = decode_cursor(cursor, current_user.id)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
     try:
         logger.info(f"===== [DEBUG] Fetching content history for {current_user.email} =====")
         limit = min(limit, 100)
-        history = await content_service.get_user_content_history(
-            db=db,
-            user_id=UUID(str(current_user.id)),
-            content_type=content_type,
-            limit=limit,
-            offset=offset
-        )
+        duplicates: Dict[UUID, int] = {}
+        if collapse_duplicates:
+            rows, duplicates, next_position = await content_service.get_user_content_history_collapsed(
+                db=db,
+                user_id=UUID(str(current_user.id)),
+                content_type=content_type,
+                limit=limit,
+                after=after
+            )
+        else:
+            # ✅ One extra row tells us whether a next page exists
+            rows = await content_service.get_user_content_history_rows(
+                db=db,
+                user_id=UUID(str(current_user.id)),
+                content_type=content_type,
+                limit=limit + 1,
+                offset=offset,
+                after=after
+            )
+            rows, has_more = rows[:limit], len(rows) > limit
+            next_position = KeysetPosition(rows[-1].created_at, rows[-1].id) if has_more else None
+        if next_position:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_position, current_user.id)
 
         return [
             ContentHistoryResponse(
-                id=UUID(str(item.id)),
-                content_type=str(item.content_type.value) if hasattr(item.content_type, "value") else "",
-                title=item.title or "",
-                created_at=item.created_at if isinstance(item.created_at, datetime) else datetime.utcnow(),
-                metadata=item.metadata or {}
+                id=row.id,
+                content_type=row.content_type.value,
+                title=row.title or "",
+                created_at=row.created_at,
+                metadata=row.content_metadata or {},
+                duplicate_count=duplicates.get(row.id, 0)
             )
-            for item in history
+            for row in rows
         ]
 
     except Exception as e:
@@ -255,13 +626,113 @@ async def get_content_history(
         raise HTTPException(status_code=500, detail="Failed to fetch content history")
 
 
+# =========================================================
+# ✅ CONTENT SEARCH (Ranked full-text + fuzzy titles, keyset pages)
+# =========================================================
+@router.get("/search", response_model=List[ContentSearchResult])
+async def search_content(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    content_type: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search titles, summaries, tags and content. `q` takes web-search syntax ("quoted
+    phrase", or, -exclude). Best match first; pass the X-Next-Cursor header of one page
+    as `cursor` (with the same q and content_type) to get the next.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor, current_user.id, q, content_type)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+    try:
+        logger.info(f"===== [DEBUG] Searching content for {current_user.email} =====")
+        limit = min(max(limit, 1), 50)
+        hits = await search_service.search(
+            db=db,
+            user_id=UUID(str(current_user.id)),
+            query=q,
+            content_type=content_type,
+            limit=limit + 1,
+            after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Error searching content: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Failed to search content")
+
+    hits, has_more = hits[:limit], len(hits) > limit
+    if has_more:
+        last = hits[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_search_cursor(
+            SearchPosition(last.score, last.id), current_user.id, q, content_type
+        )
+
+    return [
+        ContentSearchResult(
+            id=hit.id,
+            content_type=hit.content_type.value,
+            title=hit.title or "",
+            created_at=hit.created_at,
+            metadata=hit.metadata or {},
+            score=hit.score,
+            title_highlight=hit.title_highlight,
+            snippet=hit.snippet
+        )
+        for hit in hits
+    ]
+
+
+# =========================================================
+# ✅ LIBRARY EXPORT (Streaming NDJSON / CSV, gzip)
+# =========================================================
+@router.get("/export")
+async def export_content(
+    fmt: str = Query("ndjson", alias="format"),
+    resource: str = "content",
+    content_type: Optional[str] = None,
+    gzip: bool = True,
+    current_user: UserSnapshot = Depends(get_current_principal)
+):
+    """
+    The user's whole library in one response. resource=content|analytics|all (all is
+    NDJSON only; each line carries a `record` field). Rows stream from a server-side
+    cursor, so memory stays flat however large the library is.
+    """
+    try:
+        export_service.validate(fmt, resource, content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"===== [DEBUG] Exporting {resource} as {fmt} for {current_user.email} =====")
+    filename = f"creatorhub-{resource}-{datetime.utcnow():%Y%m%d}.{fmt}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    if gzip:
+        # ✅ Already compressed: GZipMiddleware leaves responses with Content-Encoding alone
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_service.stream(current_user.id, fmt, resource, content_type, compress=gzip),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers
+    )
+
+
 # =========================================================
 # ✅ DELETE CONTENT (ASYNC)
 # =========================================================
 @router.delete("/{content_id}")
 async def delete_content(
     content_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     try:
@@ -1,25 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_db
-from app.models.copyright import CopyrightMonitor
 from app.schemas.copyright import CopyrightViolationResponse, CopyrightViolationCreate
-from app.core.security import get_current_active_user
-from app.models.user import User
+from app.core.security import get_current_principal
+from app.core.token_cache import UserSnapshot
+from app.services import copyright_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CopyrightViolationResponse])
-def get_user_copyright_violations(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_user_copyright_violations(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    violations = (
-        db.query(CopyrightMonitor)
-        .filter(CopyrightMonitor.user_id == current_user.id)
-        .all()
-    )
+    violations = await copyright_service.get_user_copyright_violations(db, current_user.id)
     if not violations:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -29,38 +25,21 @@ def get_user_copyright_violations(
 
 
 @router.post("/", response_model=CopyrightViolationResponse)
-def log_copyright_violation(
+async def log_copyright_violation(
     violation_data: CopyrightViolationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    new_violation = CopyrightMonitor(
-        user_id=current_user.id,
-        platform=violation_data.platform,
-        content_url=violation_data.content_url,
-        detected_at=violation_data.detected_at,
-        status=violation_data.status
-    )
-    db.add(new_violation)
-    db.commit()
-    db.refresh(new_violation)
-    return new_violation
+    return await copyright_service.log_copyright_violation(db, current_user.id, violation_data)
 
 
 @router.get("/{violation_id}", response_model=CopyrightViolationResponse)
-def get_copyright_violation(
+async def get_copyright_violation(
     violation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    violation = (
-        db.query(CopyrightMonitor)
-        .filter(
-            CopyrightMonitor.id == violation_id,
-            CopyrightMonitor.user_id == current_user.id
-        )
-        .first()
-    )
+    violation = await copyright_service.get_copyright_violation(db, current_user.id, violation_id)
     if not violation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,25 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_db
-from app.models.monetization import BrandDeal
 from app.schemas.monetization import BrandDealResponse, BrandDealCreate
-from app.core.security import get_current_active_user
-from app.models.user import User
+from app.core.security import get_current_principal
+from app.core.token_cache import UserSnapshot
+from app.services import monetization_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[BrandDealResponse])
-def get_user_brand_deals(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_user_brand_deals(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    deals = (
-        db.query(BrandDeal)
-        .filter(BrandDeal.user_id == current_user.id)
-        .all()
-    )
+    deals = await monetization_service.get_user_brand_deals(db, current_user.id)
     if not deals:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -29,39 +25,21 @@ def get_user_brand_deals(
 
 
 @router.post("/", response_model=BrandDealResponse)
-def create_brand_deal(
+async def create_brand_deal(
     deal_data: BrandDealCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    new_deal = BrandDeal(
-        user_id=current_user.id,
-        brand_name=deal_data.brand_name,
-        amount=deal_data.amount,
-        status=deal_data.status,
-        start_date=deal_data.start_date,
-        end_date=deal_data.end_date,
-    )
-    db.add(new_deal)
-    db.commit()
-    db.refresh(new_deal)
-    return new_deal
+    return await monetization_service.create_brand_deal(db, current_user.id, deal_data)
 
 
 @router.get("/{deal_id}", response_model=BrandDealResponse)
-def get_brand_deal(
+async def get_brand_deal(
     deal_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_principal)
 ):
-    deal = (
-        db.query(BrandDeal)
-        .filter(
-            BrandDeal.id == deal_id,
-            BrandDeal.user_id == current_user.id
-        )
-        .first()
-    )
+    deal = await monetization_service.get_brand_deal(db, current_user.id, deal_id)
     if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
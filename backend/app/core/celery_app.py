@@ -1,23 +1,41 @@
 from celery import Celery
+from celery.exceptions import Ignore
 from celery.schedules import crontab
 import asyncio
 import logging
 
+from app.core.config import settings
 from app.tasks.user_tasks import reset_monthly_usage
+from app.tasks.content_tasks import run_repurpose_job
 
 logger = logging.getLogger(__name__)
 
 celery_app = Celery(
     "creatorhub",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0"
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND
 )
 
 celery_app.conf.update(
     timezone="UTC",
-    enable_utc=True
+    enable_utc=True,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_store_eager_result=True,
+    task_track_started=True
 )
 
+
+def run_coroutine(coro):
+    """Run a coroutine on this worker's event loop, creating one if needed."""
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
 @celery_app.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
     # ✅ Run on 1st of every month at midnight (UTC)
@@ -35,13 +53,32 @@ def run_monthly_reset():
     try:
         logger.info("STAGE ✅: Running scheduled monthly reset task...")
 
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        loop.run_until_complete(reset_monthly_usage())
+        run_coroutine(reset_monthly_usage())
 
         logger.info("✅ Monthly usage counters reset successfully for all users.")
     except Exception as e:
         logger.error(f"❌ Monthly reset task failed: {e}")
+
+
+@celery_app.task(bind=True, name="content.repurpose_video")
+def process_repurpose_job(self, job: dict):
+    """
+    Background /repurpose-video job. Progress is published as PROGRESS meta
+    ({"stage", "progress"}); failures end in the custom FAILED state with an error message.
+    """
+    def progress(stage: str, percent: int) -> None:
+        self.update_state(
+            state="PROGRESS",
+            meta={"user_id": job["user_id"], "stage": stage, "progress": percent}
+        )
+
+    try:
+        result = run_coroutine(run_repurpose_job(job, progress))
+        return {"user_id": job["user_id"], "stage": "completed", "progress": 100, "result": result}
+    except Exception as e:
+        logger.error(f"❌ Repurpose job {self.request.id} failed: {e}")
+        self.update_state(
+            state="FAILED",
+            meta={"user_id": job["user_id"], "stage": "failed", "progress": 100, "error": str(e)}
+        )
+        raise Ignore()
@@ -0,0 +1,32 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+EVENT_STREAM = "text/event-stream"
+
+
+class _EventStreamAwareResponder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start" and \
+                Headers(raw=message["headers"]).get("content-type", "").startswith(EVENT_STREAM):
+            # ✅ GZipResponder's pass-through path (as for pre-encoded responses); headers go out now
+            self.started = True
+            self.content_encoding_set = True
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves server-sent event streams alone. Starlette's GZipResponder
+    keeps small streamed chunks inside the zlib buffer until the response ends, so a
+    compressed SSE stream reaches the client in one piece at the very end.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _EventStreamAwareResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,100 @@
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+_SIGNATURE_BYTES = 16
+
+
+class InvalidCursorError(ValueError):
+    """Cursor was tampered with, truncated, or issued to another user."""
+
+
+# =========================================================
+# ✅ KEYSET POSITION (Last row of the previous page)
+# =========================================================
+@dataclass(frozen=True)
+class KeysetPosition:
+    created_at: datetime
+    id: UUID
+
+
+@dataclass(frozen=True)
+class SearchPosition:
+    score: float
+    id: UUID
+
+
+# =========================================================
+# ✅ OPAQUE SIGNED CURSORS (base64url payload + HMAC-SHA256, bound to the user)
+# =========================================================
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signature(payload: bytes, user_id: UUID, scope: bytes = b"") -> bytes:
+    message = str(user_id).encode() + b"|" + scope + payload
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def _encode(values: list, user_id: UUID, scope: bytes = b"") -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_signature(payload, user_id, scope))}"
+
+
+def _decode(cursor: str, user_id: UUID, scope: bytes = b"") -> list:
+    try:
+        payload_part, signature_part = cursor.split(".")
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except ValueError:
+        raise InvalidCursorError("Malformed cursor") from None
+
+    if not hmac.compare_digest(signature, _signature(payload, user_id, scope)):
+        raise InvalidCursorError("Cursor signature mismatch")
+
+    try:
+        return json.loads(payload)
+    except ValueError:
+        raise InvalidCursorError("Malformed cursor") from None
+
+
+def _search_scope(query: str, content_type: Optional[str]) -> bytes:
+    # ✅ A search cursor only means something for the query (and filter) that issued it
+    return f"search:{content_type or ''}:{query}|".encode()
+
+
+def encode_cursor(position: KeysetPosition, user_id: UUID) -> str:
+    return _encode([position.created_at.isoformat(), str(position.id)], user_id)
+
+
+def decode_cursor(cursor: str, user_id: UUID) -> KeysetPosition:
+    values = _decode(cursor, user_id)
+    try:
+        created_at, content_id = values
+        return KeysetPosition(datetime.fromisoformat(created_at), UUID(content_id))
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Malformed cursor") from None
+
+
+def encode_search_cursor(position: SearchPosition, user_id: UUID, query: str, content_type: Optional[str] = None) -> str:
+    return _encode([position.score, str(position.id)], user_id, _search_scope(query, content_type))
+
+
+def decode_search_cursor(cursor: str, user_id: UUID, query: str, content_type: Optional[str] = None) -> SearchPosition:
+    values = _decode(cursor, user_id, _search_scope(query, content_type))
+    try:
+        score, content_id = values
+        return SearchPosition(float(score), UUID(content_id))
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Malformed cursor") from None
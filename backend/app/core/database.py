@@ -1,6 +1,7 @@
 import logging
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from typing import AsyncGenerator
 from app.core.config import settings
 
@@ -27,6 +28,24 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# =========================================================
+# ✅ Worker Engine (Celery tasks: NullPool, no connections shared across event loops)
+# =========================================================
+worker_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
+    echo=settings.DEBUG,
+    future=True,
+    poolclass=NullPool
+)
+
+WorkerSessionLocal = async_sessionmaker(
+    bind=worker_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 # ✅ Base Class for Models
 Base = declarative_base()
 metadata = Base.metadata
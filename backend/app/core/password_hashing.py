@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ✅ Cost parameters live here; bumping BCRYPT_ROUNDS marks older hashes for rehash-on-login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+# =========================================================
+# ✅ ASYNC PASSWORD HASHER (Bcrypt off the event loop)
+# =========================================================
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool (the bcrypt C extension releases the GIL),
+    capping in-flight hashes and rejecting callers once the wait queue is full.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_concurrency: int, max_queue: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, fn, *args):
+        if self._waiting >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"❌ Password hashing queue full ({self._waiting} waiting), rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self._waiting += 1
+        acquired = False
+        semaphore = self._get_semaphore()
+        try:
+            await semaphore.acquire()
+            acquired = True
+            self._waiting -= 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            if acquired:
+                semaphore.release()
+            else:
+                self._waiting -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash when the stored one uses outdated cost parameters."""
+        verified, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if verified and new_hash:
+            self.rehashed += 1
+        return verified, new_hash
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "waiting": self._waiting,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# ✅ GLOBAL INSTANCE
+password_hasher = PasswordHasher(
+    context=pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
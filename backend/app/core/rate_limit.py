@@ -0,0 +1,304 @@
+import json
+import logging
+import math
+import threading
+import uuid
+from collections import OrderedDict, deque
+from time import time
+from typing import Deque, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.token_cache import UserSnapshot, token_cache
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult:
+    __slots__ = ("allowed", "limit", "remaining", "reset_after")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset_after: float):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = max(0, remaining)
+        self.reset_after = max(0.0, reset_after)
+
+    def headers(self, window_seconds: int) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={window_seconds}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.reset_after)))
+        return headers
+
+
+# =========================================================
+# ✅ IN-MEMORY BACKEND (Single process / local dev)
+# =========================================================
+class InMemoryRateLimitBackend:
+    """
+    Sliding-window log per key stored in a ring buffer of at most `limit` timestamps, so each
+    hit is O(1). Keys are kept in an LRU bounded by max_keys, so idle users don't leak memory.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window.maxlen != limit:
+                window = deque(window or (), maxlen=limit)
+                self._windows[key] = window
+            self._windows.move_to_end(key)
+
+            while window and now - window[0] >= window_seconds:
+                window.popleft()
+
+            if len(window) >= limit:
+                return RateLimitResult(False, limit, 0, window[0] + window_seconds - now)
+
+            window.append(now)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+            return RateLimitResult(True, limit, limit - len(window), window[0] + window_seconds - now)
+
+
+# =========================================================
+# ✅ REDIS BACKEND (Shared across uvicorn workers)
+# =========================================================
+# Sliding-window log in a sorted set; Redis TIME is used so workers never disagree on "now".
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local window_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local member = ARGV[3]
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window_ms)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, member)
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window_ms)
+
+local reset_ms = window_ms
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset_ms = tonumber(oldest[2]) + window_ms - now
+end
+return {allowed, count, reset_ms}
+"""
+
+
+class RedisRateLimitBackend:
+    def __init__(self, client, key_prefix: str = "ratelimit:"):
+        self.client = client
+        self.key_prefix = key_prefix
+        self._script = client.register_script(SLIDING_WINDOW_LUA)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url))
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        allowed, count, reset_ms = await self._script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[window_seconds * 1000, limit, uuid.uuid4().hex]
+        )
+        return RateLimitResult(bool(int(allowed)), limit, limit - int(count), int(reset_ms) / 1000)
+
+
+# =========================================================
+# ✅ RATE LIMITER (Policy: limits per plan, fail-open on backend errors)
+# =========================================================
+class RateLimiter:
+    def __init__(self, backend, default_limit: int, plan_limits: Dict[str, int], window_seconds: int = 60):
+        self.backend = backend
+        self.default_limit = default_limit
+        self.plan_limits = {plan.upper(): limit for plan, limit in plan_limits.items()}
+        self.window_seconds = window_seconds
+
+    def limit_for_plan(self, plan: Optional[str]) -> int:
+        if not plan:
+            return self.default_limit
+        return self.plan_limits.get(plan.upper(), self.default_limit)
+
+    async def hit(self, key: str, plan: Optional[str] = None) -> Optional[RateLimitResult]:
+        limit = self.limit_for_plan(plan)
+        if limit <= 0:
+            return None
+        try:
+            return await self.backend.hit(key, limit, self.window_seconds)
+        except Exception as e:
+            logger.error(f"❌ Rate limit backend error, allowing request: {e}")
+            return None
+
+
+def build_rate_limiter() -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend = RedisRateLimitBackend.from_url(settings.REDIS_URL)
+    else:
+        backend = InMemoryRateLimitBackend()
+    return RateLimiter(
+        backend=backend,
+        default_limit=settings.RATE_LIMIT_PER_MINUTE,
+        plan_limits=settings.RATE_LIMIT_PLAN_OVERRIDES
+    )
+
+
+# ✅ GLOBAL INSTANCE
+rate_limiter = build_rate_limiter()
+
+
+# =========================================================
+# ✅ NEGATIVE TOKEN CACHE (Valid JWT, unknown or inactive user)
+# =========================================================
+class UnknownTokenCache:
+    """
+    sha256(token) of signed tokens whose user was not found or is inactive, so repeat requests
+    with them get the default limit without another users lookup. Bounded LRU with a short TTL
+    (a reactivated user gets the plan limit back after at most ttl_seconds).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._expires_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, token: str) -> bool:
+        key = token_cache.digest(token)
+        with self._lock:
+            expires_at = self._expires_at.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time():
+                del self._expires_at[key]
+                return False
+            return True
+
+    def add(self, token: str) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        key = token_cache.digest(token)
+        with self._lock:
+            self._expires_at.pop(key, None)
+            self._expires_at[key] = time() + self.ttl_seconds
+            while len(self._expires_at) > self.max_entries:
+                self._expires_at.popitem(last=False)
+
+
+# =========================================================
+# ✅ ASGI MIDDLEWARE
+# =========================================================
+class RateLimitMiddleware:
+    """Applies rate_limiter per user (bearer token) or per client IP and emits RateLimit-* headers."""
+
+    exempt_paths = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
+        self.unknown_tokens = UnknownTokenCache(
+            max_entries=settings.RATE_LIMIT_UNKNOWN_TOKEN_MAX_ENTRIES,
+            ttl_seconds=settings.RATE_LIMIT_UNKNOWN_TOKEN_TTL_SECONDS
+        )
+
+    async def _identify(self, scope) -> Tuple[str, Optional[str]]:
+        from app.core.security import verify_token  # ✅ Local import: security uses rate_limiter
+
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    break
+                snapshot = token_cache.peek(token)
+                if snapshot is not None:
+                    return f"user:{snapshot.id}", snapshot.subscription_plan.value
+                payload = verify_token(token)
+                if payload and payload.get("sub"):
+                    if token in self.unknown_tokens:
+                        return f"user:{payload['sub']}", None
+                    snapshot = await self._load_principal(token, payload)
+                    return f"user:{payload['sub']}", snapshot.subscription_plan.value if snapshot else None
+                break
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}", None
+
+    async def _load_principal(self, token: str, payload: dict) -> Optional[UserSnapshot]:
+        """
+        Token not cached yet: look the user up once and cache it, so the plan limit applies
+        from the first request and get_current_principal then hits the cache (no extra query).
+        None (default limit) for unknown or inactive users - remembered in unknown_tokens - and
+        on database errors (not remembered: the next request tries again).
+        """
+        from app.core.database import AsyncSessionLocal
+        from app.models.user import User
+
+        try:
+            user_id = UUID(str(payload["sub"]))
+            async with AsyncSessionLocal() as session:
+                user = (await session.execute(select(User).where(User.id == user_id))).scalars().first()
+        except Exception as e:
+            logger.error(f"❌ Rate limit plan lookup failed, using the default limit: {e}")
+            return None
+        if not user or not bool(user.is_active):
+            self.unknown_tokens.add(token)
+            return None
+        snapshot = UserSnapshot.from_user(user)
+        token_cache.set(token, snapshot, payload.get("exp"))
+        return snapshot
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter or rate_limiter
+        key, plan = await self._identify(scope)
+        result = await limiter.hit(key, plan)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in result.headers(limiter.window_seconds).items()
+        ]
+
+        if not result.allowed:
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    *headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
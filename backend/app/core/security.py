@@ -1,27 +1,29 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import UUID
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import logging
 from functools import wraps
-from time import time
-from collections import defaultdict
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
 from app.models.api_key import APIKey  # ✅ Correctly import your APIKey SQLAlchemy model
+from app.core.token_cache import token_cache, UserSnapshot
+from app.core.password_hashing import pwd_context, password_hasher
+from app.core.rate_limit import RateLimiter, rate_limiter
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------
 # PASSWORD HASHING
 # ---------------------------
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# Sync helpers are for scripts (database/setup.py); request handlers await password_hasher instead.
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -65,28 +67,50 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
 # ---------------------------
 # USER AUTH HELPERS
 # ---------------------------
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_principal(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> UserSnapshot:
+    """Cached auth for hot paths: returns a UserSnapshot, hitting JWT + DB only on cache miss."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    payload = verify_token(token)
+    if not payload or not payload.get("sub"):
+        raise credentials_exception
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id: Optional[str] = payload.get("sub")
-        if not user_id:
-            raise credentials_exception
-    except JWTError:
+        user_uuid = UUID(str(payload["sub"]))
+    except ValueError:
         raise credentials_exception
 
-    user: Optional[User] = db.query(User).filter(User.id == user_id).first()
-    if not user or not bool(user.is_active):  # ✅ Explicit bool cast for Pylance
+    result = await db.execute(select(User).where(User.id == user_uuid))
+    user: Optional[User] = result.scalars().first()
+    if not user or not bool(user.is_active):
         raise HTTPException(status_code=400, detail="Inactive or invalid user")
 
+    snapshot = UserSnapshot.from_user(user)
+    token_cache.set(token, snapshot, payload.get("exp"))
+    return snapshot
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    principal: UserSnapshot = Depends(get_current_principal)
+) -> User:
+    """Full User row for routes that need more than the snapshot; auth itself goes through the token cache."""
+    user: Optional[User] = await db.get(User, principal.id)
+    if not user or not bool(user.is_active):
+        token_cache.invalidate_user(principal.id)
+        raise HTTPException(status_code=400, detail="Inactive or invalid user")
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not bool(current_user.is_active):  # ✅ Explicit cast
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -94,10 +118,21 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         )
     return current_user
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, str(user.hashed_password)):
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    user: Optional[User] = result.scalars().first()
+    if not user:
+        return None
+
+    verified, new_hash = await password_hasher.verify_and_update(password, str(user.hashed_password))
+    if not verified:
         return None
+
+    if new_hash:
+        # ✅ Transparent rehash when bcrypt cost parameters changed
+        user.hashed_password = new_hash
+        await db.commit()
+        logger.info(f"STAGE ✅: Rehashed password for user {user.id} with current bcrypt parameters")
     return user
 
 # ---------------------------
@@ -105,8 +140,8 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 # ---------------------------
 def check_subscription_access(
     required_plan: str,
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_principal)
+) -> UserSnapshot:
     plan_hierarchy = {
         "free": 0,
         "creator": 1,
@@ -130,28 +165,30 @@ def check_subscription_access(
     return current_user
 
 # ---------------------------
-# SIMPLE RATE LIMITING (Dev Only)
+# RATE LIMITING (Per-route decorator; global limits live in RateLimitMiddleware)
 # ---------------------------
-rate_limit_store = defaultdict(list)
-
 def rate_limit(requests_per_minute: int = 60):
     def decorator(func):
+        limiter = RateLimiter(
+            backend=rate_limiter.backend,
+            default_limit=requests_per_minute,
+            plan_limits={}
+        )
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_user = next((arg for arg in args if isinstance(arg, User)), None)
+            current_user = next(
+                (arg for arg in (*args, *kwargs.values()) if isinstance(arg, (User, UserSnapshot))),
+                None
+            )
             if current_user:
-                user_id = str(current_user.id)
-                current_time = time()
-                rate_limit_store[user_id] = [
-                    req_time for req_time in rate_limit_store[user_id]
-                    if current_time - req_time < 60
-                ]
-                if len(rate_limit_store[user_id]) >= requests_per_minute:
+                result = await limiter.hit(f"route:{func.__name__}:user:{current_user.id}")
+                if result is not None and not result.allowed:
                     raise HTTPException(
                         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                        detail="Rate limit exceeded"
+                        detail="Rate limit exceeded",
+                        headers=result.headers(limiter.window_seconds)
                     )
-                rate_limit_store[user_id].append(current_time)
             return await func(*args, **kwargs)
         return wrapper
     return decorator
@@ -159,17 +196,22 @@ def rate_limit(requests_per_minute: int = 60):
 # ---------------------------
 # API KEY VALIDATION
 # ---------------------------
-def validate_api_key(api_key: str, db: Session) -> Optional[User]:
+async def validate_api_key(api_key: str, db: AsyncSession) -> Optional[User]:
     """Validate API key and return associated user."""
-    api_key_record = db.query(APIKey).filter(
-        APIKey.id == api_key,
-        APIKey.is_active.is_(True)  # ✅ SQLAlchemy-safe check
-    ).first()
+    result = await db.execute(
+        select(APIKey)
+        .options(selectinload(APIKey.user))
+        .where(
+            APIKey.id == api_key,
+            APIKey.is_active.is_(True)  # ✅ SQLAlchemy-safe check
+        )
+    )
+    api_key_record = result.scalars().first()
 
     if not api_key_record:
         return None
 
     setattr(api_key_record, "last_used", datetime.utcnow())
-    db.commit()
+    await db.commit()
 
     return api_key_record.user
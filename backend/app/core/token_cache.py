@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import time
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User, SubscriptionPlan
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ✅ LIGHTWEIGHT USER SNAPSHOT (What auth hands to routes)
+# =========================================================
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Immutable view of the fields routes read from the authenticated user."""
+    id: UUID
+    email: str
+    full_name: str
+    is_active: bool
+    subscription_plan: SubscriptionPlan
+    primary_niche: Optional[str] = None
+    target_audience: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=UUID(str(user.id)),
+            email=str(user.email),
+            full_name=str(user.full_name),
+            is_active=bool(user.is_active),
+            subscription_plan=user.subscription_plan,
+            primary_niche=user.primary_niche,
+            target_audience=user.target_audience,
+        )
+
+
+class _CacheEntry:
+    __slots__ = ("snapshot", "expires_at")
+
+    def __init__(self, snapshot: UserSnapshot, expires_at: float):
+        self.snapshot = snapshot
+        self.expires_at = expires_at
+
+
+# =========================================================
+# ✅ VERIFIED-PRINCIPAL CACHE (Bounded LRU + TTL)
+# =========================================================
+class TokenCache:
+    """
+    Maps sha256(token) -> UserSnapshot so repeat requests skip jwt.decode and the users lookup.
+    Entries expire at min(now + ttl, token exp) and are dropped when the user changes.
+
+    Invalidation is process-local: it follows ORM attribute changes made in this process only.
+    Changes made by other uvicorn/Celery workers or by Core UPDATE statements are not seen, so
+    ttl_seconds is the staleness bound for deactivations and plan changes - keep it short.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._digests_by_user: Dict[UUID, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.snapshot
+
+    def peek(self, token: str) -> Optional[UserSnapshot]:
+        """Read without touching LRU order or hit/miss counters (used by middleware)."""
+        with self._lock:
+            entry = self._entries.get(self.digest(token))
+            if entry is None or entry.expires_at <= time():
+                return None
+            return entry.snapshot
+
+    def set(self, token: str, snapshot: UserSnapshot, token_exp: Optional[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        if expires_at <= time():
+            return
+
+        key = self.digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(snapshot, expires_at)
+            self._digests_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id) -> int:
+        """Drop every cached token for a user (deactivation, plan or password change)."""
+        try:
+            user_uuid = UUID(str(user_id))
+        except (TypeError, ValueError):
+            return 0
+        with self._lock:
+            keys = self._digests_by_user.pop(user_uuid, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self.invalidations += 1
+                logger.info(f"STAGE ✅: Invalidated {len(keys)} cached token(s) for user {user_uuid}")
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_user.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._digests_by_user.get(entry.snapshot.id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._digests_by_user[entry.snapshot.id]
+
+
+# ✅ GLOBAL INSTANCE
+token_cache = TokenCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+# =========================================================
+# ✅ AUTOMATIC INVALIDATION ON SECURITY-RELEVANT CHANGES
+# =========================================================
+# Same-process ORM changes only; everything else waits out AUTH_CACHE_TTL_SECONDS (see TokenCache).
+def _invalidate_on_change(target: User, value, oldvalue, initiator) -> None:
+    if target.id is not None and value != oldvalue:
+        token_cache.invalidate_user(target.id)
+
+
+for _attribute in (
+    User.is_active,
+    User.subscription_plan,
+    User.subscription_end_date,
+    User.hashed_password,
+    User.primary_niche,
+    User.target_audience,
+):
+    event.listen(_attribute, "set", _invalidate_on_change)
@@ -1,13 +1,21 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 import logging
 import time
 from contextlib import asynccontextmanager
 
+from app.core.compression import EventStreamAwareGZipMiddleware
 from app.core.config import settings
 from app.core.database import create_tables
+from app.core.token_cache import token_cache
+from app.core.password_hashing import password_hasher
+from app.core.rate_limit import RateLimitMiddleware
+from app.services.ai_service import ai_service
+from app.services.idea_salvage import idea_salvage_stats
+from app.services.prompt_builder import token_ledger
+from app.services.response_cache import response_cache
+from app.services.transcript_cache import transcript_cache
 from app.api import auth, content, analytics, monetization, copyright
 
 # =============================
@@ -34,6 +42,7 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("🛑 CreatorHub.ai backend shutting down...")
+    password_hasher.shutdown()
 
 # =============================
 # ✅ FastAPI App Initialization
@@ -50,15 +59,18 @@ app = FastAPI(
 # =============================
 # ✅ Middleware
 # =============================
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # ✅ History pagination cursor
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=1000)  # ✅ SSE streams pass through
 
 @app.middleware("http")
 async def log_request_timing(request: Request, call_next):
@@ -96,6 +108,20 @@ async def health_check():
         "timestamp": time.time()
     }
 
+@app.get("/metrics", tags=["System"])
+async def metrics():
+    return {
+        "auth_cache": token_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "transcript_cache": transcript_cache.stats(),
+        "ai_response_cache": response_cache.stats(),
+        "ai_single_flight": ai_service.single_flight.stats(),
+        "ai_resilience": ai_service.resilience_stats(),
+        "ai_provider": ai_service.provider_stats(),
+        "ai_idea_salvage": idea_salvage_stats.stats(),
+        "ai_token_usage": token_ledger.stats()
+    }
+
 @app.get("/", tags=["System"])
 async def root():
     return {
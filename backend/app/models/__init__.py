@@ -1,5 +1,5 @@
 from app.models.user import User
-from app.models.content import GeneratedContent, ContentAnalytics, ContentTemplate
+from app.models.content import GeneratedContent, ContentMinHashBand, ContentAnalytics, ContentTemplate
 from app.models.analytics import AnalyticsData, PlatformMetrics, CompetitorAnalysis
 from app.models.monetization import BrandDeal, AffiliateEarnings
 from app.models.copyright import CopyrightMonitor
@@ -7,6 +7,7 @@ from app.models.copyright import CopyrightMonitor
 __all__ = [
     "User",
     "GeneratedContent",
+    "ContentMinHashBand",
     "ContentAnalytics",
     "ContentTemplate",
     "AnalyticsData",
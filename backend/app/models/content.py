@@ -1,9 +1,9 @@
 from sqlalchemy import (
-    Column, String, Text, DateTime, Integer, ForeignKey,
-    Enum as SQLEnum, JSON, Boolean, func
+    Column, String, Text, DateTime, Integer, BigInteger, ForeignKey, LargeBinary,
+    Enum as SQLEnum, JSON, Boolean, Index, DDL, event, func
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 import uuid
 import enum
 
@@ -38,8 +38,10 @@ class GeneratedContent(Base):
     # Content Information
     content_type = Column(SQLEnum(ContentType, name="contenttype"), nullable=False)
     title = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
-    summary = Column(Text, nullable=True)
+    # ✅ Heavy columns are deferred: not loaded with every row. Async sessions cannot lazy-load,
+    # so select them explicitly or add options(undefer_group("body")) when they are needed
+    content = deferred(Column(Text, nullable=False), group="body")
+    summary = deferred(Column(Text, nullable=True), group="body")
 
     # ✅ Metadata - Safe JSON Defaults
     content_metadata = Column("metadata", JSON, default=lambda: {})
@@ -53,12 +55,15 @@ class GeneratedContent(Base):
     # Performance Tracking
     views = Column(Integer, default=0)
     engagement_score = Column(Integer, default=0)
-    performance_data = Column(JSON, default=lambda: {})
+    performance_data = deferred(Column(JSON, default=lambda: {}), group="body")
 
     # AI Generation Details
     ai_model_used = Column(String, nullable=True)
-    generation_prompt = Column(Text, nullable=True)
-    generation_parameters = Column(JSON, default=lambda: {})
+    generation_prompt = deferred(Column(Text, nullable=True), group="body")
+    generation_parameters = deferred(Column(JSON, default=lambda: {}), group="body")
+
+    # ✅ Ideas only: MinHash signature of title + description (app/services/idea_dedup.py)
+    minhash = deferred(Column(LargeBinary, nullable=True))
 
     # File References
     original_file_path = Column(String, nullable=True)
@@ -68,6 +73,12 @@ class GeneratedContent(Base):
     created_at = Column(DateTime, default=func.now(), server_default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    # ✅ History keyset pagination (created_at DESC, id); see alembic/versions
+    __table_args__ = (
+        Index("ix_generated_content_user_type_created", user_id, content_type, created_at.desc(), id),
+        Index("ix_generated_content_user_created", user_id, created_at.desc(), id),
+    )
+
     # Relationships
     user = relationship("User", back_populates="generated_content")
     analytics = relationship(
@@ -82,6 +93,50 @@ class GeneratedContent(Base):
             f"status={self.status.value}, created_at={self.created_at}, title='{self.title[:50]}...')>"
         )
 
+# ✅ Full-text search (Postgres only; see alembic/versions and app/services/search_service.py).
+# search_vector is a stored generated column kept out of the mapper, so SQLite can still
+# create_all and ORM/COPY inserts never send it. Weights: title A, summary B, tags C, content D;
+# content is capped because a tsvector cannot exceed 1MB
+SEARCH_TEXT_CONFIG = "english"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(summary, '')), 'B') || "
+    f"setweight(json_to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(tags, '[]'::json), '[\"string\"]'), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', left(coalesce(content, ''), 100000)), 'D')"
+)
+
+for _statement in (
+    f"ALTER TABLE generated_content ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_generated_content_search_vector ON generated_content USING gin (search_vector)",
+    # ✅ Fuzzy titles only where the pg_trgm contrib extension is installed
+    "DO $$ BEGIN "
+    "IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN "
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm; "
+    "CREATE INDEX ix_generated_content_title_trgm ON generated_content USING gin (title gin_trgm_ops); "
+    "END IF; END $$",
+):
+    event.listen(GeneratedContent.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+# ---------------------------
+# ✅ NEAR-DUPLICATE INDEX (LSH bands of GeneratedContent.minhash)
+# ---------------------------
+class ContentMinHashBand(Base):
+    """
+    One row per LSH band of an idea's MinHash signature. band_key hashes the band together
+    with the owner's user id, so a lookup needs no user filter and the primary key alone
+    finds every idea sharing a band.
+    """
+    __tablename__ = "content_minhash_bands"
+
+    band_key = Column(BigInteger, primary_key=True)
+    # ✅ Indexed: ON DELETE CASCADE and the history collapse join look up by content_id
+    content_id = Column(
+        UUID(as_uuid=True), ForeignKey("generated_content.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+    def __repr__(self):
+        return f"<ContentMinHashBand(band_key={self.band_key}, content_id={self.content_id})>"
+
 # ---------------------------
 # ✅ CONTENT ANALYTICS MODEL
 # ---------------------------
@@ -89,7 +144,8 @@ class ContentAnalytics(Base):
     __tablename__ = "content_analytics"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    content_id = Column(UUID(as_uuid=True), ForeignKey("generated_content.id", ondelete="CASCADE"), nullable=False)
+    # ✅ Indexed: the ON DELETE CASCADE lookup (and per-user exports) search by content_id
+    content_id = Column(UUID(as_uuid=True), ForeignKey("generated_content.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Platform Information
     platform = Column(String, nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from pydantic import BaseModel, Field
 from uuid import UUID
 
@@ -13,6 +13,7 @@ class ContentIdeaRequest(BaseModel):
     audience: Optional[str] = Field(None, description="Target audience details")
     count: int = Field(default=5, ge=1, le=10, description="Number of ideas to generate (1-10)")
     platform: Optional[str] = Field(None, description="Optional target platform (e.g., TikTok, Instagram)")
+    use_cache: bool = Field(default=True, description="Set false to opt out of shared cached AI responses")
 
 class ContentIdeaResponse(BaseModel):
     """Response schema for generated content ideas."""
@@ -27,6 +28,28 @@ class ContentIdeaResponse(BaseModel):
         orm_mode = True
         extra = "forbid"
 
+class ContentIdeaBatchRequest(BaseModel):
+    """Many idea requests in one call: one quota consume, shared completions, one bulk insert."""
+    items: List[ContentIdeaRequest] = Field(..., min_length=1, description="Idea requests (up to AI_IDEA_BATCH_MAX_ITEMS)")
+
+class ContentIdeaBatchItem(BaseModel):
+    """Ideas generated for one item of a batch, in request order."""
+    topic: str
+    ideas: List[ContentIdeaResponse] = Field(default_factory=list)
+
+class ContentIdeaBatchResponse(BaseModel):
+    """Response schema for batched idea generation."""
+    results: List[ContentIdeaBatchItem]
+    total_ideas: int
+    completions: int = Field(..., description="LLM completions used (cached topics need none)")
+
+class GeneratedIdea(BaseModel):
+    """One idea as the model must return it (the ContentIdeaResponse fields known before saving)."""
+    title: str = Field(..., min_length=1)
+    description: str = Field(..., min_length=1)
+    engagement_score: int = Field(..., ge=0, le=100)
+    hashtags: List[str] = Field(default_factory=list)
+
 
 # =========================================================
 # ✅ VIDEO REPURPOSING SCHEMAS
@@ -51,6 +74,23 @@ class VideoRepurposeResponse(BaseModel):
         extra = "forbid"
 
 
+class RepurposeJobResponse(BaseModel):
+    """Returned immediately when a background repurpose job is enqueued."""
+    job_id: str
+    status_url: str
+    events_url: str
+
+
+class RepurposeJobStatus(BaseModel):
+    """Progress of a background repurpose job."""
+    job_id: str
+    state: str = Field(..., description="queued, running, completed or failed")
+    stage: str = Field(..., description="queued, transcribing, repurposing, saving, completed or failed")
+    progress: int = Field(0, ge=0, le=100)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 # =========================================================
 # ✅ CONTENT HISTORY SCHEMAS
 # =========================================================
@@ -61,7 +101,23 @@ class ContentHistoryResponse(BaseModel):
     title: str
     created_at: datetime
     metadata: Optional[Dict] = Field(default_factory=dict)
+    duplicate_count: int = Field(0, description="Older near-duplicate ideas collapsed into this one")
 
     class Config:
         orm_mode = True
         extra = "forbid"
+
+
+# =========================================================
+# ✅ CONTENT SEARCH SCHEMAS
+# =========================================================
+class ContentSearchResult(BaseModel):
+    """One ranked search hit. Highlights are HTML-escaped with matched terms in <mark>."""
+    id: UUID
+    content_type: str
+    title: str
+    created_at: datetime
+    metadata: Optional[Dict] = Field(default_factory=dict)
+    score: float
+    title_highlight: str
+    snippet: str = Field("", description="Best-matching fragments of the summary and content")
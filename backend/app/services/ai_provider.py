@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services.prompt_builder import count_message_tokens, count_tokens, extractive_summary
+
+logger = logging.getLogger(__name__)
+
+AI_PROVIDERS = ("openai", "simulator")
+
+_IDEAS_PROMPT = re.compile(r"Generate (\d+) viral content ideas.*?Topic: *(.*?)\n.*?Target Audience: *(.*?)\n", re.S)
+_PACKED_TOPIC = re.compile(r"^\s*(\d+)\. (.*?) \((\d+) ideas\)$", re.M)
+_AUDIENCE = re.compile(r"Target Audience: *(.*?)\n")
+_EXCLUDED = re.compile(r"Do not repeat these existing ideas: *(.*?)\n")
+_SUMMARY_PROMPT = re.compile(r"at most (\d+) tokens.*?\n\n(.*)", re.S)
+_REPURPOSE_PROMPT = re.compile(r"for (\w+) in a (\w+) tone.*?Title: *(.*?)\n", re.S)
+_WORD = re.compile(r"[A-Za-z]{4,}")
+_VOCABULARY = (
+    "today we break down a simple routine that actually works focus on consistency small wins energy "
+    "sleep habits mistakes most people make the science behind it quick tips you can try this week"
+).split()
+_HOOKS = ["Stop scrolling", "Nobody tells you this", "I tried it for 30 days", "The honest truth", "Do this first"]
+_FORMATS = ["short-form video", "carousel", "talking-head explainer", "step-by-step tutorial", "myth-busting thread"]
+
+AUDIO_BYTES_PER_SECOND = 16000  # ✅ ~128 kbps: rough media duration from file size
+WORDS_PER_MINUTE = 150
+
+
+class SimulatedAPIError(Exception):
+    """Injected upstream failure; status_code makes it look like an OpenAI API error."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Simulated upstream error {status_code}")
+        self.status_code = status_code
+
+
+# =========================================================
+# ✅ LOCAL SIMULATOR (Deterministic, schema-valid, no network)
+# =========================================================
+class SimulatedAIClient:
+    """
+    Offline stand-in for AsyncOpenAI with the subset of its surface AIService calls.
+    Output text is a pure function of the prompt (same prompt -> same ideas, summary, caption);
+    latency, errors and streaming pace are drawn from a seeded RNG so a whole run is
+    reproducible. Latency = lognormal time-to-first-token + ms_per_token * completion tokens.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: float = 400.0,
+        latency_sigma: float = 0.5,
+        ms_per_token: float = 15.0,
+        error_rate: float = 0.0,
+        error_status_codes: Sequence[int] = (429, 500, 503),
+        stream_chunk_tokens: int = 4,
+        transcribe_realtime_factor: float = 0.02
+    ):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.ms_per_token = ms_per_token
+        self.error_rate = error_rate
+        self.error_status_codes = list(error_status_codes) or [500]
+        self.stream_chunk_tokens = max(1, stream_chunk_tokens)
+        self.transcribe_realtime_factor = transcribe_realtime_factor
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_chat_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._create_transcription))
+
+    # ✅ Sampling ------------------------------------------------
+    def _first_token_seconds(self) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self._rng.lognormvariate(math.log(max(self.latency_ms, 0.001)), self.latency_sigma) / 1000
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise SimulatedAPIError(self._rng.choice(self.error_status_codes))
+
+    def _content_rng(self, *parts: str) -> random.Random:
+        digest = hashlib.sha256("\x1f".join((str(self.seed),) + parts).encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    # ✅ Outputs --------------------------------------------------
+    def _ideas(self, count: int, topic: str, audience: str, excluded: Sequence[str] = ()) -> str:
+        # ✅ Like a model told what to avoid: excluded ideas change the draw and the numbering
+        rng = self._content_rng("ideas", topic, audience, str(count), *excluded)
+        tag = "#" + re.sub(r"\W+", "", topic.title()) if topic else "#content"
+        ideas = []
+        for i in range(len(excluded), len(excluded) + count):
+            hook, fmt = rng.choice(_HOOKS), rng.choice(_FORMATS)
+            ideas.append({
+                "title": f"{hook}: {topic} ({i + 1})",
+                "description": (
+                    f"A {fmt} on {topic} for {audience or 'your audience'}. Open with a bold claim, show one concrete "
+                    f"example, and end with a question that invites comments."
+                ),
+                "engagement_score": rng.randint(55, 95),
+                "hashtags": [tag] + rng.sample(["#tips", "#howto", "#creator", "#growth", "#viral", "#learn"], rng.randint(2, 4))
+            })
+        return json.dumps(ideas, indent=2)
+
+    def _packed_ideas(self, prompt: str) -> str:
+        audience = _AUDIENCE.search(prompt)
+        ideas = []
+        for number, topic, count in _PACKED_TOPIC.findall(prompt):
+            for idea in json.loads(self._ideas(int(count), topic.strip(), audience.group(1).strip() if audience else "")):
+                ideas.append({"topic": int(number), **idea})
+        return json.dumps(ideas, indent=2)
+
+    def _performance_analysis(self, prompt: str) -> str:
+        rng = self._content_rng("analysis", prompt)
+        return json.dumps({
+            "performance_score": rng.randint(40, 95),
+            "key_insights": ["Retention drops after the first 5 seconds", "Comments peak on question-style captions"],
+            "improvement_suggestions": ["Front-load the hook", "Post within the audience's peak hour"],
+            "trend_analysis": "Engagement is trending up week over week.",
+            "next_content_recommendations": ["Follow-up on the best performing topic", "Try a carousel format"]
+        })
+
+    def _repurposed(self, platform: str, tone: str, title: str) -> str:
+        rng = self._content_rng("repurpose", platform, tone, title)
+        words = [word.lower() for word in _WORD.findall(title)] or ["content"]
+        hashtags = " ".join(f"#{word}" for word in (words + rng.sample(_VOCABULARY, 5))[:5])
+        return f"{rng.choice(_HOOKS)}: {title} - {tone} take for {platform.title()}.\n\n{hashtags}"
+
+    def _completion_text(self, messages: List[Dict], max_tokens: int) -> str:
+        prompt = messages[-1]["content"] if messages else ""
+        if "for each topic below" in prompt:
+            return self._packed_ideas(prompt)
+        ideas = _IDEAS_PROMPT.search(prompt)
+        if ideas:
+            excluded = _EXCLUDED.search(prompt)
+            return self._ideas(
+                int(ideas.group(1)), ideas.group(2).strip(), ideas.group(3).strip(),
+                excluded.group(1).split("; ") if excluded else ()
+            )
+        if "performance_score" in prompt:
+            return self._performance_analysis(prompt)
+        summary = _SUMMARY_PROMPT.search(prompt)
+        if summary:
+            return extractive_summary(summary.group(2), min(int(summary.group(1)), max_tokens))
+        repurpose = _REPURPOSE_PROMPT.search(prompt)
+        if repurpose:
+            return self._repurposed(*(group.strip() for group in repurpose.groups()))
+        rng = self._content_rng("text", prompt)
+        return " ".join(rng.choice(_VOCABULARY) for _ in range(min(max_tokens, 60)))
+
+    # ✅ chat.completions.create ---------------------------------
+    async def _create_chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 256,
+        temperature: float = 1.0,
+        stream: bool = False,
+        **kwargs: Any
+    ):
+        self.calls += 1
+        await asyncio.sleep(self._first_token_seconds())
+        self._maybe_fail()
+
+        text = self._completion_text(messages, max_tokens)
+        prompt_tokens = count_message_tokens(messages, model)
+        completion_tokens = count_tokens(text, model)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        if stream:
+            return self._stream(text)
+
+        await asyncio.sleep(completion_tokens * self.ms_per_token / 1000)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            )
+        )
+
+    async def _stream(self, text: str) -> AsyncIterator[SimpleNamespace]:
+        words = re.findall(r"\S+\s*|\s+", text)
+        for offset in range(0, len(words), self.stream_chunk_tokens):
+            piece = "".join(words[offset:offset + self.stream_chunk_tokens])
+            await asyncio.sleep(count_tokens(piece) * self.ms_per_token / 1000)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece), finish_reason=None)])
+
+    # ✅ audio.transcriptions.create ----------------------------
+    async def _create_transcription(self, file, model: str = "whisper-1", response_format: str = "text", **kwargs: Any):
+        self.calls += 1
+        size = os.fstat(file.fileno()).st_size
+        head = await asyncio.to_thread(file.read, 64 * 1024)
+        duration_seconds = size / AUDIO_BYTES_PER_SECOND
+        await asyncio.sleep(self._first_token_seconds() + duration_seconds * self.transcribe_realtime_factor)
+        self._maybe_fail()
+
+        rng = self._content_rng("transcript", hashlib.sha256(head).hexdigest(), str(size))
+        words, sentences = max(1, int(duration_seconds / 60 * WORDS_PER_MINUTE)), []
+        while words > 0:
+            length = min(words, rng.randint(8, 20))
+            sentences.append(" ".join(rng.choice(_VOCABULARY) for _ in range(length)).capitalize() + ".")
+            words -= length
+        return " ".join(sentences)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": "simulator",
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+# =========================================================
+# ✅ PROVIDER FACTORY
+# =========================================================
+def create_ai_client(provider: Optional[str] = None):
+    """
+    Client with the AsyncOpenAI surface AIService uses, selected by AI_PROVIDER:
+    "openai" (default) or "simulator" (offline load tests, no credits spent).
+    """
+    provider = (provider or settings.AI_PROVIDER).lower()
+    if provider == "simulator":
+        logger.info("STAGE ✅: Using the local AI simulator (no OpenAI calls)")
+        return SimulatedAIClient(
+            seed=settings.AI_SIM_SEED,
+            latency_ms=settings.AI_SIM_LATENCY_MS,
+            latency_sigma=settings.AI_SIM_LATENCY_SIGMA,
+            ms_per_token=settings.AI_SIM_MS_PER_TOKEN,
+            error_rate=settings.AI_SIM_ERROR_RATE,
+            error_status_codes=settings.AI_SIM_ERROR_STATUS_CODES,
+            stream_chunk_tokens=settings.AI_SIM_STREAM_CHUNK_TOKENS,
+            transcribe_realtime_factor=settings.AI_SIM_TRANSCRIBE_REALTIME_FACTOR
+        )
+    if provider != "openai":
+        raise ValueError(f"Unknown AI_PROVIDER '{provider}', expected one of {AI_PROVIDERS}")
+    # ✅ Retries are owned by the resilience layer (jittered, deadline-bounded), not the SDK
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
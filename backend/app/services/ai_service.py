@@ -1,21 +1,108 @@
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
-import shutil
-import tempfile
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Sequence, Tuple
 from fastapi import UploadFile
-from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.services.ai_provider import create_ai_client
+from app.services.fanout import FanOutExecutor, FanOutResult
+from app.services.idea_batching import IdeaJob, IndexedJob, pack_jobs
+from app.services.idea_salvage import (
+    idea_salvage_stats, merge_ideas, normalize_idea, salvage_ideas, strictly_parseable
+)
+from app.services.json_stream import JSONArrayStreamParser, extract_json, extract_json_items
+from app.services.media_ingest import media_ingestor
+from app.services.prompt_builder import (
+    TokenUsage, fit_transcript, ideas_max_tokens, measure_usage, token_ledger, transcript_budget
+)
+from app.services.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, ResilientCaller
+from app.services.response_cache import ResponseCache, normalize_text, response_cache
+from app.services.summarization import TranscriptSummarizer
+from app.services.single_flight import SingleFlight, single_flight
+from app.services.transcription import AudioChunk, TranscriptionPipeline
 
 logger = logging.getLogger(__name__)
 
+WHISPER_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+REPURPOSE_MAX_TOKENS = 500
+IDEA_MAX_REASKS = 1  # ✅ Follow-up requests for ideas missing from a salvaged response
+
+
+def platform_timeout_seconds() -> float:
+    """
+    Fan-out timeout per item. Kept at or above the chat deadline: a shorter one would cancel
+    calls while their retries are still inside the deadline they were given.
+    """
+    return max(settings.AI_PLATFORM_TIMEOUT_SECONDS, settings.AI_CALL_DEADLINE_SECONDS)
+
 
 class AIService:
-    def __init__(self):
-        """Initialize OpenAI Async client."""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, response_cache: ResponseCache = response_cache, client=None):
+        """Initialize the AI client (OpenAI or the local simulator, see AI_PROVIDER)."""
+        self.client = client or create_ai_client()
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=settings.AI_BREAKER_FAILURE_RATE,
+            min_calls=settings.AI_BREAKER_MIN_CALLS,
+            window_seconds=settings.AI_BREAKER_WINDOW_SECONDS,
+            open_seconds=settings.AI_BREAKER_OPEN_SECONDS
+        )
+        self.chat_caller = ResilientCaller(
+            "chat",
+            breaker=self.breaker,
+            limiter=AdaptiveConcurrencyLimiter(
+                initial_limit=settings.AI_CONCURRENCY_INITIAL,
+                min_limit=settings.AI_CONCURRENCY_MIN,
+                max_limit=settings.AI_CONCURRENCY_MAX,
+                latency_target_ms=settings.AI_LATENCY_TARGET_MS
+            ),
+            attempt_timeout_seconds=settings.AI_CALL_TIMEOUT_SECONDS,
+            deadline_seconds=settings.AI_CALL_DEADLINE_SECONDS,
+            max_retries=settings.AI_MAX_RETRIES,
+            retry_base_seconds=settings.AI_RETRY_BASE_SECONDS
+        )
+        self.audio_caller = ResilientCaller(
+            "whisper",
+            breaker=self.breaker,
+            limiter=AdaptiveConcurrencyLimiter(
+                initial_limit=settings.TRANSCRIBE_MAX_PARALLEL * 2,
+                min_limit=1,
+                max_limit=settings.AI_CONCURRENCY_MAX,
+                latency_target_ms=settings.WHISPER_LATENCY_TARGET_MS
+            ),
+            attempt_timeout_seconds=settings.WHISPER_CALL_TIMEOUT_SECONDS,
+            deadline_seconds=settings.WHISPER_CALL_TIMEOUT_SECONDS * (settings.AI_MAX_RETRIES + 1),
+            max_retries=settings.AI_MAX_RETRIES,
+            retry_base_seconds=settings.AI_RETRY_BASE_SECONDS
+        )
+        self.response_cache = response_cache
+        self.single_flight = SingleFlight()
+        self.transcription_pipeline = TranscriptionPipeline(
+            transcriber=self._whisper_chunk,
+            chunk_seconds=settings.TRANSCRIBE_CHUNK_SECONDS,
+            overlap_seconds=settings.TRANSCRIBE_CHUNK_OVERLAP_SECONDS,
+            max_parallel=settings.TRANSCRIBE_MAX_PARALLEL
+        )
+        self.summarizer = TranscriptSummarizer(
+            summarize=self._summarize_chunk,
+            chunk_tokens=settings.AI_SUMMARY_CHUNK_TOKENS,
+            summary_tokens=settings.AI_SUMMARY_TOKENS,
+            max_parallel=settings.AI_SUMMARY_MAX_PARALLEL,
+            min_transcript_tokens=settings.AI_SUMMARY_MIN_TRANSCRIPT_TOKENS
+        )
+        self.fanout = FanOutExecutor(
+            global_limit=settings.AI_FANOUT_GLOBAL_CONCURRENCY,
+            per_user_limit=settings.AI_FANOUT_PER_USER_CONCURRENCY,
+            timeout_seconds=platform_timeout_seconds()
+        )
+        self.batch_fanout = FanOutExecutor(
+            global_limit=settings.AI_FANOUT_GLOBAL_CONCURRENCY,
+            per_user_limit=settings.AI_IDEA_BATCH_CONCURRENCY,
+            timeout_seconds=platform_timeout_seconds()
+        )
 
     # =========================================================
     # ✅ FALLBACK CONTENT IDEAS (Used when AI request fails)
@@ -33,19 +120,49 @@ class AIService:
             })
         return fallback_ideas
 
+    def provider_stats(self) -> Dict:
+        stats = getattr(self.client, "stats", None)
+        return stats() if callable(stats) else {"provider": settings.AI_PROVIDER}
+
+    def resilience_stats(self) -> Dict:
+        return {
+            "breaker": self.breaker.stats(),
+            "chat": self.chat_caller.stats(),
+            "whisper": self.audio_caller.stats(),
+        }
+
+    # =========================================================
+    # ✅ CHAT COMPLETION (Token accounting per call)
+    # =========================================================
+    async def _chat(self, method: str, messages: List[Dict], max_tokens: int, temperature: float) -> Tuple[str, TokenUsage]:
+        started = time.perf_counter()
+        response = await self.chat_caller.call(lambda: self.client.chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        ))
+        content_raw = response.choices[0].message.content or ""
+        usage = measure_usage(method, messages, max_tokens, started, response=response, completion_text=content_raw)
+        token_ledger.record(usage)
+        return content_raw, usage
+
     # =========================================================
     # ✅ GENERATE CONTENT IDEAS
     # =========================================================
-    async def generate_content_ideas(
+    def _content_ideas_messages(
         self,
         topic: str,
         niche: str,
         audience: str,
-        count: int = 5,
-        platform: Optional[str] = None
+        count: int,
+        platform: Optional[str],
+        exclude_titles: Sequence[str] = ()
     ) -> List[Dict]:
-        """Generate AI-powered content ideas."""
         platform_prompt = f" optimized for {platform.title()}" if platform else ""
+        exclude_prompt = (
+            "\n        Do not repeat these existing ideas: " + "; ".join(exclude_titles) + "\n"
+        ) if exclude_titles else ""
 
         prompt = f"""
         Generate {count} viral content ideas for a {niche} content creator.
@@ -59,132 +176,580 @@ class AIService:
         2. A detailed description (2-3 sentences)
         3. Engagement score (0-100)
         4. 3-5 relevant hashtags
-
+        {exclude_prompt}
         Return as a JSON array.
         """
+        return [
+            {"role": "system", "content": "You are a viral content strategy expert."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _content_ideas_cache_key(topic: str, niche: str, audience: str, count: int, platform: Optional[str]):
+        # ✅ Only the topic is compared by similarity: niche and audience are part of the
+        # exact bucket, so a long audience can never make two different topics look alike
+        return topic, {
+            "method": "content_ideas",
+            "niche": normalize_text(niche),
+            "audience": normalize_text(audience),
+            "model": settings.OPENAI_MODEL,
+            "max_tokens": ideas_max_tokens(count),
+            "temperature": 0.8,
+            "count": count,
+            "platform": (platform or "").lower()
+        }
+
+    async def _reask_missing(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int,
+        platform: Optional[str],
+        ideas: List[Dict],
+        exclude_titles: Sequence[str] = (),
+        find_repeats: Optional[Callable[[List[Dict]], Awaitable[List[bool]]]] = None
+    ) -> int:
+        """
+        Ask only for the ideas still missing (appended to ideas in place); returns tokens used.
+        With find_repeats, re-asked ideas it flags (against ideas + the new ones) are dropped.
+        """
+        tokens = 0
+        exclude_titles = list(exclude_titles)
+        for _ in range(IDEA_MAX_REASKS):
+            missing = count - len(ideas)
+            if missing <= 0:
+                break
+            idea_salvage_stats.record_reask()
+            logger.info(f"STAGE ✅: Re-asking for {missing} missing content ideas for topic '{topic}'...")
+            try:
+                content_raw, usage = await self._chat(
+                    "content_ideas_reask",
+                    self._content_ideas_messages(
+                        topic, niche, audience, missing, platform,
+                        exclude_titles=[idea["title"] for idea in ideas] + exclude_titles
+                    ),
+                    max_tokens=ideas_max_tokens(missing),
+                    temperature=0.8
+                )
+            except Exception as e:
+                logger.error(f"❌ Re-ask for missing ideas failed: {e}")
+                break
+            tokens += usage.total_tokens
+            new_ideas = salvage_ideas(content_raw, missing)
+            if find_repeats and new_ideas:
+                repeats = (await find_repeats(ideas + new_ideas))[len(ideas):]
+                # ✅ Rejected repeats are excluded from the next re-ask too
+                exclude_titles += [idea["title"] for idea, repeat in zip(new_ideas, repeats) if repeat]
+                new_ideas = [idea for idea, repeat in zip(new_ideas, repeats) if not repeat]
+            merge_ideas(ideas, new_ideas, count)
+        return tokens
+
+    async def _request_content_ideas(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int,
+        platform: Optional[str]
+    ) -> Tuple[List[Dict], int]:
+        """
+        One chat completion, salvaged leniently (fences, prose, truncation, invalid items);
+        only the missing ideas are re-asked. Returns (valid ideas, total tokens used).
+        Raises on API errors.
+        """
+        logger.info(f"STAGE ✅: Generating {count} content ideas for topic '{topic}'...")
+        content_raw, usage = await self._chat(
+            "content_ideas",
+            self._content_ideas_messages(topic, niche, audience, count, platform),
+            max_tokens=ideas_max_tokens(count),
+            temperature=0.8
+        )
+
+        ideas = salvage_ideas(content_raw, count)
+        tokens = usage.total_tokens + await self._reask_missing(topic, niche, audience, count, platform, ideas)
+        logger.info(f"STAGE ✅: AI returned {len(ideas)} ideas.")
+        return ideas, tokens
+
+    @single_flight(key=lambda topic, niche, audience, count, platform, use_cache: (
+        normalize_text(topic), normalize_text(niche), normalize_text(audience),
+        count, (platform or "").lower(), use_cache
+    ))
+    async def generate_content_ideas(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int = 5,
+        platform: Optional[str] = None,
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """Generate AI-powered content ideas (served from the response cache when possible)."""
+        cache_text, cache_params = self._content_ideas_cache_key(topic, niche, audience, count, platform)
+        cached = self.response_cache.get(cache_text, cache_params, enabled=use_cache)
+        if cached is not None:
+            logger.info(f"STAGE ✅: Served {len(cached)} content ideas for '{topic}' from cache")
+            return cached
+
+        try:
+            ideas, tokens = await self._request_content_ideas(topic, niche, audience, count, platform)
+        except Exception as e:
+            logger.error(f"❌ OpenAI API error: {e}")
+            return self._generate_fallback_ideas(topic, count)
+
+        if not ideas:
+            logger.error("❌ No valid ideas in the AI response, using fallback ideas.")
+            return self._generate_fallback_ideas(topic, count)
 
+        # ✅ Only complete real model output is cached - never fallback or partial sets
+        if len(ideas) == count:
+            self.response_cache.set(cache_text, cache_params, ideas, tokens=tokens, enabled=use_cache)
+        return ideas
+
+    async def generate_fresh_content_ideas(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        find_repeats: Callable[[List[Dict]], Awaitable[List[bool]]],
+        count: int = 5,
+        platform: Optional[str] = None,
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """
+        generate_content_ideas without the ideas find_repeats flags (near-duplicates of the
+        user's library, see idea_dedup); the repeats are re-asked with their titles excluded.
+        Can return fewer than count ideas - none when everything repeats.
+        """
+        ideas = await self.generate_content_ideas(topic, niche, audience, count, platform, use_cache)
+        repeats = await find_repeats(ideas)
+        return await self.refill_repeated_ideas(
+            topic, niche, audience, count, platform,
+            fresh=[idea for idea, repeat in zip(ideas, repeats) if not repeat],
+            repeated_titles=[idea["title"] for idea, repeat in zip(ideas, repeats) if repeat],
+            find_repeats=find_repeats,
+            use_cache=use_cache
+        )
+
+    async def refill_repeated_ideas(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int,
+        platform: Optional[str],
+        fresh: List[Dict],
+        repeated_titles: Sequence[str],
+        find_repeats: Callable[[List[Dict]], Awaitable[List[bool]]],
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """
+        Re-ask (uncached) for the ideas dropped as repeats, with their titles excluded; new
+        ideas are appended to fresh, which is returned. When nothing was fresh, the cached
+        response that served the repeats is dropped so the next request asks the model.
+        """
+        if not repeated_titles:
+            return fresh
+        if not fresh and use_cache:
+            self.response_cache.discard(*self._content_ideas_cache_key(topic, niche, audience, count, platform))
+        logger.info(f"STAGE ✅: Replacing {len(repeated_titles)} repeated content ideas for topic '{topic}'...")
+        await self._reask_missing(
+            topic, niche, audience, count, platform, fresh,
+            exclude_titles=repeated_titles, find_repeats=find_repeats
+        )
+        return fresh
+
+    async def stream_content_ideas(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int = 5,
+        platform: Optional[str] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict]:
+        """Yield each idea as soon as the model finishes writing it (streaming completion)."""
+        cache_text, cache_params = self._content_ideas_cache_key(topic, niche, audience, count, platform)
+        cached = self.response_cache.get(cache_text, cache_params, enabled=use_cache)
+        if cached is not None:
+            logger.info(f"STAGE ✅: Served {len(cached)} content ideas for '{topic}' from cache")
+            for idea in cached:
+                yield idea
+            return
+
+        ideas: List[Dict] = []
+        items_seen = items_valid = 0
+        parser = JSONArrayStreamParser()
+        messages = self._content_ideas_messages(topic, niche, audience, count, platform)
+        max_tokens = ideas_max_tokens(count)
+        completion: List[str] = []
+        started = time.perf_counter()
         try:
-            logger.info(f"STAGE ✅: Generating {count} content ideas for topic '{topic}'...")
-            response = await self.client.chat.completions.create(
+            logger.info(f"STAGE ✅: Streaming {count} content ideas for topic '{topic}'...")
+            # ✅ Guarded up to the first response; a stream that breaks mid-way keeps its ideas
+            stream = await self.chat_caller.call(lambda: self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a viral content strategy expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=settings.OPENAI_MAX_TOKENS,
-                temperature=0.8
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.8,
+                stream=True
+            ))
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                completion.append(delta or "")
+                for item in parser.feed(delta or ""):
+                    items_seen += 1
+                    idea = normalize_idea(item)
+                    items_valid += bool(idea)
+                    if idea and len(ideas) < count:
+                        before = len(ideas)
+                        merge_ideas(ideas, [idea], count)
+                        if len(ideas) > before:
+                            yield idea
+        except Exception as e:
+            logger.error(f"❌ OpenAI streaming error after {len(ideas)} ideas: {e}")
+        finally:
+            usage = measure_usage(
+                "content_ideas_stream", messages, max_tokens, started, completion_text="".join(completion)
             )
+            token_ledger.record(usage)
+
+        text = "".join(completion)
+        if not parser.elements_parsed and text:
+            # ✅ No array in the output (e.g. a single object): salvage from the whole text
+            items = extract_json_items(text)
+            items_seen = len(items)
+            for idea in (normalize_idea(item) for item in items):
+                items_valid += bool(idea)
+                if idea and len(ideas) < count:
+                    before = len(ideas)
+                    merge_ideas(ideas, [idea], count)
+                    if len(ideas) > before:
+                        yield idea
+        valid_streamed = len(ideas)
+        idea_salvage_stats.record(items_seen, items_valid, strictly_parseable(text))
+
+        tokens = usage.total_tokens
+        if text and len(ideas) < count:
+            tokens += await self._reask_missing(topic, niche, audience, count, platform, ideas)
+            for idea in ideas[valid_streamed:]:
+                yield idea
+
+        if not ideas:
+            logger.error("❌ No ideas parsed from the stream, using fallback ideas.")
+            for idea in self._generate_fallback_ideas(topic, count):
+                yield idea
+            return
+
+        logger.info(f"STAGE ✅: AI streamed {len(ideas)} ideas.")
+        if len(ideas) == count:
+            self.response_cache.set(cache_text, cache_params, ideas, tokens=tokens, enabled=use_cache)
 
-            content_raw = response.choices[0].message.content
-            ideas = json.loads(content_raw.strip()) if content_raw else []
-            logger.info(f"STAGE ✅: AI returned {len(ideas)} ideas.")
-            return ideas if isinstance(ideas, list) else [ideas]
+    # =========================================================
+    # ✅ BATCHED CONTENT IDEAS (Packed prompts, concurrent packs)
+    # =========================================================
+    def _packed_ideas_messages(self, pack: List[IndexedJob]) -> List[Dict]:
+        job = pack[0][1]
+        platform_prompt = f" optimized for {job.platform.title()}" if job.platform else ""
+        topics = "\n".join(
+            f"        {number}. {packed.topic} ({packed.count} ideas)"
+            for number, (_, packed) in enumerate(pack, start=1)
+        )
 
-        except json.JSONDecodeError:
-            logger.error("❌ Failed to parse AI response as JSON, using fallback ideas.")
-            return self._generate_fallback_ideas(topic, count)
-        except Exception as e:
-            logger.error(f"❌ OpenAI API error: {e}")
-            return self._generate_fallback_ideas(topic, count)
+        prompt = f"""
+        Generate viral content ideas for a {job.niche} content creator, for each topic below.
+
+{topics}
+        Target Audience: {job.audience}
+        Platform{platform_prompt}
+
+        For each idea, provide:
+        1. topic: the number of the topic it belongs to
+        2. A compelling title
+        3. A detailed description (2-3 sentences)
+        4. Engagement score (0-100)
+        5. 3-5 relevant hashtags
+
+        Return one JSON array containing the ideas for all topics.
+        """
+        return [
+            {"role": "system", "content": "You are a viral content strategy expert."},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def _request_packed_ideas(self, pack: List[IndexedJob]) -> Dict[int, List[Dict]]:
+        """One completion for several compatible topics; missing ideas are re-asked per topic."""
+        if len(pack) == 1:
+            index, job = pack[0]
+            return {index: await self.generate_content_ideas(
+                job.topic, job.niche, job.audience, job.count, job.platform, job.use_cache
+            )}
+
+        total = sum(job.count for _, job in pack)
+        logger.info(f"STAGE ✅: Generating {total} content ideas for {len(pack)} packed topics...")
+        content_raw, usage = await self._chat(
+            "content_ideas_batch",
+            self._packed_ideas_messages(pack),
+            max_tokens=ideas_max_tokens(total),
+            temperature=0.8
+        )
+
+        # ✅ Route each item to its topic by number; unnumbered items are dropped
+        items = extract_json_items(content_raw)
+        by_topic: Dict[int, List[Dict]] = {number: [] for number in range(1, len(pack) + 1)}
+        valid = 0
+        for item in items:
+            idea = normalize_idea(item)
+            number = item.get("topic") if isinstance(item, dict) else None
+            if isinstance(number, str) and number.strip().isdigit():
+                number = int(number)
+            if idea and number in by_topic:
+                valid += 1
+                by_topic[number].append(idea)
+        idea_salvage_stats.record(len(items), valid, strictly_parseable(content_raw))
+
+        ideas_by_index: Dict[int, List[Dict]] = {}
+        for number, (index, job) in enumerate(pack, start=1):
+            ideas_by_index[index] = []
+            merge_ideas(ideas_by_index[index], by_topic[number], job.count)
+
+        reask_tokens = await asyncio.gather(*(
+            self._reask_missing(job.topic, job.niche, job.audience, job.count, job.platform, ideas_by_index[index])
+            for index, job in pack
+        ))
+        tokens = usage.total_tokens + sum(reask_tokens)
+
+        for index, job in pack:
+            ideas = ideas_by_index[index]
+            if not ideas:
+                ideas_by_index[index] = self._generate_fallback_ideas(job.topic, job.count)
+            elif len(ideas) == job.count:
+                cache_text, cache_params = self._content_ideas_cache_key(
+                    job.topic, job.niche, job.audience, job.count, job.platform
+                )
+                self.response_cache.set(
+                    cache_text, cache_params, ideas, tokens=tokens * job.count // total, enabled=job.use_cache
+                )
+        return ideas_by_index
+
+    async def generate_content_ideas_batch(
+        self,
+        jobs: List[IdeaJob],
+        user_id: Optional[str] = None
+    ) -> Tuple[List[List[Dict]], int]:
+        """
+        Ideas for every job, aligned with the input. Cached topics are served directly, the
+        rest are packed into shared completions that run concurrently through the fan-out
+        executor (a failed pack gets fallback ideas). Returns (ideas per job, completions used).
+        """
+        results: List[List[Dict]] = [[] for _ in jobs]
+        pending: List[IndexedJob] = []
+        for index, job in enumerate(jobs):
+            cache_text, cache_params = self._content_ideas_cache_key(
+                job.topic, job.niche, job.audience, job.count, job.platform
+            )
+            cached = self.response_cache.get(cache_text, cache_params, enabled=job.use_cache)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, job))
+
+        packs = pack_jobs(pending, settings.AI_IDEA_BATCH_PACK_TOPICS, settings.AI_IDEA_BATCH_PACK_IDEAS)
+
+        def fallback(key: str, error: BaseException) -> Dict[int, List[Dict]]:
+            return {index: self._generate_fallback_ideas(job.topic, job.count) for index, job in packs[int(key)]}
+
+        outcome = await self.batch_fanout.run(
+            {str(number): (lambda pack=pack: self._request_packed_ideas(pack)) for number, pack in enumerate(packs)},
+            user_key=str(user_id) if user_id else None,
+            fallback=fallback
+        )
+        for ideas_by_index in outcome.results.values():
+            for index, ideas in ideas_by_index.items():
+                results[index] = ideas
+
+        logger.info(
+            f"STAGE ✅: Batch of {len(jobs)} topics used {len(packs)} completion(s) "
+            f"({len(jobs) - len(pending)} cached) in {outcome.wall_clock_ms}ms"
+        )
+        return results, len(packs)
 
     # =========================================================
     # ✅ TRANSCRIBE VIDEO OR AUDIO (WHISPER)
     # =========================================================
+    async def _whisper_once(self, file_path: str):
+        # ✅ Reopened per attempt so a retry never sends a half-read file
+        with open(file_path, "rb") as audio_file:
+            return await self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                response_format="text"
+            )
+
+    async def _whisper(self, file_path: str) -> str:
+        transcript = await self.audio_caller.call(lambda: self._whisper_once(file_path))
+        return transcript if isinstance(transcript, str) else transcript.get("text", "")
+
+    async def _whisper_chunk(self, chunk: AudioChunk) -> str:
+        return await self._whisper(chunk.path)
+
+    async def transcribe_file(self, file_path: str) -> str:
+        """Transcribe a media file already on disk (caller owns the file)."""
+        file_size = os.path.getsize(file_path)
+        logger.info(f"📥 Transcribing media: {file_path}, size={file_size} bytes")
+
+        # ✅ Basic validation (avoid 0-byte corrupted uploads)
+        if file_size < 50 * 1024:  # ~50KB min
+            raise Exception("Video file too small or may not contain valid audio.")
+
+        # ✅ Long media: chunked + parallel Whisper (also avoids the API's 25MB upload limit)
+        if file_size >= settings.TRANSCRIBE_CHUNKING_MIN_BYTES:
+            try:
+                transcript = await self.transcription_pipeline.transcribe_file(file_path)
+                logger.info("STAGE ✅: Chunked transcription completed successfully.")
+                return transcript
+            except Exception as e:
+                if file_size > WHISPER_MAX_UPLOAD_BYTES:
+                    raise
+                logger.error(f"❌ Chunked transcription failed, falling back to single request: {e}")
+
+        # ✅ Whisper transcription
+        transcript = await self._whisper(file_path)
+        logger.info("STAGE ✅: Transcription completed successfully.")
+        return transcript
+
     async def transcribe_video(self, video_file: UploadFile) -> str:
         """Transcribe video/audio using Whisper (optimized for production)."""
-        temp_file_path = None
+        # ✅ Single validated spool copy; the caller's UploadFile stays open so retries can call again
+        media = await media_ingestor.ingest_file(video_file)
         try:
-            # ✅ Validate file extension
-            if not video_file.filename or not video_file.filename.lower().endswith((
-                ".mp4", ".m4a", ".mp3", ".wav", ".webm", ".mpeg", ".oga", ".ogg", ".flac"
-            )):
-                raise Exception(f"Invalid file format: {video_file.filename}")
-
-            # ✅ Save to temp file (streaming avoids memory overload)
-            ext = os.path.splitext(video_file.filename)[1] or ".mp4"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
-                await video_file.seek(0)
-                shutil.copyfileobj(video_file.file, temp_file)
-                temp_file_path = temp_file.name
-
-            file_size = os.path.getsize(temp_file_path)
-            logger.info(f"📥 Saved temp video: {temp_file_path}, size={file_size} bytes")
-
-            # ✅ Basic validation (avoid 0-byte corrupted uploads)
-            if file_size < 50 * 1024:  # ~50KB min
-                raise Exception("Video file too small or may not contain valid audio.")
-
-            # ✅ Whisper transcription
-            with open(temp_file_path, "rb") as audio_file:
-                transcript = await self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-
-            logger.info("STAGE ✅: Transcription completed successfully.")
-            return transcript if isinstance(transcript, str) else transcript.get("text", "")
-
+            return await self.transcribe_file(media.path)
         except Exception as e:
             logger.error(f"❌ Video transcription error: {e}")
             raise Exception(f"Failed to transcribe video: {e}")
-
         finally:
             # ✅ Always clean up
-            video_file.file.close()
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                logger.info(f"🗑 Temp file deleted - {temp_file_path}")
+            media.discard()
 
     # =========================================================
-    # ✅ REPURPOSE CONTENT
+    # ✅ SUMMARIZE LONG TRANSCRIPTS (Map-reduce, once per video)
     # =========================================================
-    async def repurpose_content(
+    async def _summarize_chunk(self, text: str, target_tokens: int) -> str:
+        content_raw, _ = await self._chat(
+            "transcript_summary",
+            [
+                {"role": "system", "content": "You summarize video transcripts for social media editors."},
+                {"role": "user", "content": (
+                    f"Summarize this part of a video transcript in at most {target_tokens} tokens. "
+                    f"Keep the key points, hooks, memorable quotes and any call to action, in order.\n\n{text}"
+                )}
+            ],
+            max_tokens=target_tokens,
+            temperature=0.2
+        )
+        return content_raw
+
+    async def summarize_transcript(self, transcript: str) -> Optional[str]:
+        """
+        Shared summary for every platform prompt; None when the transcript fits the budget or is
+        under AI_SUMMARY_MIN_TRANSCRIPT_TOKENS (fitted into each prompt instead).
+        """
+        return await self.summarizer.summarize_transcript(
+            transcript, transcript_budget(completion_tokens=REPURPOSE_MAX_TOKENS)
+        )
+
+    # =========================================================
+    # ✅ REPURPOSE CONTENT (Concurrent fan-out per platform)
+    # =========================================================
+    @single_flight(key=lambda platform, transcript, original_title, original_description, tone: (
+        platform, tone, original_title, original_description, hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+    ))
+    async def _repurpose_for_platform(
+        self,
+        platform: str,
+        transcript: str,
+        original_title: str,
+        original_description: str,
+        tone: str
+    ) -> str:
+        logger.info(f"STAGE ✅: Repurposing content for {platform}...")
+        prompt = (
+            f"You are an expert social media content repurposer. "
+            f"Repurpose the following video for {platform} in a {tone} tone. "
+            f"Generate a catchy title/caption and 5 trending hashtags.\n\n"
+            f"Title: {original_title}\n"
+            f"Description: {original_description}\n"
+            f"Transcript: {transcript}"
+        )
+
+        content_raw, _ = await self._chat(
+            "repurpose",
+            [
+                {"role": "system", "content": "You create high-converting social media content."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=REPURPOSE_MAX_TOKENS,
+            temperature=0.7
+        )
+        logger.info(f"STAGE ✅: Repurposing completed for {platform}")
+        return content_raw.strip() if content_raw else ""
+
+    async def repurpose_content_with_report(
         self,
         transcript: str,
         original_title: str,
         original_description: str,
         target_platforms: list,
-        tone: str = "motivational"
-    ) -> dict:
-        """Repurpose transcript into platform-specific content."""
-        repurposed = {}
-
-        for platform in target_platforms:
-            try:
-                logger.info(f"STAGE ✅: Repurposing content for {platform}...")
-                prompt = (
-                    f"You are an expert social media content repurposer. "
-                    f"Repurpose the following video for {platform} in a {tone} tone. "
-                    f"Generate a catchy title/caption and 5 trending hashtags.\n\n"
-                    f"Title: {original_title}\n"
-                    f"Description: {original_description}\n"
-                    f"Transcript: {transcript[:1000]}..."
-                )
+        tone: str = "motivational",
+        user_id: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> FanOutResult:
+        """
+        Repurpose for all platforms concurrently; failed/timed-out platforms get a fallback snippet.
+        A precomputed summary (see summarize_transcript) replaces the transcript in every prompt.
+        """
+        platforms = list(dict.fromkeys(platform.lower() for platform in target_platforms))
 
-                response = await self.client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {"role": "system", "content": "You create high-converting social media content."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=500,
-                    temperature=0.7
-                )
+        def fallback(platform: str, error: BaseException) -> str:
+            return f"Fallback: {tone.title()} snippet: {transcript[:120]}..."
 
-                content_raw = response.choices[0].message.content
-                repurposed[platform.lower()] = content_raw.strip() if content_raw else ""
-                logger.info(f"STAGE ✅: Repurposing completed for {platform}")
+        # ✅ Fit once to the model's token budget; every platform prompt shares the result
+        fitted = await asyncio.to_thread(fit_transcript, summary or transcript, None, REPURPOSE_MAX_TOKENS)
 
-            except Exception as e:
-                logger.error(f"❌ Repurpose_content error for {platform}: {e}")
-                repurposed[platform.lower()] = f"Fallback: {tone.title()} snippet: {transcript[:120]}..."
+        result = await self.fanout.run(
+            {
+                platform: (
+                    lambda platform=platform: self._repurpose_for_platform(
+                        platform, fitted, original_title, original_description, tone
+                    )
+                )
+                for platform in platforms
+            },
+            user_key=str(user_id) if user_id else None,
+            fallback=fallback
+        )
+        logger.info(f"STAGE ✅: Repurposed {len(platforms)} platforms in {result.wall_clock_ms}ms {result.latency_ms}")
+        return result
 
-        return repurposed
+    async def repurpose_content(
+        self,
+        transcript: str,
+        original_title: str,
+        original_description: str,
+        target_platforms: list,
+        tone: str = "motivational",
+        user_id: Optional[str] = None
+    ) -> dict:
+        """Repurpose transcript into platform-specific content."""
+        result = await self.repurpose_content_with_report(
+            transcript, original_title, original_description, target_platforms, tone, user_id
+        )
+        return result.results
 
     # =========================================================
     # ✅ ANALYZE CONTENT PERFORMANCE
     # =========================================================
+    @single_flight()
     async def analyze_content_performance(self, content_data: Dict, platform_metrics: Dict) -> Dict:
         """Analyze content performance and provide insights."""
         prompt = f"""
@@ -197,17 +762,17 @@ class AIService:
         performance_score, key_insights, improvement_suggestions, trend_analysis, next_content_recommendations
         """
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
+            content_raw, _ = await self._chat(
+                "performance_analysis",
+                [
                     {"role": "system", "content": "You are a content performance analyst."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=800,
                 temperature=0.3
             )
-            content_raw = response.choices[0].message.content
-            return json.loads(content_raw.strip()) if content_raw else {
+            analysis = extract_json(content_raw) if content_raw else None
+            return analysis if isinstance(analysis, dict) else {
                 "performance_score": 0,
                 "key_insights": ["No response from AI"],
                 "improvement_suggestions": ["Try again later"],
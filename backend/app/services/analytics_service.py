@@ -1,21 +1,22 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
 from app.models.analytics import AnalyticsData
-from app.models.user import User
 
-def get_user_analytics(db: Session, user: User) -> List[AnalyticsData]:
-    return (
-        db.query(AnalyticsData)
-        .filter(AnalyticsData.user_id == user.id)
-        .all()
+async def get_user_analytics(db: AsyncSession, user_id: UUID) -> List[AnalyticsData]:
+    result = await db.execute(
+        select(AnalyticsData)
+        .where(AnalyticsData.user_id == user_id)
     )
+    return list(result.scalars().all())
 
-def get_platform_analytics(db: Session, user: User, platform: str) -> AnalyticsData:
-    return (
-        db.query(AnalyticsData)
-        .filter(
-            AnalyticsData.user_id == user.id,
+async def get_platform_analytics(db: AsyncSession, user_id: UUID, platform: str) -> Optional[AnalyticsData]:
+    result = await db.execute(
+        select(AnalyticsData)
+        .where(
+            AnalyticsData.user_id == user_id,
             AnalyticsData.platform == platform
         )
-        .first()
     )
+    return result.scalars().first()
@@ -1,44 +1,88 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, delete
+from sqlalchemy import Row, Select, and_, cast, insert, or_, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.content import GeneratedContent, ContentType
+from app.core.config import settings
+from app.core.cursor import KeysetPosition
+from app.models.content import ContentMinHashBand, GeneratedContent, ContentType
+from app.services.idea_dedup import idea_dedup
 
 logger = logging.getLogger(__name__)
 
+# ✅ What /content/history returns; everything else stays in the database
+HISTORY_COLUMNS = (
+    GeneratedContent.id,
+    GeneratedContent.content_type,
+    GeneratedContent.title,
+    GeneratedContent.created_at,
+    GeneratedContent.content_metadata,
+)
+
 
 class ContentService:
     # =========================================================
     # ✅ FETCH USER CONTENT HISTORY (ASYNC + OPTIMIZED)
     # =========================================================
+    def _history_statement(
+        self,
+        stmt: Select,
+        user_id: UUID,
+        content_type: Optional[str],
+        limit: int,
+        offset: int,
+        after: Optional[KeysetPosition]
+    ) -> Optional[Select]:
+        """
+        Filter, order and page a history select; None for an unknown content_type.
+        Order is (created_at DESC, id ASC) - the ix_generated_content_user_*_created index
+        order - so pages are stable. With `after` (the last row of the previous page) the
+        page is read by keyset and costs the same at any depth; offset is then ignored.
+        """
+        stmt = stmt.where(GeneratedContent.user_id == user_id)
+
+        if content_type:
+            try:
+                stmt = stmt.where(GeneratedContent.content_type == ContentType(content_type))
+            except ValueError:
+                logger.warning(f"❌ Invalid content_type '{content_type}', returning empty list.")
+                return None
+
+        if after:
+            # ✅ Mixed directions rule out a row comparison; the <= bound is the index range
+            stmt = stmt.where(
+                GeneratedContent.created_at <= after.created_at,
+                or_(
+                    GeneratedContent.created_at < after.created_at,
+                    and_(GeneratedContent.created_at == after.created_at, GeneratedContent.id > after.id)
+                )
+            )
+        else:
+            stmt = stmt.offset(offset)
+
+        return stmt.order_by(GeneratedContent.created_at.desc(), GeneratedContent.id).limit(limit)
+
     async def get_user_content_history(
         self,
         db: AsyncSession,
         user_id: UUID,
         content_type: Optional[str] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[KeysetPosition] = None
     ) -> List[GeneratedContent]:
         """
-        Fetch user's generated content history with optional filtering.
-        Fully async & optimized for large datasets.
+        Fetch user's generated content history as entities (heavy columns stay deferred).
         """
         try:
-            logger.info(f"STAGE ✅: Fetching content history for {user_id} | Limit={limit}, Offset={offset}")
-
-            stmt = select(GeneratedContent).where(GeneratedContent.user_id == user_id)
+            mode = "Keyset" if after else f"Offset={offset}"
+            logger.info(f"STAGE ✅: Fetching content history for {user_id} | Limit={limit}, {mode}")
 
-            if content_type:
-                try:
-                    stmt = stmt.where(GeneratedContent.content_type == ContentType(content_type))
-                except ValueError:
-                    logger.warning(f"❌ Invalid content_type '{content_type}', returning empty list.")
-                    return []
-
-            stmt = stmt.order_by(GeneratedContent.created_at.desc()).offset(offset).limit(limit)
+            stmt = self._history_statement(select(GeneratedContent), user_id, content_type, limit, offset, after)
+            if stmt is None:
+                return []
             result = await db.execute(stmt)
             records = result.scalars().all()
 
@@ -49,6 +93,87 @@ class ContentService:
             logger.error(f"❌ Error fetching content history for {user_id}: {e}")
             return []
 
+    async def get_user_content_history_rows(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        content_type: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        after: Optional[KeysetPosition] = None
+    ) -> List[Row]:
+        """
+        Same page as get_user_content_history, but only the HISTORY_COLUMNS as plain rows:
+        no entities, identity map or heavy columns. Rows expose id, content_type, title,
+        created_at and content_metadata.
+        """
+        try:
+            mode = "Keyset" if after else f"Offset={offset}"
+            logger.info(f"STAGE ✅: Fetching content history rows for {user_id} | Limit={limit}, {mode}")
+
+            stmt = self._history_statement(select(*HISTORY_COLUMNS), user_id, content_type, limit, offset, after)
+            if stmt is None:
+                return []
+            result = await db.execute(stmt)
+            rows = result.all()
+
+            logger.info(f"STAGE ✅: Retrieved {len(rows)} rows for {user_id}")
+            return list(rows)
+
+        except Exception as e:
+            logger.error(f"❌ Error fetching content history rows for {user_id}: {e}")
+            return []
+
+    async def get_user_content_history_collapsed(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        content_type: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[KeysetPosition] = None,
+        max_scan: int = settings.HISTORY_COLLAPSE_MAX_SCAN
+    ) -> Tuple[List[Row], Dict[UUID, int], Optional[KeysetPosition]]:
+        """
+        History rows with near-duplicate ideas collapsed into the newest of each group (see
+        idea_dedup.collapse): (rows, older duplicates per shown row, position to continue
+        after - None at the end). Pages are read by keyset until limit rows are left; at most
+        max_scan rows are read, so a page over a long run of duplicates can come back short
+        with a position still set.
+        """
+        try:
+            logger.info(f"STAGE ✅: Fetching collapsed content history for {user_id} | Limit={limit}")
+            visible: List[Row] = []
+            duplicates: Dict[UUID, int] = {}
+            position, scanned, chunk = after, 0, limit + 1
+            while True:
+                stmt = self._history_statement(select(*HISTORY_COLUMNS), user_id, content_type, chunk, 0, position)
+                if stmt is None:
+                    return [], {}, None
+                rows = (await db.execute(stmt)).all()
+                scanned += len(rows)
+                hidden, counts = await idea_dedup.collapse(db, user_id, rows)
+                visible.extend(row for row in rows if row.id not in hidden)
+                duplicates.update(counts)
+                if rows:
+                    position = KeysetPosition(rows[-1].created_at, rows[-1].id)
+
+                if len(visible) > limit:
+                    visible = visible[:limit]
+                    position = KeysetPosition(visible[-1].created_at, visible[-1].id)
+                    break
+                if len(rows) < chunk:
+                    position = None
+                    break
+                if scanned >= max_scan:
+                    break
+
+            logger.info(f"STAGE ✅: Retrieved {len(visible)} of {scanned} scanned rows for {user_id}")
+            return visible, {row.id: duplicates[row.id] for row in visible if row.id in duplicates}, position
+
+        except Exception as e:
+            logger.error(f"❌ Error fetching collapsed content history for {user_id}: {e}")
+            return [], {}, None
+
     # =========================================================
     # ✅ DELETE USER CONTENT (ASYNC + SAFE)
     # =========================================================
@@ -86,7 +211,7 @@ class ContentService:
             return False
 
     # =========================================================
-    # ✅ FUTURE: BULK INSERT (FOR IDEA GENERATION)
+    # ✅ BULK INSERT - ORM (add_all; one INSERT per row unless the dialect batches it)
     # =========================================================
     async def bulk_insert_content(
         self,
@@ -94,7 +219,7 @@ class ContentService:
         content_records: List[GeneratedContent]
     ) -> bool:
         """
-        Bulk insert generated content records (optimized for large idea generation batches).
+        Bulk insert generated content records through the ORM unit of work.
         """
         try:
             logger.info(f"STAGE ✅: Bulk inserting {len(content_records)} content records...")
@@ -107,6 +232,141 @@ class ContentService:
             await db.rollback()
             return False
 
+    # =========================================================
+    # ✅ BULK INSERT - CORE (Multi-row INSERT ... RETURNING, or COPY for large batches)
+    # =========================================================
+    async def bulk_insert_rows(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]],
+        method: str = "auto",
+        commit: bool = True
+    ) -> List[UUID]:
+        """
+        Insert GeneratedContent rows given as dicts keyed by model attribute name and return
+        their ids in input order. Skips the ORM unit of work entirely.
+
+        method="values" sends one multi-row INSERT ... RETURNING per page of rows (SQLAlchemy
+        insertmanyvalues, paged under the driver's bind-parameter limit); method="copy" streams
+        the rows with asyncpg COPY (PostgreSQL only); "auto" picks COPY at or above
+        BULK_INSERT_COPY_MIN_ROWS. Columns left out get their usual defaults: created_at from
+        the server, everything else from the model. Rows with a minhash (ideas) also get their
+        content_minhash_bands rows, written the same way in the same transaction. Raises on
+        failure (after rolling back when commit=True), so callers can refund quota.
+        """
+        if not rows:
+            return []
+        if method == "auto":
+            use_copy = db.bind.dialect.driver == "asyncpg" and len(rows) >= settings.BULK_INSERT_COPY_MIN_ROWS
+            method = "copy" if use_copy else "values"
+        if method not in ("values", "copy"):
+            raise ValueError(f"Unknown bulk insert method '{method}'")
+
+        try:
+            logger.info(f"STAGE ✅: Bulk inserting {len(rows)} content rows ({method})...")
+            records = [_column_keyed(row) for row in rows]
+            if method == "copy":
+                ids = await _copy_rows(db, records)
+            else:
+                table = GeneratedContent.__table__
+                stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+                result = await db.execute(stmt, records)
+                ids = list(result.scalars().all())
+            band_rows = idea_dedup.band_rows(rows, ids)
+            if band_rows and method == "copy":
+                await _copy_band_rows(db, band_rows)
+            elif band_rows:
+                await db.execute(insert(ContentMinHashBand.__table__), band_rows)
+            if commit:
+                await db.commit()
+            logger.info(f"✅ Bulk insert of {len(ids)} rows successful.")
+            return ids
+        except Exception as e:
+            logger.error(f"❌ Bulk insert of {len(rows)} rows failed: {e}")
+            if commit:
+                await db.rollback()
+            raise
+
+
+# =========================================================
+# ✅ BULK INSERT HELPERS
+# =========================================================
+_COLUMN_KEYS = {attr: column.key for attr, column in GeneratedContent.__mapper__.columns.items()}
+
+
+def _column_keyed(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Attribute names -> column keys (content_metadata -> metadata)."""
+    try:
+        return {_COLUMN_KEYS[attr]: value for attr, value in row.items()}
+    except KeyError as e:
+        raise ValueError(f"GeneratedContent has no column attribute {e}") from None
+
+
+async def _copy_rows(db: AsyncSession, records: List[Dict[str, Any]]) -> List[UUID]:
+    """
+    COPY rows into generated_content over the session's own asyncpg connection (same
+    transaction). COPY cannot evaluate client-side defaults, so they are filled in here,
+    column by column: Python defaults per row, SQL defaults (now()) once per batch - the
+    same value the server would use inside one transaction. Columns with a server default
+    are left out.
+    """
+    table = GeneratedContent.__table__
+    dialect = db.bind.dialect
+    given = set().union(*records)
+    columns = [c for c in table.columns if c.key in given or c.server_default is None]
+
+    values: Dict[str, List[Any]] = {}
+    for column in columns:
+        default = column.default
+        if column.key in given:
+            raw = [record.get(column.key) for record in records]
+        elif default is not None and default.is_callable:
+            first = default.arg(None)
+            if isinstance(first, (dict, list)) and not first:
+                # ✅ lambda: {} only avoids shared mutable state; encoded, it is one constant
+                raw = [first] * len(records)
+            else:
+                raw = [first] + [default.arg(None) for _ in records[1:]]
+        elif default is not None and default.is_clause_element:
+            raw = [await db.scalar(select(cast(default.arg, column.type)))] * len(records)
+        else:
+            raw = [default.arg if default is not None and default.is_scalar else None] * len(records)
+        values[column.key] = raw
+
+    ids = values[table.c.id.key]
+    for column in columns:
+        processor = column.type.dialect_impl(dialect).bind_processor(dialect)
+        if processor:
+            column_values = values[column.key]
+            if column_values and all(value is column_values[0] for value in column_values):
+                values[column.key] = [None if column_values[0] is None else processor(column_values[0])] * len(column_values)
+            else:
+                values[column.key] = [None if value is None else processor(value) for value in column_values]
+    tuples = list(zip(*(values[column.key] for column in columns)))
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=tuples,
+        columns=[column.name for column in columns],
+        schema_name=table.schema
+    )
+    return ids
+
+
+async def _copy_band_rows(db: AsyncSession, band_rows: List[Dict[str, Any]]) -> None:
+    """COPY content_minhash_bands rows (no defaults to fill in) over the session's connection."""
+    table = ContentMinHashBand.__table__
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=[(row["band_key"], row["content_id"]) for row in band_rows],
+        columns=["band_key", "content_id"],
+        schema_name=table.schema
+    )
+
 
 # ✅ GLOBAL INSTANCE (import this directly in routes)
 content_service = ContentService()
@@ -1,39 +1,40 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
 from app.models.copyright import CopyrightMonitor
 from app.schemas.copyright import CopyrightViolationCreate
-from app.models.user import User
 
-def get_user_copyright_violations(db: Session, user: User) -> List[CopyrightMonitor]:
-    return (
-        db.query(CopyrightMonitor)
-        .filter(CopyrightMonitor.user_id == user.id)
-        .all()
+async def get_user_copyright_violations(db: AsyncSession, user_id: UUID) -> List[CopyrightMonitor]:
+    result = await db.execute(
+        select(CopyrightMonitor)
+        .where(CopyrightMonitor.user_id == user_id)
     )
+    return list(result.scalars().all())
 
-def log_copyright_violation(
-    db: Session, user: User, violation_data: CopyrightViolationCreate
+async def log_copyright_violation(
+    db: AsyncSession, user_id: UUID, violation_data: CopyrightViolationCreate
 ) -> CopyrightMonitor:
     new_violation = CopyrightMonitor(
-        user_id=user.id,
+        user_id=user_id,
         platform=violation_data.platform,
         content_url=violation_data.content_url,
         detected_at=violation_data.detected_at,
         status=violation_data.status,
     )
     db.add(new_violation)
-    db.commit()
-    db.refresh(new_violation)
+    await db.commit()
+    await db.refresh(new_violation)
     return new_violation
 
-def get_copyright_violation(
-    db: Session, user: User, violation_id: int
-) -> CopyrightMonitor:
-    return (
-        db.query(CopyrightMonitor)
-        .filter(
+async def get_copyright_violation(
+    db: AsyncSession, user_id: UUID, violation_id: int
+) -> Optional[CopyrightMonitor]:
+    result = await db.execute(
+        select(CopyrightMonitor)
+        .where(
             CopyrightMonitor.id == violation_id,
-            CopyrightMonitor.user_id == user.id
+            CopyrightMonitor.user_id == user_id
         )
-        .first()
     )
+    return result.scalars().first()
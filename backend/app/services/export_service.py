@@ -0,0 +1,216 @@
+import csv
+import enum
+import io
+import json
+import logging
+import time
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import JSON, Column, ColumnElement, DateTime, Enum, Select, Table, Text, Uuid, cast, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.content import ContentAnalytics, ContentType, GeneratedContent
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_RESOURCES = ("content", "analytics", "all")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+# =========================================================
+# ✅ SERIALIZATION (One batch of rows -> text)
+# =========================================================
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    return "" if value is None else _jsonable(value)
+
+
+def _ndjson_encoders(stmt: Select, raw_json: Sequence[bool]) -> List[Callable[[Any], str]]:
+    """
+    One JSON encoder per selected column, picked once from its SQL type instead of
+    inspecting every value. raw_json columns arrive as JSON text (cast in SQL) and are
+    spliced in as-is rather than decoded by the driver and re-encoded here.
+    """
+    encoders: List[Callable[[Any], str]] = []
+    for column, raw in zip(stmt.selected_columns, raw_json):
+        column_type = column.type
+        if raw:
+            encoders.append(str)
+        elif isinstance(column_type, Enum) and column_type.enum_class is not None:
+            encoded = {member: json.dumps(member.value) for member in column_type.enum_class}
+            encoders.append(encoded.__getitem__)
+        elif isinstance(column_type, Uuid):
+            encoders.append(lambda value: f'"{value}"')
+        elif isinstance(column_type, DateTime):
+            encoders.append(lambda value: f'"{value.isoformat()}"')
+        else:
+            encoders.append(lambda value: json.dumps(value, ensure_ascii=False))
+    return encoders
+
+
+def _ndjson_batch(record: str, columns: Sequence[str], rows: Sequence[Tuple], encoders: Sequence[Callable]) -> str:
+    prefix = '{"record":' + json.dumps(record)
+    fields = list(zip(["," + json.dumps(column) + ":" for column in columns], encoders))
+    lines = []
+    for row in rows:
+        parts = [prefix]
+        for (key, encode), value in zip(fields, row):
+            parts.append(key + ("null" if value is None else encode(value)))
+        parts.append("}\n")
+        lines.append("".join(parts))
+    return "".join(lines)
+
+
+def _csv_batch(columns: Sequence[str], rows: Sequence[Tuple], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _export_columns(table: Table, exclude: Sequence[Column] = ()) -> Tuple[List[ColumnElement], List[bool]]:
+    """Table columns to select, with JSON columns cast to their JSON text, and which ones those are."""
+    columns, raw_json = [], []
+    for column in table.c:
+        if column in exclude:
+            continue
+        is_json = isinstance(column.type, JSON)
+        columns.append(cast(column, Text).label(column.name) if is_json else column)
+        raw_json.append(is_json)
+    return columns, raw_json
+
+
+class ExportService:
+    """Streams a user's whole library as NDJSON or CSV, one server-side cursor batch at a time."""
+
+    def __init__(self, session_factory=AsyncSessionLocal, batch_rows: int = settings.EXPORT_BATCH_ROWS):
+        self.session_factory = session_factory
+        self.batch_rows = batch_rows
+
+    # =========================================================
+    # ✅ VALIDATION (Before the response starts - errors cannot change the status later)
+    # =========================================================
+    def validate(self, fmt: str, resource: str, content_type: Optional[str]) -> Optional[ContentType]:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        if resource not in EXPORT_RESOURCES:
+            raise ValueError(f"resource must be one of {', '.join(EXPORT_RESOURCES)}")
+        if fmt == "csv" and resource == "all":
+            raise ValueError("CSV exports one resource at a time (content or analytics)")
+        if not content_type:
+            return None
+        try:
+            return ContentType(content_type)
+        except ValueError:
+            raise ValueError(f"Unknown content_type '{content_type}'") from None
+
+    def _statements(
+        self,
+        user_id: UUID,
+        resource: str,
+        content_type: Optional[ContentType]
+    ) -> List[Tuple[str, Select, List[bool]]]:
+        """(record name, select, raw JSON flag per column) for each exported table."""
+        content_table = GeneratedContent.__table__
+        statements = []
+        if resource in ("content", "all"):
+            # ✅ minhash is a derived dedup signature (binary), not user data
+            columns, raw_json = _export_columns(content_table, exclude=[content_table.c.user_id, content_table.c.minhash])
+            stmt = (
+                select(*columns)
+                .where(content_table.c.user_id == user_id)
+                .order_by(content_table.c.created_at.desc(), content_table.c.id)
+            )
+            if content_type:
+                stmt = stmt.where(content_table.c.content_type == content_type)
+            statements.append(("content", stmt, raw_json))
+        if resource in ("analytics", "all"):
+            columns, raw_json = _export_columns(ContentAnalytics.__table__)
+            stmt = (
+                select(*columns)
+                .join(content_table, ContentAnalytics.__table__.c.content_id == content_table.c.id)
+                .where(content_table.c.user_id == user_id)
+            )
+            if content_type:
+                stmt = stmt.where(content_table.c.content_type == content_type)
+            statements.append(("analytics", stmt, raw_json))
+        return statements
+
+    # =========================================================
+    # ✅ STREAM (Own session; server-side cursor; gzip member flushed per batch)
+    # =========================================================
+    async def stream(
+        self,
+        user_id: UUID,
+        fmt: str = "ndjson",
+        resource: str = "content",
+        content_type: Optional[str] = None,
+        compress: bool = True
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the export as bytes (one gzip chunk per batch when compress=True). Only one
+        batch of rows is in memory at a time: the database keeps the cursor position and
+        each batch is serialized, compressed and handed to the client before the next.
+        """
+        parsed_type = self.validate(fmt, resource, content_type)
+        compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+        started = time.perf_counter()
+        rows_out = bytes_out = 0
+
+        def encode(text: str, final: bool = False) -> bytes:
+            data = text.encode()
+            if compressor is None:
+                return data
+            return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+        logger.info(f"STAGE ✅: Exporting {resource} for {user_id} as {fmt}{'.gz' if compress else ''}")
+        # ✅ Own session: the response body is produced after the request-scoped one is closed
+        async with self.session_factory() as session:
+            for record, stmt, raw_json in self._statements(user_id, resource, parsed_type):
+                result = await session.stream(stmt.execution_options(yield_per=self.batch_rows))
+                columns = list(result.keys())
+                encoders = _ndjson_encoders(stmt, raw_json)
+                header = fmt == "csv"
+                async for batch in result.partitions():
+                    if fmt == "csv":
+                        text = _csv_batch(columns, batch, header)
+                    else:
+                        text = _ndjson_batch(record, columns, batch, encoders)
+                    header = False
+                    rows_out += len(batch)
+                    chunk = encode(text)
+                    bytes_out += len(chunk)
+                    yield chunk
+                if header:
+                    # ✅ Empty CSV still gets its header row
+                    chunk = encode(_csv_batch(columns, [], True))
+                    bytes_out += len(chunk)
+                    yield chunk
+
+        if compressor is not None:
+            tail = encode("", final=True)
+            bytes_out += len(tail)
+            yield tail
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"✅ Exported {rows_out} rows ({bytes_out} bytes) for {user_id} in {elapsed:.2f}s")
+
+
+# ✅ GLOBAL INSTANCE
+export_service = ExportService()
@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FanOutResult:
+    """Per-key outcome of a fan-out: results (including fallbacks), errors, timeouts and latency."""
+
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.timed_out: List[str] = []
+        self.latency_ms: Dict[str, float] = {}
+        self.wall_clock_ms: float = 0.0
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [key for key in self.results if key not in self.errors]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "wall_clock_ms": self.wall_clock_ms,
+            "failed": sorted(self.errors),
+            "timed_out": self.timed_out,
+        }
+
+
+# =========================================================
+# ✅ FAN-OUT EXECUTOR (Global + per-user concurrency caps)
+# =========================================================
+class FanOutExecutor:
+    """
+    Runs a set of independent coroutines concurrently, bounded by a process-wide limit and a
+    per-user limit, with a timeout per item. Failed or timed-out items get a fallback value
+    instead of failing the whole batch.
+    """
+
+    def __init__(self, global_limit: int, per_user_limit: int, timeout_seconds: float):
+        self.global_limit = global_limit
+        self.per_user_limit = per_user_limit
+        self.timeout_seconds = timeout_seconds
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+        self._user_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._user_refcounts: Dict[str, int] = {}
+
+    def _get_global_semaphore(self) -> asyncio.Semaphore:
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.global_limit)
+        return self._global_semaphore
+
+    def _acquire_user_semaphore(self, user_key: str) -> asyncio.Semaphore:
+        if user_key not in self._user_semaphores:
+            self._user_semaphores[user_key] = asyncio.Semaphore(self.per_user_limit)
+            self._user_refcounts[user_key] = 0
+        self._user_refcounts[user_key] += 1
+        return self._user_semaphores[user_key]
+
+    def _release_user_semaphore(self, user_key: str) -> None:
+        self._user_refcounts[user_key] -= 1
+        if self._user_refcounts[user_key] <= 0:
+            del self._user_refcounts[user_key]
+            del self._user_semaphores[user_key]
+
+    async def run(
+        self,
+        jobs: Dict[str, Callable[[], Awaitable[Any]]],
+        user_key: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        fallback: Optional[Callable[[str, BaseException], Any]] = None
+    ) -> FanOutResult:
+        result = FanOutResult()
+        timeout = timeout_seconds or self.timeout_seconds
+        global_semaphore = self._get_global_semaphore()
+        user_semaphore = self._acquire_user_semaphore(user_key) if user_key else None
+
+        async def run_one(key: str, job: Callable[[], Awaitable[Any]]) -> None:
+            # ✅ Per-user slot first: items queued behind their own user's limit must not hold
+            # global slots, or one large fan-out starves every other user's
+            async with user_semaphore or contextlib.nullcontext():
+                async with global_semaphore:
+                    start = time.perf_counter()
+                    try:
+                        result.results[key] = await asyncio.wait_for(job(), timeout=timeout)
+                    except asyncio.TimeoutError as e:
+                        logger.error(f"❌ Fan-out item '{key}' timed out after {timeout}s")
+                        result.timed_out.append(key)
+                        result.errors[key] = "timeout"
+                        result.results[key] = fallback(key, e) if fallback else None
+                    except Exception as e:
+                        logger.error(f"❌ Fan-out item '{key}' failed: {e}")
+                        result.errors[key] = str(e)
+                        result.results[key] = fallback(key, e) if fallback else None
+                    finally:
+                        result.latency_ms[key] = round((time.perf_counter() - start) * 1000, 1)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(run_one(key, job) for key, job in jobs.items()))
+        finally:
+            if user_key:
+                self._release_user_semaphore(user_key)
+        result.wall_clock_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        # ✅ Keep the caller's key order (gather completes in arbitrary order)
+        result.results = {key: result.results.get(key) for key in jobs}
+        return result
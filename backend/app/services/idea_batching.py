@@ -0,0 +1,66 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.response_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class IdeaJob:
+    """One topic of a batch request, with the niche/audience already resolved for the user."""
+    __slots__ = ("topic", "niche", "audience", "count", "platform", "use_cache")
+
+    def __init__(
+        self,
+        topic: str,
+        niche: str,
+        audience: str,
+        count: int = 5,
+        platform: Optional[str] = None,
+        use_cache: bool = True
+    ):
+        self.topic = topic
+        self.niche = niche
+        self.audience = audience
+        self.count = count
+        self.platform = platform
+        self.use_cache = use_cache
+
+    @property
+    def pack_key(self) -> Tuple[str, str, str]:
+        """Jobs can share a prompt when everything except the topic and count matches."""
+        return normalize_text(self.niche), normalize_text(self.audience), (self.platform or "").lower()
+
+
+# ✅ (position in the batch, job)
+IndexedJob = Tuple[int, IdeaJob]
+
+
+# =========================================================
+# ✅ PACKING (Compatible topics -> one completion)
+# =========================================================
+def pack_jobs(jobs: Sequence[IndexedJob], max_topics: int, max_ideas: int) -> List[List[IndexedJob]]:
+    """
+    Group jobs by pack_key, then split each group greedily (in request order) into packs of
+    at most max_topics topics and max_ideas ideas, so one completion stays within its budget.
+    """
+    groups: Dict[Tuple[str, str, str], List[IndexedJob]] = {}
+    for indexed in jobs:
+        groups.setdefault(indexed[1].pack_key, []).append(indexed)
+
+    packs: List[List[IndexedJob]] = []
+    for group in groups.values():
+        pack: List[IndexedJob] = []
+        ideas = 0
+        for indexed in group:
+            count = indexed[1].count
+            if pack and (len(pack) >= max_topics or ideas + count > max_ideas):
+                packs.append(pack)
+                pack, ideas = [], 0
+            pack.append(indexed)
+            ideas += count
+        if pack:
+            packs.append(pack)
+
+    logger.info(f"STAGE ✅: Packed {len(jobs)} idea topics into {len(packs)} completion(s)")
+    return packs
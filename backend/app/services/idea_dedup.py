@@ -0,0 +1,315 @@
+import asyncio
+import hashlib
+import logging
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.content import ContentMinHashBand, GeneratedContent
+from app.services.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# ✅ Stored signatures depend on all of these: changing one means re-signing every idea.
+# 20 bands x 5 rows: pairs at Jaccard 0.7 share a band 97.5% of the time, at 0.3 only 5%
+MINHASH_PERMUTATIONS = 100
+LSH_BANDS = 20
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+_PRIME = (1 << 32) - 5  # ✅ Largest 32-bit prime: (a * x + b) % p stays below 2^64 for a < 2^31
+
+
+def _coefficients(label: str, low: int, high: int) -> np.ndarray:
+    """Fixed pseudo-random coefficients (hashlib, so they never change with the numpy version)."""
+    return np.array([
+        low + int.from_bytes(hashlib.blake2b(f"{label}:{i}".encode(), digest_size=8).digest(), "little") % (high - low)
+        for i in range(MINHASH_PERMUTATIONS)
+    ], dtype=np.uint64)
+
+
+_A = _coefficients("minhash-a", 1, 1 << 31)
+_B = _coefficients("minhash-b", 0, _PRIME)
+
+RepeatFilter = Callable[[List[Dict]], Awaitable[List[bool]]]
+
+
+# =========================================================
+# ✅ SIGNATURES (Word shingles -> MinHash -> LSH band keys)
+# =========================================================
+def shingles(title: str, description: str = "") -> Set[str]:
+    """Stemmed words and word pairs of title + description (stopwords dropped, as in search)."""
+    tokens = tokenize(f"{title} {description}")
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash(items: Set[str]) -> Optional[np.ndarray]:
+    """MinHash signature (uint32 per permutation) of a shingle set; None when it is empty."""
+    if not items:
+        return None
+    hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items))
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def encode_signature(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def decode_signature(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+def idea_signature(title: str, description: str = "") -> Optional[bytes]:
+    """Encoded signature for GeneratedContent.minhash (4 bytes per permutation), or None."""
+    signature = minhash(shingles(title, description))
+    return None if signature is None else encode_signature(signature)
+
+
+def band_keys(signature: np.ndarray, salt: bytes = b"") -> List[int]:
+    """One signed 64-bit key per band (BIGINT); the salt (a user id) keeps users' keys apart."""
+    data = signature.astype("<u4").tobytes()
+    width = LSH_ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(salt + bytes([band]) + data[band * width:(band + 1) * width], digest_size=8).digest(),
+            "little",
+            signed=True
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the share of permutations with the same minimum."""
+    return float(np.count_nonzero(a == b)) / MINHASH_PERMUTATIONS
+
+
+class MinHashLSH:
+    """
+    In-process LSH index over MinHash signatures: candidates share at least one band,
+    then the full signatures are compared. Used to compare a fresh set of ideas with each
+    other (and in benchmarks); stored ideas are looked up through content_minhash_bands.
+    """
+
+    def __init__(self, threshold: float = settings.IDEA_DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._buckets: Dict[int, List[Any]] = defaultdict(list)
+        self._signatures: Dict[Any, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: Any, signature: np.ndarray) -> None:
+        self._signatures[key] = signature
+        for band_key in band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Any, float]]:
+        """Keys at or above the threshold, most similar first."""
+        candidates = {key for band_key in band_keys(signature) for key in self._buckets.get(band_key, ())}
+        matches = [(key, similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted(
+            ((key, score) for key, score in matches if score >= self.threshold),
+            key=lambda item: -item[1]
+        )
+
+
+# =========================================================
+# ✅ DEDUP SERVICE (Stored ideas: signature column + band table)
+# =========================================================
+class IdeaDedupService:
+    """
+    Near-duplicate detection for generated ideas. Each saved idea carries a MinHash
+    signature of its title + description (GeneratedContent.minhash) and one
+    content_minhash_bands row per LSH band, written by content_service.bulk_insert_rows.
+    A lookup is one primary-key probe per band, then at most max_candidates stored
+    signatures are compared - the cost follows the number of similar ideas, not the size
+    of the library.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.IDEA_DEDUP_THRESHOLD,
+        max_candidates: int = settings.IDEA_DEDUP_MAX_CANDIDATES
+    ):
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+
+    @staticmethod
+    def band_rows(rows: Sequence[Dict[str, Any]], content_ids: Sequence[UUID]) -> List[Dict[str, Any]]:
+        """content_minhash_bands rows for the inserted GeneratedContent rows that carry a minhash."""
+        return [
+            {"band_key": band_key, "content_id": content_id}
+            for row, content_id in zip(rows, content_ids)
+            if row.get("minhash")
+            for band_key in band_keys(decode_signature(row["minhash"]), row["user_id"].bytes)
+        ]
+
+    async def _matches(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        signatures: Sequence[np.ndarray]
+    ) -> List[List[Tuple[UUID, float]]]:
+        """Stored ideas of user_id at or above the threshold, for each signature."""
+        wanted: Dict[int, List[int]] = defaultdict(list)
+        for position, signature in enumerate(signatures):
+            for band_key in band_keys(signature, user_id.bytes):
+                wanted[band_key].append(position)
+        if not wanted:
+            return []
+
+        result = await db.execute(
+            select(ContentMinHashBand.band_key, ContentMinHashBand.content_id)
+            .where(ContentMinHashBand.band_key.in_(list(wanted)))
+        )
+        shared: List[Dict[UUID, int]] = [defaultdict(int) for _ in signatures]
+        for band_key, content_id in result:
+            for position in wanted[band_key]:
+                shared[position][content_id] += 1
+
+        # ✅ Ideas sharing the most bands first: they are the likeliest near-duplicates
+        candidates = [
+            sorted(counts, key=counts.__getitem__, reverse=True)[:self.max_candidates] for counts in shared
+        ]
+        stored = await self._signatures(db, user_id, set().union(*candidates))
+        matches = []
+        for signature, ids in zip(signatures, candidates):
+            scored = [(content_id, similarity(signature, stored[content_id][1])) for content_id in ids if content_id in stored]
+            matches.append(sorted(
+                ((content_id, score) for content_id, score in scored if score >= self.threshold),
+                key=lambda item: -item[1]
+            ))
+        return matches
+
+    @staticmethod
+    async def _signatures(db: AsyncSession, user_id: UUID, content_ids: Iterable[UUID]) -> Dict[UUID, Tuple[datetime, np.ndarray]]:
+        content_ids = list(content_ids)
+        if not content_ids:
+            return {}
+        result = await db.execute(
+            select(GeneratedContent.id, GeneratedContent.created_at, GeneratedContent.minhash)
+            .where(GeneratedContent.id.in_(content_ids), GeneratedContent.user_id == user_id)
+        )
+        return {row.id: (row.created_at, decode_signature(row.minhash)) for row in result if row.minhash}
+
+    # =========================================================
+    # ✅ NEW IDEAS (Repeats of the library or of each other)
+    # =========================================================
+    async def find_repeats(self, db: AsyncSession, user_id: UUID, ideas: Sequence[Dict]) -> List[bool]:
+        """
+        For each idea, whether it nearly duplicates an idea already in the user's library
+        or an earlier one in the same list.
+        """
+        signatures = [minhash(shingles(idea.get("title", ""), idea.get("description", ""))) for idea in ideas]
+        present = [signature for signature in signatures if signature is not None]
+        stored = iter(await self._matches(db, user_id, present))
+
+        batch = MinHashLSH(self.threshold)
+        repeats = []
+        for position, signature in enumerate(signatures):
+            if signature is None:
+                repeats.append(False)
+                continue
+            repeat = bool(next(stored)) or bool(batch.query(signature))
+            if not repeat:
+                batch.add(position, signature)
+            repeats.append(repeat)
+
+        if any(repeats):
+            logger.info(f"STAGE ✅: {sum(repeats)}/{len(ideas)} ideas for {user_id} repeat earlier ideas")
+        return repeats
+
+    def repeat_filter(self, db: AsyncSession, user_id: UUID) -> RepeatFilter:
+        """
+        find_repeats bound to one session and user (for ai_service.generate_fresh_content_ideas);
+        calls are serialized, so concurrent re-asks can share it (and the session).
+        """
+        lock = asyncio.Lock()
+
+        async def find_repeats(ideas: List[Dict]) -> List[bool]:
+            async with lock:
+                return await self.find_repeats(db, user_id, ideas)
+        return find_repeats
+
+    # =========================================================
+    # ✅ HISTORY (Collapse near-duplicates into the newest one)
+    # =========================================================
+    async def collapse(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        rows: Sequence[Any]
+    ) -> Tuple[Set[UUID], Dict[UUID, int]]:
+        """
+        For history rows (id, created_at) in history order: the ids to hide - those with a
+        newer near-duplicate in the library - and, for the others, how many older
+        near-duplicates they stand for. Rows without a signature are never hidden. Each row
+        is compared with at most max_candidates ideas, taken from the newest ideas sharing
+        its bands, so a large cluster of copies is counted up to that many.
+        """
+        if not rows:
+            return set(), {}
+        page = (
+            select(ContentMinHashBand.band_key, ContentMinHashBand.content_id)
+            .where(ContentMinHashBand.content_id.in_([row.id for row in rows]))
+            .cte("page")
+        )
+        # ✅ Each band of the page is read once and keeps its newest max_candidates ideas only
+        # (only a newer near-duplicate can hide a row), so a hot band never fans out per row
+        newest = (
+            select(
+                ContentMinHashBand.band_key,
+                ContentMinHashBand.content_id,
+                func.row_number().over(
+                    partition_by=ContentMinHashBand.band_key,
+                    order_by=(GeneratedContent.created_at.desc(), GeneratedContent.id)
+                ).label("position")
+            )
+            .join(GeneratedContent, GeneratedContent.id == ContentMinHashBand.content_id)
+            .where(ContentMinHashBand.band_key.in_(select(page.c.band_key)))
+            .subquery("newest")
+        )
+        # ✅ Then, like a lookup, at most max_candidates per row: those sharing the most bands
+        ranked = (
+            select(
+                page.c.content_id,
+                newest.c.content_id.label("other_id"),
+                func.row_number().over(partition_by=page.c.content_id, order_by=func.count().desc()).label("rank")
+            )
+            .join(newest, and_(newest.c.band_key == page.c.band_key, newest.c.content_id != page.c.content_id))
+            .where(newest.c.position <= self.max_candidates + 1)
+            .group_by(page.c.content_id, newest.c.content_id)
+            .subquery("ranked")
+        )
+        result = await db.execute(
+            select(ranked.c.content_id, ranked.c.other_id).where(ranked.c.rank <= self.max_candidates)
+        )
+        pairs = result.all()
+        if not pairs:
+            return set(), {}
+
+        stored = await self._signatures(db, user_id, {content_id for pair in pairs for content_id in pair})
+        hidden: Set[UUID] = set()
+        duplicates: Dict[UUID, int] = defaultdict(int)
+        for content_id, other_id in pairs:
+            if content_id not in stored or other_id not in stored:
+                continue
+            (created_at, signature), (other_created_at, other_signature) = stored[content_id], stored[other_id]
+            if similarity(signature, other_signature) < self.threshold:
+                continue
+            # ✅ History order is created_at DESC, id ASC: "newer" is whatever it lists first
+            if (other_created_at, -other_id.int) > (created_at, -content_id.int):
+                hidden.add(content_id)
+            else:
+                duplicates[content_id] += 1
+        return hidden, {content_id: count for content_id, count in duplicates.items() if content_id not in hidden}
+
+
+# ✅ GLOBAL INSTANCE
+idea_dedup = IdeaDedupService()
@@ -0,0 +1,156 @@
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.schemas.content import GeneratedIdea
+from app.services.json_stream import extract_json_items
+
+logger = logging.getLogger(__name__)
+
+# ✅ Keys models use instead of ours, in order of preference
+_FIELD_ALIASES = {
+    "title": ("title", "name", "headline", "idea"),
+    "description": ("description", "summary", "details", "content"),
+    "engagement_score": ("engagement_score", "engagementScore", "engagement", "score"),
+    "hashtags": ("hashtags", "tags", "hashTags"),
+}
+_HASHTAG_SPLIT = re.compile(r"[\s,]+")
+
+
+# =========================================================
+# ✅ IDEA VALIDATION (Normalize, then check the ContentIdeaResponse fields)
+# =========================================================
+def _score(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip("%"))
+        except ValueError:
+            return value
+    if isinstance(value, float):
+        # ✅ 0.85 means 85; anything else is rounded
+        return round(value * 100) if 0 < value < 1 else round(value)
+    return value
+
+
+def _hashtags(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = _HASHTAG_SPLIT.split(value)
+    if not isinstance(value, list):
+        return []
+    tags = []
+    for tag in value:
+        if isinstance(tag, str) and tag.strip("# "):
+            tag = "#" + tag.strip().lstrip("#")
+            if tag not in tags:
+                tags.append(tag)
+    return tags
+
+
+def normalize_idea(item: Any) -> Optional[Dict]:
+    """A valid idea dict (title, description, engagement_score 0-100, hashtags) or None."""
+    if not isinstance(item, dict):
+        return None
+    fields: Dict[str, Any] = {}
+    for field, keys in _FIELD_ALIASES.items():
+        for key in keys:
+            if item.get(key) not in (None, ""):
+                fields[field] = item[key]
+                break
+    for field in ("title", "description"):
+        if isinstance(fields.get(field), str):
+            fields[field] = fields[field].strip()
+    if "engagement_score" in fields:
+        fields["engagement_score"] = _score(fields["engagement_score"])
+    fields["hashtags"] = _hashtags(fields.get("hashtags"))
+    try:
+        return GeneratedIdea(**fields).model_dump()
+    except ValidationError:
+        return None
+
+
+def merge_ideas(ideas: List[Dict], new: List[Dict], count: int) -> None:
+    """Append new ideas in place, skipping repeated titles, up to count."""
+    seen = {idea["title"].casefold() for idea in ideas}
+    for idea in new:
+        if len(ideas) >= count:
+            break
+        if idea["title"].casefold() not in seen:
+            seen.add(idea["title"].casefold())
+            ideas.append(idea)
+
+
+def strictly_parseable(text: str) -> bool:
+    """Whether the old json.loads(content.strip()) path would have accepted this response."""
+    try:
+        json.loads((text or "").strip())
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+# =========================================================
+# ✅ SALVAGE STATS (Exposed on /metrics)
+# =========================================================
+class IdeaSalvageStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.clean = 0
+        self.salvaged = 0
+        self.unusable = 0
+        self.items_seen = 0
+        self.items_valid = 0
+        self.reasks = 0
+
+    def record(self, items_seen: int, items_valid: int, clean: bool) -> None:
+        with self._lock:
+            self.responses += 1
+            self.items_seen += items_seen
+            self.items_valid += items_valid
+            if clean and items_valid == items_seen:
+                self.clean += 1
+            elif items_valid:
+                self.salvaged += 1
+            else:
+                self.unusable += 1
+
+    def record_reask(self) -> None:
+        with self._lock:
+            self.reasks += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            noisy = self.salvaged + self.unusable
+            return {
+                "responses": self.responses,
+                "clean": self.clean,
+                "salvaged": self.salvaged,
+                "unusable": self.unusable,
+                "salvage_rate": round(self.salvaged / noisy, 3) if noisy else None,
+                "items_seen": self.items_seen,
+                "items_valid": self.items_valid,
+                "reasks": self.reasks,
+                # ✅ Each salvaged response used to end in placeholder ideas and a full paid retry
+                "regenerations_avoided": self.salvaged,
+            }
+
+
+def salvage_ideas(text: str, count: int) -> List[Dict]:
+    """Valid ideas (at most count) from a noisy model response; records salvage stats."""
+    items = extract_json_items(text)
+    valid = [idea for idea in map(normalize_idea, items) if idea]
+    clean = strictly_parseable(text)
+    idea_salvage_stats.record(len(items), len(valid), clean)
+    if len(valid) < len(items) or not clean:
+        logger.info(f"STAGE ✅: Salvaged {len(valid)}/{len(items)} ideas from a noisy AI response")
+    ideas: List[Dict] = []
+    merge_ideas(ideas, valid, count)
+    return ideas
+
+
+# ✅ GLOBAL INSTANCE
+idea_salvage_stats = IdeaSalvageStats()
@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ✅ JOB REGISTRY (Issued background job id -> owner, in Redis)
+# =========================================================
+class JobRegistry:
+    """
+    Owner of every background job id handed out by the API, shared by all API workers.
+    Celery reports PENDING for ids it has never seen, so a job's state alone cannot tell
+    a queued job from a made-up id: ids missing here are unknown.
+    """
+
+    def __init__(self, client, ttl_seconds: int = settings.JOB_OWNER_TTL_SECONDS, key_prefix: str = "job:owner:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "JobRegistry":
+        import redis.asyncio as redis_asyncio
+        return cls(redis_asyncio.from_url(url))
+
+    async def register(self, job_id: str, user_id: UUID) -> None:
+        await self.client.set(f"{self.key_prefix}{job_id}", str(user_id), ex=self.ttl_seconds)
+
+    async def owner(self, job_id: str) -> Optional[str]:
+        owner = await self.client.get(f"{self.key_prefix}{job_id}")
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+
+# ✅ GLOBAL INSTANCE
+job_registry = JobRegistry.from_url(settings.REDIS_URL)
@@ -0,0 +1,142 @@
+import json
+import logging
+import re
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"'})
+_DECODER = json.JSONDecoder()
+
+
+def _repair(raw: str) -> str:
+    """Cheap fixes for the mistakes models actually make: trailing commas and curly quotes."""
+    return _TRAILING_COMMA.sub(r"\1", raw.translate(_SMART_QUOTES))
+
+
+def loads_lenient(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return json.loads(_repair(raw))
+
+
+# =========================================================
+# ✅ INCREMENTAL JSON ARRAY PARSER (Emit elements as they close)
+# =========================================================
+class JSONArrayStreamParser:
+    """
+    Feed model output token by token; every top-level element of the first JSON array is
+    returned as soon as its closing bracket arrives. Text before the array (prose, ```json
+    fences) is skipped, and string contents are tracked so braces inside titles don't count.
+    Elements are decoded leniently (trailing commas, curly quotes), and the complete elements
+    of a truncated array are still returned - feeding a whole response salvages them too.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.elements_parsed = 0
+        self.elements_invalid = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> List[Any]:
+        elements: List[Any] = []
+        for char in text:
+            if self._finished:
+                break
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                continue
+
+            if self._in_string:
+                self._buffer.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # ✅ Closing bracket of the outer array (a scalar element may still be buffered)
+                    self._emit(elements)
+                    self._finished = True
+                    continue
+                self._depth -= 1
+            elif char == "," and self._depth == 0:
+                self._emit(elements)
+                continue
+
+            if self._depth > 0 or char.strip():
+                self._buffer.append(char)
+            if self._depth == 0 and char in "}]":
+                self._emit(elements)
+        return elements
+
+    def _emit(self, elements: List[Any]) -> None:
+        raw = "".join(self._buffer).strip()
+        self._buffer = []
+        if not raw:
+            return
+        try:
+            elements.append(loads_lenient(raw))
+            self.elements_parsed += 1
+        except json.JSONDecodeError:
+            self.elements_invalid += 1
+            logger.error(f"❌ Skipping malformed streamed JSON element: {raw[:80]}")
+
+
+# =========================================================
+# ✅ TOLERANT EXTRACTION (JSON buried in prose / fences / truncation)
+# =========================================================
+def extract_json(text: str) -> Optional[Any]:
+    """
+    First JSON array or object in the text: tried as-is, then with light repairs, then from
+    the first '[' / '{' that decodes with raw_decode (ignores leading/trailing prose and
+    fences). An array that never closes returns None so the caller can salvage its elements.
+    """
+    text = (text or "").strip()
+    repaired = _repair(text)
+    for candidate in (text, repaired):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+    for index, char in enumerate(repaired):
+        if char in "[{":
+            try:
+                return _DECODER.raw_decode(repaired, index)[0]
+            except json.JSONDecodeError:
+                if char == "[":
+                    return None
+    return None
+
+
+def extract_json_items(text: str) -> List[Any]:
+    """
+    Items of the JSON array in a model response. Accepts a bare array, a wrapper object
+    ({"ideas": [...]}), a single object, or a truncated array (complete elements only).
+    """
+    value = extract_json(text)
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        lists = [item for item in value.values() if isinstance(item, list) and item and isinstance(item[0], dict)]
+        return lists[0] if len(lists) == 1 else [value]
+    return JSONArrayStreamParser().feed(text or "")
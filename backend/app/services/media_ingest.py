@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Dict, Optional
+from uuid import uuid4
+
+import magic
+from fastapi import HTTPException, Request, UploadFile, status
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VALID_MEDIA_EXTENSIONS = (".mp4", ".m4a", ".mp3", ".wav", ".webm", ".mpeg", ".ogg", ".oga", ".flac")
+VALID_MEDIA_MIME_PREFIXES = ("video/", "audio/")
+MAGIC_SNIFF_BYTES = 4096          # ✅ libmagic only needs the container header
+MAX_FORM_FIELD_BYTES = 64 * 1024  # ✅ Non-file form fields are tiny (title, tone, ...)
+
+
+class SpooledMedia:
+    """An upload persisted to the spool dir, with its size and SHA-256 computed while writing."""
+    __slots__ = ("path", "size", "sha256", "mime_type")
+
+    def __init__(self, path: str, size: int, sha256: str, mime_type: Optional[str] = None):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.mime_type = mime_type
+
+    def open(self):
+        """Fresh read handle - every stage/retry gets its own, the spool file is never consumed."""
+        return open(self.path, "rb")
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+            logger.info(f"🗑 Spooled upload deleted - {self.path}")
+
+
+class IngestedUpload:
+    """The spooled media part plus the plain form fields sent alongside it."""
+    __slots__ = ("media", "filename", "fields")
+
+    def __init__(self, media: SpooledMedia, filename: str, fields: Dict[str, str]):
+        self.media = media
+        self.filename = filename
+        self.fields = fields
+
+
+# =========================================================
+# ✅ SPOOL WRITER (One file, hashed + size-checked as bytes arrive)
+# =========================================================
+class _SpoolWriter:
+    def __init__(self, spool_dir: str, filename: str, max_bytes: int):
+        ext = os.path.splitext(filename)[1].lower() or ".mp4"
+        os.makedirs(spool_dir, exist_ok=True)
+        self.path = os.path.join(spool_dir, f"{uuid4().hex}{ext}")
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.mime_type: Optional[str] = None
+        self._head = bytearray()
+        self._file = open(self.path, "wb")
+
+    def _sniff(self, final: bool = False) -> None:
+        if self.mime_type is not None or (len(self._head) < MAGIC_SNIFF_BYTES and not final):
+            return
+        self.mime_type = magic.from_buffer(bytes(self._head), mime=True)
+        self._head = bytearray()
+        if not self.mime_type.startswith(VALID_MEDIA_MIME_PREFIXES):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"File content is not audio/video (detected {self.mime_type})"
+            )
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {self.max_bytes // (1024 * 1024)}MB upload limit"
+            )
+        if self.mime_type is None:
+            self._head += data[:MAGIC_SNIFF_BYTES - len(self._head)]
+            self._sniff()
+        self.hasher.update(data)
+        self._file.write(data)
+
+    def finish(self) -> SpooledMedia:
+        self._sniff(final=True)
+        self._file.close()
+        return SpooledMedia(self.path, self.size, self.hasher.hexdigest(), self.mime_type)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+# =========================================================
+# ✅ MEDIA INGESTOR
+# =========================================================
+class MediaIngestor:
+    """
+    Streams a multipart request body straight into a single spool file: the file part is
+    validated by extension + magic bytes from its first chunk, rejected as soon as it passes
+    max_bytes, and hashed on the way through. Disk writes are batched and run off the loop.
+    """
+
+    def __init__(self, spool_dir: str, max_bytes: int, write_batch_bytes: int = 1024 * 1024):
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self.write_batch_bytes = write_batch_bytes
+
+    @staticmethod
+    def _validate_filename(filename: str) -> None:
+        if not filename or not filename.lower().endswith(VALID_MEDIA_EXTENSIONS):
+            raise HTTPException(status_code=400, detail="File must be a valid audio/video format")
+
+    def _check_declared_length(self, request: Request) -> None:
+        # ✅ Reject before reading a byte when the client tells us the body is too big
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes + MAX_FORM_FIELD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds the {self.max_bytes // (1024 * 1024)}MB upload limit"
+            )
+
+    async def ingest(self, request: Request, file_field: str = "video_file") -> IngestedUpload:
+        self._check_declared_length(request)
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+        fields: Dict[str, str] = {}
+        state = {"name": None, "filename": None, "header_field": b"", "header_value": b"", "headers": {}}
+        field_buffer = bytearray()
+        pending = bytearray()
+        writer: Optional[_SpoolWriter] = None
+        finished: Optional[_SpoolWriter] = None
+
+        def on_part_begin() -> None:
+            state["headers"] = {}
+            field_buffer.clear()
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            state["header_field"] += data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            state["header_value"] += data[start:end]
+
+        def on_header_end() -> None:
+            state["headers"][state["header_field"].lower()] = state["header_value"]
+            state["header_field"] = b""
+            state["header_value"] = b""
+
+        def on_headers_finished() -> None:
+            nonlocal writer
+            _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+            state["name"] = options.get(b"name", b"").decode("latin-1")
+            filename = options.get(b"filename")
+            state["filename"] = filename.decode("utf-8", "replace") if filename is not None else None
+            if state["name"] == file_field:
+                if writer is not None or finished is not None:
+                    raise HTTPException(status_code=400, detail="Only one media file per request")
+                self._validate_filename(state["filename"])
+                writer = _SpoolWriter(self.spool_dir, state["filename"], self.max_bytes)
+
+        def on_part_data(data: bytes, start: int, end: int) -> None:
+            if state["name"] == file_field:
+                pending.extend(data[start:end])
+            else:
+                field_buffer.extend(data[start:end])
+                if len(field_buffer) > MAX_FORM_FIELD_BYTES:
+                    raise HTTPException(status_code=400, detail=f"Form field '{state['name']}' is too large")
+
+        def on_part_end() -> None:
+            if state["name"] != file_field and state["filename"] is None:
+                fields[state["name"]] = field_buffer.decode("utf-8", "replace")
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": on_part_begin,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+        })
+
+        async def flush() -> None:
+            if pending and writer is not None:
+                data = bytes(pending)
+                pending.clear()
+                await asyncio.to_thread(writer.write, data)
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                # ✅ Cheap size check per network chunk; the disk write is batched
+                if writer is not None and writer.size + len(pending) > self.max_bytes:
+                    writer.write(bytes(pending))
+                if len(pending) >= self.write_batch_bytes or (writer is not None and writer.mime_type is None):
+                    await flush()
+                if writer is not None and state["name"] != file_field:
+                    await flush()
+                    finished, writer = writer, None
+            parser.finalize()
+            await flush()
+            if writer is not None:
+                finished, writer = writer, None
+            if finished is None:
+                raise HTTPException(status_code=400, detail=f"Missing '{file_field}' file part")
+            media = await asyncio.to_thread(finished.finish)
+        except BaseException:
+            for spool in (writer, finished):
+                if spool is not None:
+                    spool.abort()
+            raise
+
+        logger.info(
+            f"📥 Ingested {finished.filename} -> {media.path} "
+            f"({media.size} bytes, {media.mime_type}, sha256={media.sha256[:12]})"
+        )
+        return IngestedUpload(media, finished.filename, fields)
+
+    async def ingest_file(self, upload: UploadFile) -> SpooledMedia:
+        """Spool an already-parsed UploadFile (single copy, same validation + hashing)."""
+        self._validate_filename(upload.filename)
+        writer = _SpoolWriter(self.spool_dir, upload.filename, self.max_bytes)
+
+        def copy() -> SpooledMedia:
+            upload.file.seek(0)
+            while True:
+                chunk = upload.file.read(self.write_batch_bytes)
+                if not chunk:
+                    break
+                writer.write(chunk)
+            return writer.finish()
+
+        try:
+            return await asyncio.to_thread(copy)
+        except BaseException:
+            writer.abort()
+            raise
+
+
+# ✅ GLOBAL INSTANCE
+media_ingestor = MediaIngestor(
+    spool_dir=settings.UPLOAD_SPOOL_DIR,
+    max_bytes=settings.MAX_UPLOAD_BYTES
+)
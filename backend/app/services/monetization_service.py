@@ -1,19 +1,20 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
 from app.models.monetization import BrandDeal
 from app.schemas.monetization import BrandDealCreate
-from app.models.user import User
 
-def get_user_brand_deals(db: Session, user: User) -> List[BrandDeal]:
-    return (
-        db.query(BrandDeal)
-        .filter(BrandDeal.user_id == user.id)
-        .all()
+async def get_user_brand_deals(db: AsyncSession, user_id: UUID) -> List[BrandDeal]:
+    result = await db.execute(
+        select(BrandDeal)
+        .where(BrandDeal.user_id == user_id)
     )
+    return list(result.scalars().all())
 
-def create_brand_deal(db: Session, user: User, deal_data: BrandDealCreate) -> BrandDeal:
+async def create_brand_deal(db: AsyncSession, user_id: UUID, deal_data: BrandDealCreate) -> BrandDeal:
     new_deal = BrandDeal(
-        user_id=user.id,
+        user_id=user_id,
         brand_name=deal_data.brand_name,
         amount=deal_data.amount,
         status=deal_data.status,
@@ -21,13 +22,13 @@ def create_brand_deal(db: Session, user: User, deal_data: BrandDealCreate) -> Br
         end_date=deal_data.end_date,
     )
     db.add(new_deal)
-    db.commit()
-    db.refresh(new_deal)
+    await db.commit()
+    await db.refresh(new_deal)
     return new_deal
 
-def get_brand_deal(db: Session, user: User, deal_id: int) -> BrandDeal:
-    return (
-        db.query(BrandDeal)
-        .filter(BrandDeal.id == deal_id, BrandDeal.user_id == user.id)
-        .first()
+async def get_brand_deal(db: AsyncSession, user_id: UUID, deal_id: int) -> Optional[BrandDeal]:
+    result = await db.execute(
+        select(BrandDeal)
+        .where(BrandDeal.id == deal_id, BrandDeal.user_id == user_id)
     )
+    return result.scalars().first()
@@ -0,0 +1,272 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ✅ Context windows (prompt + completion) for the models we run
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+MESSAGE_OVERHEAD_TOKENS = 4      # ✅ Per-message framing in the chat format
+IDEA_COMPLETION_TOKENS = 150     # ✅ One idea: title + 2-3 sentences + score + hashtags as JSON
+IDEAS_COMPLETION_OVERHEAD = 50
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its of on or so that the this to was "
+    "we were what when which who will with you your".split()
+)
+
+
+# =========================================================
+# ✅ TOKEN COUNTING (Cached tiktoken encoder, offline fallback)
+# =========================================================
+class _ApproximateEncoding:
+    """Used when the BPE files can't be loaded (offline builds): ~4 chars per token."""
+    name = "approximate"
+
+    def encode(self, text: str) -> List[str]:
+        return _APPROX_TOKEN.findall(text)
+
+
+@lru_cache(maxsize=16)
+def get_encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            try:
+                return tiktoken.get_encoding("o200k_base" if model.startswith("gpt-4o") else "cl100k_base")
+            except ValueError:
+                return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.error(f"❌ tiktoken encoding unavailable for {model}, using approximate counts: {e}")
+        return _ApproximateEncoding()
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    return len(get_encoding(model or settings.OPENAI_MODEL).encode(text or ""))
+
+
+def count_message_tokens(messages: List[Dict], model: Optional[str] = None) -> int:
+    return sum(count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS for message in messages) + 3
+
+
+def context_window(model: Optional[str] = None) -> int:
+    model = model or settings.OPENAI_MODEL
+    for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_WINDOWS[prefix]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+# =========================================================
+# ✅ FITTING TEXT TO A TOKEN BUDGET
+# =========================================================
+def _truncate_head_tail(text: str, budget: int, model: Optional[str]) -> str:
+    """Keep the opening and the ending (hooks and calls to action live there)."""
+    marker = " [...] "
+    words = text.split()
+    remaining = budget - count_tokens(marker, model)
+
+    head, used = [], 0
+    for word in words:
+        cost = count_tokens(" " + word, model)
+        if used + cost > remaining * 2 // 3:
+            break
+        head.append(word)
+        used += cost
+
+    tail = []
+    for word in reversed(words[len(head):]):
+        cost = count_tokens(" " + word, model)
+        if used + cost > remaining:
+            break
+        tail.append(word)
+        used += cost
+
+    if len(head) + len(tail) >= len(words):
+        return text
+    return " ".join(head) + marker + " ".join(reversed(tail))
+
+
+def extractive_summary(text: str, budget: int, model: Optional[str] = None) -> str:
+    """
+    Pick the highest-scoring sentences (content-word frequency, light lead bias) that fit the
+    budget and return them in their original order.
+    """
+    sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()]
+    if len(sentences) < 3:
+        return _truncate_head_tail(text, budget, model)
+
+    frequencies = Counter(word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS)
+    scored = []
+    for index, sentence in enumerate(sentences):
+        words = [word for word in _WORD.findall(sentence.lower()) if word not in _STOPWORDS]
+        score = sum(frequencies[word] for word in words) / math.sqrt(len(words) + 1)
+        if index < max(1, len(sentences) // 10):
+            score *= 1.5
+        scored.append((score, index, sentence))
+
+    chosen, used = [], 0
+    for score, index, sentence in sorted(scored, key=lambda item: item[0], reverse=True):
+        cost = count_tokens(sentence, model) + 1
+        if used + cost <= budget:
+            chosen.append((index, sentence))
+            used += cost
+    if not chosen:
+        return _truncate_head_tail(text, budget, model)
+    return " ".join(sentence for _, sentence in sorted(chosen))
+
+
+def fit_to_budget(text: str, budget: int, model: Optional[str] = None) -> str:
+    if count_tokens(text, model) <= budget:
+        return text
+    return extractive_summary(text, budget, model)
+
+
+def transcript_budget(model: Optional[str] = None, completion_tokens: int = 500, prompt_overhead: int = 300) -> int:
+    """Configured transcript budget, never more than what the model's window leaves free."""
+    available = context_window(model) - completion_tokens - prompt_overhead
+    return max(0, min(settings.AI_TRANSCRIPT_TOKEN_BUDGET, available))
+
+
+def fit_transcript(transcript: str, model: Optional[str] = None, completion_tokens: int = 500) -> str:
+    budget = transcript_budget(model, completion_tokens)
+    fitted = fit_to_budget(transcript, budget, model)
+    if fitted is not transcript:
+        logger.info(
+            f"STAGE ✅: Fitted transcript to {budget} tokens "
+            f"({count_tokens(transcript, model)} -> {count_tokens(fitted, model)})"
+        )
+    return fitted
+
+
+def ideas_max_tokens(count: int) -> int:
+    """Completion budget sized to the number of ideas requested (capped by OPENAI_MAX_TOKENS)."""
+    return min(settings.OPENAI_MAX_TOKENS, IDEAS_COMPLETION_OVERHEAD + IDEA_COMPLETION_TOKENS * count)
+
+
+# =========================================================
+# ✅ TOKEN ACCOUNTING (Per call + per method totals)
+# =========================================================
+class TokenUsage:
+    __slots__ = ("method", "model", "prompt_tokens", "completion_tokens", "max_tokens", "latency_ms", "estimated")
+
+    def __init__(
+        self,
+        method: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        max_tokens: int,
+        latency_ms: float,
+        estimated: bool
+    ):
+        self.method = method
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.max_tokens = max_tokens
+        self.latency_ms = latency_ms
+        self.estimated = estimated
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def as_dict(self) -> Dict:
+        return {
+            "method": self.method,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "max_tokens": self.max_tokens,
+            "latency_ms": self.latency_ms,
+            "ms_per_completion_token": round(self.latency_ms / self.completion_tokens, 2) if self.completion_tokens else None,
+            "estimated": self.estimated,
+        }
+
+
+class TokenLedger:
+    """Aggregates TokenUsage per method for /metrics."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, usage: TokenUsage) -> None:
+        logger.info(f"STAGE ✅: Token usage {usage.as_dict()}")
+        with self._lock:
+            totals = self._totals.setdefault(usage.method, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0
+            })
+            totals["calls"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["completion_tokens"] += usage.completion_tokens
+            totals["latency_ms"] += usage.latency_ms
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                method: {
+                    **totals,
+                    "latency_ms": round(totals["latency_ms"], 1),
+                    "ms_per_completion_token": (
+                        round(totals["latency_ms"] / totals["completion_tokens"], 2)
+                        if totals["completion_tokens"] else None
+                    ),
+                }
+                for method, totals in self._totals.items()
+            }
+
+
+def measure_usage(
+    method: str,
+    messages: List[Dict],
+    max_tokens: int,
+    started: float,
+    response=None,
+    completion_text: Optional[str] = None,
+    model: Optional[str] = None
+) -> TokenUsage:
+    """Prefer the API's usage block; otherwise count locally (streaming responses have none)."""
+    model = model or settings.OPENAI_MODEL
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    estimated = not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int)
+    if estimated:
+        prompt_tokens = count_message_tokens(messages, model)
+        completion_tokens = count_tokens(completion_text or "", model)
+    return TokenUsage(
+        method=method,
+        model=model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        max_tokens=max_tokens,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        estimated=estimated
+    )
+
+
+# ✅ GLOBAL INSTANCE
+token_ledger = TokenLedger()
@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import SUBSCRIPTION_QUOTAS
+from app.models.user import User, SubscriptionPlan
+
+logger = logging.getLogger(__name__)
+
+# ✅ Quota kind -> (usage column, SUBSCRIPTION_QUOTAS key)
+QUOTA_KINDS = {
+    "content_ideas": (User.content_ideas_used_this_month, "content_ideas_per_month"),
+    "video_repurposes": (User.video_repurposing_used_this_month, "video_repurposes_per_month"),
+}
+
+USAGE_COLUMNS = (
+    User.content_ideas_used_this_month,
+    User.video_repurposing_used_this_month,
+    User.copyright_alerts_used_this_month,
+)
+
+USAGE_RESET_DAYS = 30
+
+
+class QuotaReservation:
+    __slots__ = ("user_id", "kind", "amount", "used_after", "committed", "refunded")
+
+    def __init__(self, user_id: UUID, kind: str, amount: int, used_after: int):
+        self.user_id = user_id
+        self.kind = kind
+        self.amount = amount
+        self.used_after = used_after
+        self.committed = False
+        self.refunded = False
+
+
+class QuotaService:
+    """
+    Check-and-consume as a single conditional UPDATE ... RETURNING on the users row, so two
+    concurrent requests can never both pass the check, and no User entity is loaded.
+    """
+
+    # =========================================================
+    # ✅ RESERVE (Atomic check + consume)
+    # =========================================================
+    async def reserve(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        kind: str,
+        amount: int = 1
+    ) -> Optional[QuotaReservation]:
+        """
+        Consume `amount` units if the user's plan allows it; returns None when over quota.
+        Commits immediately so the row lock is not held across the AI call.
+        """
+        usage_column, quota_key = QUOTA_KINDS[kind]
+        now = datetime.utcnow()
+
+        plan_limit = case(
+            *[
+                (
+                    User.subscription_plan == plan,
+                    SUBSCRIPTION_QUOTAS.get(plan.value.upper(), SUBSCRIPTION_QUOTAS["FREE"])[quota_key]
+                )
+                for plan in SubscriptionPlan
+            ],
+            else_=SUBSCRIPTION_QUOTAS["FREE"][quota_key]
+        )
+        usage_is_stale = or_(
+            User.last_usage_reset.is_(None),
+            User.last_usage_reset <= now - timedelta(days=USAGE_RESET_DAYS)
+        )
+        subscription_active = or_(
+            and_(User.subscription_end_date.is_(None), User.subscription_plan == SubscriptionPlan.FREE),
+            User.subscription_end_date >= now
+        )
+
+        def current_usage(column):
+            return case((usage_is_stale, 0), else_=func.coalesce(column, 0))
+
+        values = {column.key: current_usage(column) for column in USAGE_COLUMNS}
+        values[usage_column.key] = current_usage(usage_column) + amount
+        values[User.last_usage_reset.key] = case((usage_is_stale, now), else_=User.last_usage_reset)
+
+        stmt = (
+            update(User)
+            .where(
+                User.id == user_id,
+                User.is_active.is_(True),
+                subscription_active,
+                or_(plan_limit == -1, current_usage(usage_column) + amount <= plan_limit)
+            )
+            .values(values)
+            .returning(usage_column)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = await db.execute(stmt)
+            used_after = result.scalar_one_or_none()
+            await db.commit()
+        except Exception as e:
+            logger.error(f"❌ Quota reservation failed for {user_id} ({kind}): {e}")
+            await db.rollback()
+            raise
+
+        if used_after is None:
+            logger.info(f"STAGE ❌: Quota exhausted for {user_id} ({kind})")
+            return None
+
+        logger.info(f"STAGE ✅: Reserved {amount} {kind} for {user_id} (used={used_after})")
+        return QuotaReservation(user_id, kind, amount, int(used_after))
+
+    # =========================================================
+    # ✅ COMMIT / REFUND
+    # =========================================================
+    def commit(self, reservation: QuotaReservation) -> None:
+        """Mark the reservation as spent; it can no longer be refunded."""
+        reservation.committed = True
+
+    async def refund(
+        self,
+        db: AsyncSession,
+        reservation: Optional[QuotaReservation],
+        amount: Optional[int] = None
+    ) -> None:
+        """
+        Give back units for a request that failed before delivering anything - or, with
+        amount, only that many (the parts of a batch that delivered nothing); the rest can
+        still be committed.
+        """
+        if reservation is None or reservation.committed or reservation.refunded:
+            return
+        amount = reservation.amount if amount is None else min(amount, reservation.amount)
+        if amount <= 0:
+            return
+
+        usage_column, _ = QUOTA_KINDS[reservation.kind]
+        stmt = (
+            update(User)
+            .where(User.id == reservation.user_id)
+            .values({
+                usage_column.key: case(
+                    (usage_column >= amount, usage_column - amount),
+                    else_=0
+                )
+            })
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            await db.execute(stmt)
+            await db.commit()
+            reservation.amount -= amount
+            reservation.refunded = reservation.amount == 0
+            logger.info(f"STAGE ✅: Refunded {amount} {reservation.kind} for {reservation.user_id}")
+        except Exception as e:
+            logger.error(f"❌ Quota refund failed for {reservation.user_id}: {e}")
+            await db.rollback()
+
+
+# ✅ GLOBAL INSTANCE
+quota_service = QuotaService()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.content import GeneratedContent, ContentType
+from app.schemas.content import VideoRepurposeResponse
+from app.services.ai_service import ai_service
+from app.services.media_ingest import SpooledMedia
+from app.services.transcript_cache import transcript_cache
+
+logger = logging.getLogger(__name__)
+
+# ✅ Progress callback: (stage, percent)
+ProgressCallback = Callable[[str, int], None]
+
+
+class RepurposeService:
+    """Video repurposing pipeline shared by the synchronous endpoint and the Celery job."""
+
+    # =========================================================
+    # ✅ TRANSCRIBE (Retries re-read the same spooled file)
+    # =========================================================
+    async def transcribe_with_retries(self, media: SpooledMedia, trace_id: str, max_retries: int = 2) -> str:
+        cached = transcript_cache.get(media.sha256, media.size)
+        if cached is not None:
+            logger.info(f"[TRACE {trace_id}] STAGE ✅: Reusing cached transcript")
+            return cached
+
+        transcript = await self._transcribe_uncached(media.path, trace_id, max_retries)
+        transcript_cache.put(media.sha256, transcript)
+        return transcript
+
+    async def _transcribe_uncached(self, media_path: str, trace_id: str, max_retries: int) -> str:
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.info(f"[TRACE {trace_id}] STAGE ✅: Transcription attempt {attempt}...")
+                transcript = await ai_service.transcribe_file(media_path)
+                if transcript and len(transcript.strip()) > 20:
+                    logger.info(f"[TRACE {trace_id}] STAGE ✅: Transcription succeeded")
+                    return transcript
+                raise Exception("Transcript too short or empty.")
+            except Exception as e:
+                logger.error(f"[TRACE {trace_id}] ❌ Whisper attempt {attempt} failed: {e}")
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(2)
+        raise Exception("Failed to transcribe video after retries.")
+
+    # =========================================================
+    # ✅ SUMMARY (Map-reduce once per video, reused on re-uploads)
+    # =========================================================
+    async def summary_for(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        media: SpooledMedia,
+        transcript: str,
+        trace_id: str
+    ) -> Optional[str]:
+        stmt = (
+            select(GeneratedContent.summary)
+            .where(
+                GeneratedContent.user_id == user_id,
+                GeneratedContent.content_type == ContentType.REPURPOSED_VIDEO,
+                GeneratedContent.content_metadata["media_sha256"].as_string() == media.sha256,
+                GeneratedContent.summary.is_not(None)
+            )
+            .order_by(GeneratedContent.created_at.desc())
+            .limit(1)
+        )
+        cached = (await db.execute(stmt)).scalar_one_or_none()
+        if cached:
+            logger.info(f"[TRACE {trace_id}] STAGE ✅: Reusing stored transcript summary")
+            return cached
+
+        summary = await ai_service.summarize_transcript(transcript)
+        if summary:
+            logger.info(f"[TRACE {trace_id}] STAGE ✅: Transcript summarized for repurposing")
+        return summary
+
+    # =========================================================
+    # ✅ FULL PIPELINE
+    # =========================================================
+    async def run(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        media: SpooledMedia,
+        original_filename: str,
+        title: str,
+        description: Optional[str],
+        platforms: List[str],
+        tone: str,
+        trace_id: str,
+        progress: Optional[ProgressCallback] = None
+    ) -> VideoRepurposeResponse:
+        def report(stage: str, percent: int) -> None:
+            logger.info(f"[TRACE {trace_id}] STAGE ✅: {stage} ({percent}%)")
+            if progress:
+                progress(stage, percent)
+
+        report("transcribing", 10)
+        transcript = await self.transcribe_with_retries(media, trace_id)
+
+        report("summarizing", 35)
+        summary = await self.summary_for(db, user_id, media, transcript, trace_id)
+
+        report("repurposing", 50)
+        fanout = await ai_service.repurpose_content_with_report(
+            transcript=transcript,
+            original_title=title,
+            original_description=description or "",
+            target_platforms=platforms,
+            tone=tone,
+            user_id=str(user_id),
+            summary=summary
+        )
+        repurposed_content = fanout.results
+        platforms = list(repurposed_content)
+        logger.info(f"[TRACE {trace_id}] STAGE ✅: Repurposing finished {fanout.report()}")
+
+        report("saving", 90)
+        content_id = uuid4()
+        content_record = GeneratedContent(
+            id=content_id,
+            user_id=user_id,
+            content_type=ContentType.REPURPOSED_VIDEO,
+            title=title,
+            content=transcript,
+            summary=summary,
+            content_metadata={
+                "trace_id": trace_id,
+                "original_file": original_filename,
+                "media_sha256": media.sha256,
+                "platforms": platforms,
+                "tone": tone,
+                "repurposed_content": repurposed_content,
+                "repurpose_report": fanout.report()
+            }
+        )
+        db.add(content_record)
+        await db.commit()
+
+        report("completed", 100)
+        return VideoRepurposeResponse(
+            id=content_id,
+            original_title=title,
+            transcript=transcript,
+            repurposed_content=repurposed_content,
+            platforms_generated=platforms
+        )
+
+
+# ✅ GLOBAL INSTANCE
+repurpose_service = RepurposeService()
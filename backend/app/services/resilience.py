@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+TRANSIENT_ERRORS = (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the breaker is open."""
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """The call's overall deadline (all attempts + backoff) ran out."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient upstream trouble: timeouts, connection errors, 408/409/429 and 5xx."""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and (status_code in RETRYABLE_STATUS_CODES or status_code >= 500)
+
+
+# =========================================================
+# ✅ CIRCUIT BREAKER (Error rate over a sliding window)
+# =========================================================
+class CircuitBreaker:
+    """
+    closed -> open when at least min_calls were seen in the window and the failure rate is
+    >= failure_rate_threshold; open -> half_open after open_seconds; half_open lets
+    half_open_max_calls probes through and closes on their success or re-opens on a failure.
+    Only retryable (upstream health) errors count as failures.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        min_calls: int = 10,
+        window_seconds: float = 30.0,
+        open_seconds: float = 20.0,
+        half_open_max_calls: int = 3
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.info(f"STAGE ✅: AI circuit breaker {self.state} -> {state}")
+            self.state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        if state == self.HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if state == self.CLOSED:
+            self._outcomes.clear()
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if not success:
+                self._transition(self.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition(self.CLOSED)
+            return
+
+        self._outcomes.append((now, success))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+        if self.state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_rate_threshold:
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """
+        End a call allow() let through without an outcome (cancelled, or stopped by our own
+        deadline): a half-open probe slot is freed, nothing counts as upstream evidence.
+        """
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failure_rate": round(failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+# =========================================================
+# ✅ ADAPTIVE CONCURRENCY (AIMD on observed latency)
+# =========================================================
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive increase (+1 per limit's worth of fast successes) while latency stays under the
+    target; multiplicative decrease on slow calls or overload errors. Callers over the limit
+    wait FIFO; the limit never leaves [min_limit, max_limit].
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        latency_target_ms: float = 8000.0,
+        decrease_factor: float = 0.7
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_ms = latency_target_ms
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()  # ✅ Granted just as we gave up - hand it on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency_ms: float, overloaded: bool) -> None:
+        now = time.monotonic()
+        if overloaded or latency_ms > self.latency_target_ms:
+            # ✅ At most one decrease per latency target so a burst of slow calls counts once
+            if now - self._last_decrease > self.latency_target_ms / 1000:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.in_flight += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target_ms": self.latency_target_ms,
+        }
+
+
+# =========================================================
+# ✅ RESILIENT CALL (Breaker + limiter + deadline + jittered retries)
+# =========================================================
+class ResilientCaller:
+    def __init__(
+        self,
+        name: str,
+        breaker: CircuitBreaker,
+        limiter: AdaptiveConcurrencyLimiter,
+        attempt_timeout_seconds: float,
+        deadline_seconds: float,
+        max_retries: int = 2,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 8.0
+    ):
+        self.name = name
+        self.breaker = breaker
+        self.limiter = limiter
+        self.attempt_timeout_seconds = attempt_timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.fast_failures = 0
+
+    def _backoff(self, attempt: int) -> float:
+        # ✅ Full jitter: uniform(0, min(cap, base * 2^attempt))
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], deadline_seconds: Optional[float] = None) -> Any:
+        self.calls += 1
+        deadline = time.monotonic() + (deadline_seconds or self.deadline_seconds)
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.fast_failures += 1
+                raise CircuitOpenError(f"{self.name}: upstream circuit open, serving fallback")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.breaker.release()  # ✅ Our deadline: neither an upstream failure nor a success
+                self.failures += 1
+                raise DeadlineExceededError(f"{self.name}: deadline exceeded")
+
+            try:
+                await self.limiter.acquire(timeout=remaining)
+            except asyncio.TimeoutError:
+                self.breaker.release()
+                self.failures += 1
+                raise DeadlineExceededError(f"{self.name}: deadline exceeded waiting for capacity")
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            started = time.perf_counter()
+            try:
+                timeout = max(0.001, min(self.attempt_timeout_seconds, deadline - time.monotonic()))
+                result = await asyncio.wait_for(fn(), timeout=timeout)
+            except Exception as e:
+                retryable = is_retryable(e)
+                self.limiter.release((time.perf_counter() - started) * 1000, overloaded=retryable)
+                self.breaker.record(not retryable)
+                if not retryable:
+                    self.failures += 1
+                    raise
+                error = e
+            except BaseException:
+                # ✅ Cancelled: no evidence either way, so a half-open probe must not close the breaker
+                self.limiter.release(0.0, overloaded=False)
+                self.breaker.release()
+                raise
+            else:
+                self.limiter.release((time.perf_counter() - started) * 1000, overloaded=False)
+                self.breaker.record(True)
+                return result
+
+            backoff = self._backoff(attempt)
+            if attempt >= self.max_retries or time.monotonic() + backoff >= deadline:
+                self.failures += 1
+                raise error
+            attempt += 1
+            self.retries += 1
+            logger.error(f"❌ {self.name} attempt {attempt} failed ({error!r}), retrying in {backoff:.2f}s")
+            await asyncio.sleep(backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "fast_failures": self.fast_failures,
+            "concurrency": self.limiter.stats(),
+        }
@@ -0,0 +1,200 @@
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from time import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ✅ LOCAL TEXT EMBEDDING (Hashed word + char n-grams)
+# =========================================================
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s#]", " ", text.lower())).strip()
+
+
+def embed_text(text: str, dimensions: int = 512, ngram_size: int = 3) -> np.ndarray:
+    """
+    Signed feature hashing of words and character n-grams into a unit vector. Cheap, local
+    and deterministic - good enough to tell "fitness tips for moms" from "fitness tips for busy moms".
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    words = text.split()
+    padded = f" {text} "
+    features = words + [padded[i:i + ngram_size] for i in range(len(padded) - ngram_size + 1)]
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class _CachedResponse:
+    __slots__ = ("value", "tokens", "expires_at", "bucket", "vector")
+
+    def __init__(self, value: Any, tokens: int, expires_at: float, bucket: str, vector: Optional[np.ndarray]):
+        self.value = value
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.bucket = bucket
+        self.vector = vector
+
+
+# =========================================================
+# ✅ TWO-TIER LLM RESPONSE CACHE (Exact + similarity)
+# =========================================================
+class ResponseCache:
+    """
+    Exact tier: sha256 of the normalized prompt text + model parameters.
+    Similarity tier: within the same parameter bucket (model, temperature, count, platform...),
+    reuse a response whose prompt embedding has cosine similarity >= threshold.
+    Both tiers are bounded LRUs with a shared TTL; values are deep-copied in and out.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        similarity_max_entries: int,
+        ttl_seconds: int,
+        similarity_threshold: float,
+        similarity_enabled: bool = True
+    ):
+        self.max_entries = max_entries
+        self.similarity_max_entries = similarity_max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.similarity_enabled = similarity_enabled
+        self._exact: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._similar: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def _keys(text: str, params: Dict[str, Any]) -> Tuple[str, str, str]:
+        normalized = normalize_text(text)
+        bucket = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        key = hashlib.sha256(f"{bucket}:{normalized}".encode("utf-8")).hexdigest()
+        return key, bucket, normalized
+
+    def get(self, text: str, params: Dict[str, Any], enabled: bool = True) -> Optional[Any]:
+        if not enabled or self.max_entries <= 0:
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        key, bucket, normalized = self._keys(text, params)
+        now = time()
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._exact.move_to_end(key)
+                self.exact_hits += 1
+                self.saved_tokens += entry.tokens
+                return copy.deepcopy(entry.value)
+            if entry is not None:
+                self._exact.pop(key, None)
+
+            match = self._find_similar(bucket, normalized, now) if self.similarity_enabled else None
+            if match is None:
+                self.misses += 1
+                return None
+            match_key, entry, score = match
+            self._similar.move_to_end(match_key)
+            self.similar_hits += 1
+            self.saved_tokens += entry.tokens
+        logger.info(f"STAGE ✅: Similarity cache hit (cosine={score:.3f})")
+        return copy.deepcopy(entry.value)
+
+    def _find_similar(self, bucket: str, normalized: str, now: float):
+        candidates = []
+        for candidate_key, entry in list(self._similar.items()):
+            if entry.expires_at <= now:
+                del self._similar[candidate_key]
+            elif entry.bucket == bucket:
+                candidates.append((candidate_key, entry))
+        if not candidates:
+            return None
+
+        query = embed_text(normalized)
+        scores = np.stack([entry.vector for _, entry in candidates]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return candidates[best][0], candidates[best][1], float(scores[best])
+
+    def set(self, text: str, params: Dict[str, Any], value: Any, tokens: int = 0, enabled: bool = True) -> None:
+        if not enabled or self.max_entries <= 0:
+            return
+        key, bucket, normalized = self._keys(text, params)
+        expires_at = time() + self.ttl_seconds
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._exact.pop(key, None)
+            self._exact[key] = _CachedResponse(stored, tokens, expires_at, bucket, None)
+            self._trim(self._exact, self.max_entries)
+
+            if self.similarity_enabled and self.similarity_max_entries > 0:
+                self._similar.pop(key, None)
+                self._similar[key] = _CachedResponse(stored, tokens, expires_at, bucket, embed_text(normalized))
+                self._trim(self._similar, self.similarity_max_entries)
+
+    def discard(self, text: str, params: Dict[str, Any]) -> None:
+        """Drop what get() would serve for this prompt: the exact entry and its similarity match."""
+        key, bucket, normalized = self._keys(text, params)
+        with self._lock:
+            self._exact.pop(key, None)
+            self._similar.pop(key, None)
+            match = self._find_similar(bucket, normalized, time()) if self.similarity_enabled else None
+            if match is not None:
+                del self._similar[match[0]]
+
+    def _trim(self, tier: "OrderedDict[str, _CachedResponse]", max_entries: int) -> None:
+        while len(tier) > max_entries:
+            tier.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._similar.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "exact_size": len(self._exact),
+                "similarity_size": len(self._similar),
+                "exact_hits": self.exact_hits,
+                "similarity_hits": self.similar_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+            }
+
+
+# ✅ GLOBAL INSTANCE
+response_cache = ResponseCache(
+    max_entries=settings.AI_RESPONSE_CACHE_MAX_ENTRIES,
+    similarity_max_entries=settings.AI_SIMILARITY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AI_RESPONSE_CACHE_TTL_SECONDS,
+    similarity_threshold=settings.AI_SIMILARITY_CACHE_THRESHOLD,
+    similarity_enabled=settings.AI_SIMILARITY_CACHE_ENABLED
+)
@@ -0,0 +1,271 @@
+import html
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.cursor import SearchPosition
+
+# ✅ ts_rank's default A/B/C/D weights, so both backends rank fields alike
+FIELD_WEIGHTS = {"title": 1.0, "summary": 0.4, "tags": 0.2, "content": 0.1}
+FUZZY_TITLE_WEIGHT = 0.5        # ✅ Share of the score from title trigram similarity
+FUZZY_TITLE_THRESHOLD = 0.6     # ✅ pg_trgm.word_similarity_threshold default
+SNIPPET_WORDS = 25
+
+# ✅ Highlight sentinels: marked up as <mark> only after the text is HTML-escaped
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\x02", "\x03"
+
+_WORD = re.compile(r"\w+")
+_QUERY_TOKEN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its of on or "
+    "our so that the their then there these this to was we what when which who why will with you your".split()
+)
+_SUFFIXES = ("ing", "ies", "es", "ed", "s", "e")
+
+
+# =========================================================
+# ✅ TEXT HELPERS (Tokens, trigrams, highlights)
+# =========================================================
+def stem(word: str) -> str:
+    """Crude suffix stripping - applied to documents and queries alike, so it only has to be consistent."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: each word lowercased and padded with two spaces before, one after."""
+    grams: Set[str] = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query_grams: Set[str], text_grams: Set[str]) -> float:
+    """Share of the query's trigrams found in the text (pg_trgm word_similarity, without the extent search)."""
+    if not query_grams:
+        return 0.0
+    return len(query_grams & text_grams) / len(query_grams)
+
+
+def render_highlight(text: str) -> str:
+    """HTML-escape marked text, then turn the sentinels into <mark> tags."""
+    return html.escape(text).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+def _mark(words: Iterable[str], stems: Set[str]) -> str:
+    out = []
+    for word in words:
+        token = _WORD.search(word)
+        if token and stem(token.group().lower()) in stems:
+            word = word[:token.start()] + HIGHLIGHT_START + token.group() + HIGHLIGHT_STOP + word[token.end():]
+        out.append(word)
+    return " ".join(out)
+
+
+def mark_terms(text: str, stems: Set[str]) -> str:
+    return _mark(text.split(), stems)
+
+
+def snippet(text: str, stems: Set[str], max_words: int = SNIPPET_WORDS) -> str:
+    """A max_words window starting a few words before the first hit (or the start of the text)."""
+    words = text.split()
+    start = 0
+    for position, word in enumerate(words):
+        token = _WORD.search(word)
+        if token and stem(token.group().lower()) in stems:
+            start = max(0, position - 5)
+            break
+    window = _mark(words[start:start + max_words], stems)
+    return ("… " if start else "") + window + (" …" if start + max_words < len(words) else "")
+
+
+# =========================================================
+# ✅ QUERY PARSING (websearch_to_tsquery subset: terms AND-ed, "a or b", "-term")
+# =========================================================
+@dataclass
+class ParsedQuery:
+    clauses: List[List[str]] = field(default_factory=list)  # ✅ AND of clauses, OR within one
+    excluded: List[str] = field(default_factory=list)
+
+    @property
+    def stems(self) -> Set[str]:
+        return {term for clause in self.clauses for term in clause}
+
+
+def parse_query(text: str) -> ParsedQuery:
+    parsed = ParsedQuery()
+    pending_or = False
+    for quoted_neg, quoted, neg, bare in _QUERY_TOKEN.findall(text):
+        if bare.lower() == "or":
+            pending_or = bool(parsed.clauses)
+            continue
+        # ✅ Quoted phrases are matched as their words (no adjacency check in-process)
+        stems = tokenize(quoted if quoted else bare)
+        if quoted_neg or neg:
+            parsed.excluded.extend(stems)
+        elif stems:
+            if pending_or:
+                parsed.clauses[-1].append(stems[0])
+                stems = stems[1:]
+            parsed.clauses.extend([term] for term in stems)
+        pending_or = False
+    return parsed
+
+
+# =========================================================
+# ✅ IN-PROCESS INDEX (Inverted index + title trigrams)
+# =========================================================
+@dataclass
+class SearchHit:
+    id: UUID
+    content_type: Any
+    title: str
+    created_at: datetime
+    metadata: Optional[Dict]
+    score: float
+    title_highlight: str
+    snippet: str
+
+
+@dataclass
+class _Document:
+    position: int
+    id: UUID
+    content_type: Any
+    title: str
+    created_at: datetime
+    metadata: Optional[Dict]
+    body: str
+    title_grams: Set[str]
+
+
+class InMemorySearchIndex:
+    """
+    Search index for one user's library held in process memory: weighted postings for
+    title/summary/tags/content and title trigrams for fuzzy matches. Same matching,
+    scoring and keyset order as the Postgres backend (approximately: no phrase adjacency,
+    simpler stemming), for databases without full-text search such as SQLite in tests.
+    """
+
+    def __init__(self, max_body_chars: int = 20000):
+        self.max_body_chars = max_body_chars
+        self._documents: List[_Document] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._title_grams: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(
+        self,
+        doc_id: UUID,
+        content_type: Any,
+        title: Optional[str],
+        created_at: datetime,
+        summary: Optional[str] = None,
+        content: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict] = None
+    ) -> None:
+        position = len(self._documents)
+        title = title or ""
+        fields = {
+            "title": title,
+            "summary": summary or "",
+            "tags": " ".join(tag for tag in tags or [] if isinstance(tag, str)),
+            "content": (content or "")[:100000]
+        }
+        for name, text in fields.items():
+            for term in tokenize(text):
+                postings = self._postings.setdefault(term, {})
+                postings[position] = postings.get(position, 0.0) + FIELD_WEIGHTS[name]
+
+        grams = trigrams(title)
+        for gram in grams:
+            self._title_grams.setdefault(gram, set()).add(position)
+
+        body = " ".join(part for part in (summary, content) if part)[:self.max_body_chars]
+        self._documents.append(_Document(position, doc_id, content_type, title, created_at, metadata, body, grams))
+
+    def _fuzzy(self, query_grams: Set[str]) -> Dict[int, float]:
+        counts: Dict[int, int] = {}
+        for gram in query_grams:
+            for position in self._title_grams.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+        needed = FUZZY_TITLE_THRESHOLD * len(query_grams)
+        return {position: count / len(query_grams) for position, count in counts.items() if count >= needed}
+
+    def search(
+        self,
+        query: str,
+        content_type: Any = None,
+        limit: int = 20,
+        after: Optional[SearchPosition] = None,
+        max_candidates: int = 2000
+    ) -> List[SearchHit]:
+        """
+        Newest max_candidates matches (all terms, none of the excluded ones, or a fuzzy
+        title), ranked by score DESC, id ASC; `after` is the last hit of the previous page.
+        """
+        parsed = parse_query(query)
+        stems = parsed.stems
+        query_grams = trigrams(query)
+
+        matched: Optional[Set[int]] = None
+        for clause in sorted(parsed.clauses, key=lambda c: sum(len(self._postings.get(t, ())) for t in c)):
+            positions = set().union(*(self._postings.get(term, {}).keys() for term in clause))
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                break
+        matched = matched or set()
+        for term in parsed.excluded:
+            matched -= self._postings.get(term, {}).keys()
+
+        fuzzy = self._fuzzy(query_grams)
+        candidates = [
+            self._documents[position] for position in matched | fuzzy.keys()
+            if content_type is None or self._documents[position].content_type == content_type
+        ]
+        # ✅ Newest first, id ascending within a timestamp (the history index order)
+        candidates.sort(key=lambda d: str(d.id))
+        candidates.sort(key=lambda d: d.created_at, reverse=True)
+        candidates = candidates[:max_candidates]
+
+        scored: List[Tuple[float, _Document]] = []
+        for document in candidates:
+            rank = 0.0
+            if document.position in matched:
+                rank = sum(self._postings.get(term, {}).get(document.position, 0.0) for term in stems)
+                rank = rank / (rank + 1)  # ✅ ts_rank_cd normalization 32: rank / (rank + 1)
+            similarity = word_similarity(query_grams, document.title_grams)
+            scored.append((rank + FUZZY_TITLE_WEIGHT * similarity, document))
+
+        scored.sort(key=lambda item: (-item[0], str(item[1].id)))
+        if after:
+            scored = [
+                item for item in scored
+                if item[0] < after.score or (item[0] == after.score and str(item[1].id) > str(after.id))
+            ]
+
+        return [
+            SearchHit(
+                id=document.id,
+                content_type=document.content_type,
+                title=document.title,
+                created_at=document.created_at,
+                metadata=document.metadata,
+                score=score,
+                title_highlight=render_highlight(mark_terms(document.title, stems)),
+                snippet=render_highlight(snippet(document.body, stems))
+            )
+            for score, document in scored[:limit]
+        ]
@@ -0,0 +1,242 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, all_, cast, func, literal, literal_column, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, TSVECTOR, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.cursor import SearchPosition
+from app.models.content import SEARCH_TEXT_CONFIG, ContentType, GeneratedContent
+from app.services.search_index import (
+    FUZZY_TITLE_WEIGHT,
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+    SNIPPET_WORDS,
+    InMemorySearchIndex,
+    SearchHit,
+    render_highlight,
+)
+
+logger = logging.getLogger(__name__)
+
+_content = GeneratedContent.__table__
+_search_vector = literal_column("generated_content.search_vector", TSVECTOR)
+_UUID_ARRAY = ARRAY(PG_UUID(as_uuid=True))
+_TITLE_HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true"
+_SNIPPET_HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    f"MaxWords={SNIPPET_WORDS}, MinWords=10, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+_HEADLINE_BODY_CHARS = 20000  # ✅ ts_headline re-parses the text it is given
+
+
+class SearchService:
+    """
+    Ranked search over a user's library (title, summary, tags, content). On Postgres it
+    matches the generated search_vector (GIN) with websearch_to_tsquery syntax, plus fuzzy
+    titles through pg_trgm when installed; elsewhere (SQLite tests) it uses a per-user
+    InMemorySearchIndex. At most max_candidates matches are ranked - recent ones first -
+    and pages follow score DESC, id ASC so keyset cursors stay stable.
+    """
+
+    def __init__(
+        self,
+        max_candidates: int = settings.SEARCH_MAX_CANDIDATES,
+        recent_rows: int = settings.SEARCH_RECENT_ROWS,
+        fallback_max_users: int = settings.SEARCH_FALLBACK_MAX_USERS
+    ):
+        self.max_candidates = max_candidates
+        self.recent_rows = recent_rows
+        self.fallback_max_users = fallback_max_users
+        self._trigram: Optional[bool] = None
+        self._indexes: "OrderedDict[UUID, Tuple[tuple, InMemorySearchIndex]]" = OrderedDict()
+
+    # =========================================================
+    # ✅ SEARCH (Dispatch on the session's database)
+    # =========================================================
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        query: str,
+        content_type: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[SearchPosition] = None
+    ) -> List[SearchHit]:
+        """
+        One page of hits; `after` is the last hit of the previous page. Raises ValueError
+        for an unknown content_type.
+        """
+        parsed_type = None
+        if content_type:
+            try:
+                parsed_type = ContentType(content_type)
+            except ValueError:
+                raise ValueError(f"Unknown content_type '{content_type}'") from None
+
+        started = time.perf_counter()
+        backend = db.get_bind().dialect.name
+        if backend == "postgresql":
+            hits = await self._search_postgres(db, user_id, query, parsed_type, limit, after)
+        else:
+            index = await self._memory_index(db, user_id)
+            hits = index.search(query, parsed_type, limit, after, self.max_candidates)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"STAGE ✅: Search ({backend}) for {user_id} returned {len(hits)} hits in {elapsed_ms:.1f}ms")
+        return hits
+
+    # =========================================================
+    # ✅ POSTGRES (tsvector GIN + optional pg_trgm)
+    # =========================================================
+    async def _has_trigram(self, db: AsyncSession) -> bool:
+        if self._trigram is None:
+            result = await db.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"))
+            self._trigram = bool(result.scalar())
+            if not self._trigram:
+                logger.warning("❌ pg_trgm is not installed: search is full-text only (no fuzzy titles)")
+        return self._trigram
+
+    async def _search_postgres(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        query: str,
+        content_type: Optional[ContentType],
+        limit: int,
+        after: Optional[SearchPosition]
+    ) -> List[SearchHit]:
+        # ✅ A regconfig constant, not a cast parameter: the tsquery then folds to a constant
+        config = literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig", REGCONFIG)
+        tsquery = func.websearch_to_tsquery(config, query)
+        fuzzy = await self._has_trigram(db)
+
+        def match(vector, title):
+            condition = vector.op("@@")(tsquery)
+            if fuzzy:
+                # ✅ Both conditions are GIN-indexed, so the planner can BitmapOr them
+                condition = or_(condition, literal(query).op("<%")(title))
+            return condition
+
+        def score(vector, title):
+            value = cast(func.ts_rank_cd(vector, tsquery, 32), Float)
+            if fuzzy:
+                value = value + FUZZY_TITLE_WEIGHT * cast(func.word_similarity(query, title), Float)
+            return value.label("score")
+
+        owned = [_content.c.user_id == user_id]
+        if content_type:
+            owned.append(_content.c.content_type == content_type)
+
+        # ✅ Bound parameters must be folded into the plan: a generic plan re-parses the query
+        # for every row and cannot estimate how many rows match it
+        await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+
+        # ✅ 1) Every match among the newest recent_rows items: a bounded walk of
+        # ix_generated_content_user_*_created, cheap however common the terms are
+        recent = (
+            select(_content.c.id, _search_vector.label("search_vector"), _content.c.title)
+            .where(*owned)
+            .order_by(_content.c.created_at.desc(), _content.c.id)
+            .limit(self.recent_rows)
+            .subquery("recent")
+        )
+        result = await db.execute(
+            select(recent.c.id, score(recent.c.search_vector, recent.c.title))
+            .where(match(recent.c.search_vector, recent.c.title))
+            .limit(self.max_candidates)
+        )
+        candidates: List[Tuple[float, UUID]] = [(row.score, row.id) for row in result]
+
+        # ✅ 2) Rarer terms: top up with older matches straight from the GIN index (unordered,
+        # so the scan stops once it has enough). Not for quoted phrases: every row holding
+        # all of a phrase's words is a GIN candidate and has to be rechecked in the heap
+        if len(candidates) < self.max_candidates and '"' not in query:
+            result = await db.execute(
+                select(_content.c.id, score(_search_vector, _content.c.title))
+                .where(
+                    *owned,
+                    match(_search_vector, _content.c.title),
+                    # ✅ One array parameter (not one per id) keeps the statement text stable
+                    _content.c.id != all_(literal([content_id for _, content_id in candidates], _UUID_ARRAY))
+                )
+                .limit(self.max_candidates - len(candidates))
+            )
+            candidates.extend((row.score, row.id) for row in result)
+
+        # ✅ Rank the candidates here (score DESC, id ASC) and cut the keyset page
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        if after:
+            candidates = [
+                item for item in candidates
+                if item[0] < after.score or (item[0] == after.score and item[1] > after.id)
+            ]
+        page = candidates[:limit]
+        if not page:
+            return []
+
+        # ✅ Highlights for the page rows only
+        body = func.concat_ws(" ", _content.c.summary, func.left(_content.c.content, _HEADLINE_BODY_CHARS))
+        result = await db.execute(
+            select(
+                _content.c.id,
+                _content.c.content_type,
+                _content.c.title,
+                _content.c.created_at,
+                _content.c.metadata,
+                func.ts_headline(config, _content.c.title, tsquery, _TITLE_HEADLINE_OPTIONS).label("title_highlight"),
+                func.ts_headline(config, body, tsquery, _SNIPPET_HEADLINE_OPTIONS).label("snippet")
+            ).where(_content.c.id.in_([content_id for _, content_id in page]))
+        )
+        rows = {row.id: row for row in result}
+        return [
+            SearchHit(
+                id=content_id,
+                content_type=rows[content_id].content_type,
+                title=rows[content_id].title,
+                created_at=rows[content_id].created_at,
+                metadata=rows[content_id].metadata,
+                score=page_score,
+                title_highlight=render_highlight(rows[content_id].title_highlight or ""),
+                snippet=render_highlight(rows[content_id].snippet or "")
+            )
+            for page_score, content_id in page
+            if content_id in rows
+        ]
+
+    # =========================================================
+    # ✅ IN-PROCESS FALLBACK (Per-user index, rebuilt when the library changes)
+    # =========================================================
+    async def _memory_index(self, db: AsyncSession, user_id: UUID) -> InMemorySearchIndex:
+        fingerprint = tuple((await db.execute(
+            select(func.count(_content.c.id), func.max(_content.c.created_at), func.max(_content.c.updated_at))
+            .where(_content.c.user_id == user_id)
+        )).one())
+        cached = self._indexes.get(user_id)
+        if cached and cached[0] == fingerprint:
+            self._indexes.move_to_end(user_id)
+            return cached[1]
+
+        index = InMemorySearchIndex(max_body_chars=_HEADLINE_BODY_CHARS)
+        result = await db.execute(
+            select(
+                _content.c.id, _content.c.content_type, _content.c.title, _content.c.created_at,
+                _content.c.summary, _content.c.content, _content.c.tags, _content.c.metadata
+            ).where(_content.c.user_id == user_id)
+        )
+        for row in result:
+            index.add(row.id, row.content_type, row.title, row.created_at, row.summary, row.content, row.tags, row.metadata)
+
+        self._indexes[user_id] = (fingerprint, index)
+        while len(self._indexes) > self.fallback_max_users:
+            self._indexes.popitem(last=False)
+        logger.info(f"✅ Built in-process search index for {user_id} ({len(index)} documents)")
+        return index
+
+
+# ✅ GLOBAL INSTANCE
+search_service = SearchService()
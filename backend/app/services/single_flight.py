@@ -0,0 +1,81 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ✅ SINGLE-FLIGHT (Coalesce identical in-flight calls)
+# =========================================================
+class SingleFlight:
+    """
+    Concurrent callers with the same key share one underlying call: the first caller starts
+    it, later callers await the same task and get the same result or the same exception.
+    The shared task is shielded, so one caller disconnecting does not cancel it for the rest.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        else:
+            self.coalesced += 1
+            logger.info(f"STAGE ✅: Coalesced duplicate in-flight call {key!r:.80}")
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # ✅ Mark the exception retrieved even if every awaiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+
+# ✅ Key function: receives the method's arguments (defaults applied) as keyword args
+KeyFunction = Callable[..., Hashable]
+
+
+def default_key(**arguments) -> Hashable:
+    return json.dumps(arguments, sort_keys=True, default=str)
+
+
+def single_flight(key: Optional[KeyFunction] = None):
+    """
+    Decorate an async method of a class exposing `self.single_flight`. Calls whose key
+    (per method) matches an in-flight call join it instead of starting a new one.
+    """
+    key_function = key or default_key
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self", None)
+            flight_key = (method.__name__, key_function(**arguments))
+            return await self.single_flight.do(flight_key, lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
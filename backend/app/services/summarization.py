@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from app.services.prompt_builder import count_tokens, extractive_summary
+
+logger = logging.getLogger(__name__)
+
+# ✅ Summarizer: (text, target_tokens) -> summary text
+SummarizeFunction = Callable[[str, int], Awaitable[str]]
+
+_SENTENCE_ENDINGS = (".", "!", "?")
+MAX_REDUCE_ROUNDS = 4
+
+
+# =========================================================
+# ✅ MAP-REDUCE TRANSCRIPT SUMMARIZATION
+# =========================================================
+class TranscriptSummarizer:
+    """
+    Split a long transcript into token-bounded, sentence-aligned chunks, summarize the chunks
+    concurrently (map), then merge the partial summaries into one (reduce) - recursively if the
+    partials themselves are still over the chunk size. Transcripts under the target or under
+    min_transcript_tokens are returned as None: no summary, the caller fits the transcript into
+    its prompts directly (the extra map/reduce round trips only pay off on long videos).
+    """
+
+    def __init__(
+        self,
+        summarize: SummarizeFunction,
+        chunk_tokens: int = 3000,
+        chunk_summary_tokens: int = 250,
+        summary_tokens: int = 600,
+        max_parallel: int = 4,
+        min_transcript_tokens: int = 0
+    ):
+        self.summarize = summarize
+        self.chunk_tokens = chunk_tokens
+        self.chunk_summary_tokens = chunk_summary_tokens
+        self.summary_tokens = summary_tokens
+        self.max_parallel = max_parallel
+        self.min_transcript_tokens = min_transcript_tokens
+
+    def split_chunks(self, text: str) -> List[str]:
+        chunks: List[str] = []
+        current: List[str] = []
+        used = 0
+        for word in text.split():
+            cost = count_tokens(" " + word)
+            # ✅ Prefer to break after a sentence once the chunk is mostly full
+            if current and (used + cost > self.chunk_tokens or (
+                used > self.chunk_tokens * 0.85 and current[-1].endswith(_SENTENCE_ENDINGS)
+            )):
+                chunks.append(" ".join(current))
+                current, used = [], 0
+            current.append(word)
+            used += cost
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    async def _map(self, chunks: List[str], target_tokens: int) -> List[str]:
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def summarize_chunk(chunk: str) -> str:
+            async with semaphore:
+                try:
+                    return (await self.summarize(chunk, target_tokens)).strip()
+                except Exception as e:
+                    # ✅ One failed chunk must not lose its part of the video
+                    logger.error(f"❌ Chunk summary failed, using extractive summary: {e}")
+                    return extractive_summary(chunk, target_tokens)
+
+        return await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+
+    async def summarize_transcript(self, transcript: str, budget_tokens: int) -> Optional[str]:
+        if count_tokens(transcript) <= max(budget_tokens, self.min_transcript_tokens):
+            return None
+
+        started = time.perf_counter()
+        text, rounds = transcript, 0
+        while True:
+            chunks = await asyncio.to_thread(self.split_chunks, text)
+            rounds += 1
+            if len(chunks) == 1:
+                summary = (await self._map(chunks, self.summary_tokens))[0]
+                break
+            if rounds > MAX_REDUCE_ROUNDS:
+                logger.error("❌ Summaries did not converge, falling back to extractive summary")
+                summary = extractive_summary(text, self.summary_tokens)
+                break
+            partials = await self._map(chunks, self.chunk_summary_tokens)
+            text = "\n".join(partials)
+            logger.info(f"STAGE ✅: Summarized {len(chunks)} chunk(s) in round {rounds}")
+
+        logger.info(
+            f"STAGE ✅: Map-reduce summary {count_tokens(transcript)} -> {count_tokens(summary)} tokens "
+            f"in {rounds} round(s), {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return summary
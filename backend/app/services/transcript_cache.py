@@ -0,0 +1,123 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================================
+# ✅ CONTENT-ADDRESSED TRANSCRIPT CACHE (sha256(media) -> transcript)
+# =========================================================
+class TranscriptCache:
+    """
+    On-disk transcript store keyed by the SHA-256 of the uploaded media, bounded by total
+    bytes with LRU eviction. Lives on the uploads volume so the API and Celery worker share
+    entries; each process keeps its own LRU index (file mtime is the shared recency signal).
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._stored_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.media_bytes_saved = 0
+
+    def _path(self, media_sha256: str) -> str:
+        return os.path.join(self.directory, f"{media_sha256}.txt")
+
+    def _load_index(self) -> None:
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".txt"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._stored_bytes += size
+        self._loaded = True
+        logger.info(f"STAGE ✅: Transcript cache loaded {len(self._index)} entries ({self._stored_bytes} bytes)")
+
+    def get(self, media_sha256: str, media_size: int = 0) -> Optional[str]:
+        with self._lock:
+            self._load_index()
+            path = self._path(media_sha256)
+            try:
+                with open(path, "r", encoding="utf-8") as cached_file:
+                    transcript = cached_file.read()
+                os.utime(path)
+            except FileNotFoundError:
+                self._forget(media_sha256)
+                self.misses += 1
+                return None
+
+            if media_sha256 not in self._index:
+                self._index[media_sha256] = len(transcript.encode("utf-8"))
+                self._stored_bytes += self._index[media_sha256]
+            self._index.move_to_end(media_sha256)
+            self.hits += 1
+            self.media_bytes_saved += media_size
+            logger.info(f"STAGE ✅: Transcript cache hit for {media_sha256[:12]} (skipped {media_size} bytes)")
+            return transcript
+
+    def put(self, media_sha256: str, transcript: str) -> None:
+        data = transcript.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load_index()
+            path = self._path(media_sha256)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as cached_file:
+                cached_file.write(data)
+            os.replace(temp_path, path)
+
+            self._forget(media_sha256)
+            self._index[media_sha256] = len(data)
+            self._stored_bytes += len(data)
+
+            while self._stored_bytes > self.max_bytes and self._index:
+                oldest = next(iter(self._index))
+                self._forget(oldest)
+                try:
+                    os.unlink(self._path(oldest))
+                except FileNotFoundError:
+                    pass
+                self.evictions += 1
+
+    def _forget(self, media_sha256: str) -> None:
+        size = self._index.pop(media_sha256, None)
+        if size is not None:
+            self._stored_bytes -= size
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "stored_bytes": self._stored_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "media_bytes_saved": self.media_bytes_saved,
+            }
+
+
+# ✅ GLOBAL INSTANCE
+transcript_cache = TranscriptCache(
+    directory=settings.TRANSCRIPT_CACHE_DIR,
+    max_bytes=settings.TRANSCRIPT_CACHE_MAX_BYTES
+)
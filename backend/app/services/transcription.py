@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import wave
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000       # ✅ Whisper resamples to 16 kHz mono anyway
+FRAME_SECONDS = 0.05      # ✅ Energy frame for silence detection
+
+
+class AudioChunk:
+    __slots__ = ("index", "start_seconds", "end_seconds", "path")
+
+    def __init__(self, index: int, start_seconds: float, end_seconds: float, path: Optional[str] = None):
+        self.index = index
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+        self.path = path
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+
+# ✅ Chunk transcriber: AudioChunk (with a WAV path) -> text
+ChunkTranscriber = Callable[[AudioChunk], Awaitable[str]]
+
+
+# =========================================================
+# ✅ OVERLAP-AWARE STITCHING
+# =========================================================
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch_transcripts(parts: List[str], max_overlap_words: int = 40, min_overlap_words: int = 2) -> str:
+    """
+    Join chunk transcripts, dropping the words at the start of each chunk that repeat the
+    tail of the previous one (the overlapped audio is transcribed twice).
+    """
+    merged: List[str] = []
+    for part in parts:
+        words = part.split()
+        if not merged:
+            merged.extend(words)
+            continue
+
+        tail = [_normalize_word(w) for w in merged[-max_overlap_words:]]
+        head = [_normalize_word(w) for w in words[:max_overlap_words]]
+        overlap = 0
+        for size in range(min(len(tail), len(head)), min_overlap_words - 1, -1):
+            if tail[-size:] == head[:size]:
+                overlap = size
+                break
+        merged.extend(words[overlap:])
+    return " ".join(merged)
+
+
+# =========================================================
+# ✅ CHUNKED TRANSCRIPTION PIPELINE
+# =========================================================
+class TranscriptionPipeline:
+    """
+    Extract + downsample audio, split near silences into overlapping chunks, transcribe
+    chunks concurrently (bounded) and stitch the text back together.
+    """
+
+    def __init__(
+        self,
+        transcriber: ChunkTranscriber,
+        chunk_seconds: float = 120.0,
+        overlap_seconds: float = 2.0,
+        silence_search_seconds: float = 10.0,
+        max_parallel: int = 4,
+        sample_rate: int = SAMPLE_RATE
+    ):
+        self.transcriber = transcriber
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.silence_search_seconds = silence_search_seconds
+        self.max_parallel = max_parallel
+        self.sample_rate = sample_rate
+
+    # ---------------------------
+    # Audio extraction
+    # ---------------------------
+    def load_audio(self, media_path: str) -> np.ndarray:
+        """Decode the audio track as mono float32 at sample_rate (moviepy/ffmpeg)."""
+        from moviepy.editor import AudioFileClip
+
+        clip = AudioFileClip(media_path, fps=self.sample_rate)
+        try:
+            samples = clip.to_soundarray(fps=self.sample_rate, quantize=False)
+        finally:
+            clip.close()
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        return samples.astype(np.float32)
+
+    # ---------------------------
+    # Silence-aligned split points
+    # ---------------------------
+    def find_split_points(self, samples: np.ndarray) -> List[int]:
+        frame = max(1, int(self.sample_rate * FRAME_SECONDS))
+        frame_count = len(samples) // frame
+        if frame_count == 0:
+            return []
+        energy = np.sqrt(np.mean(samples[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+
+        splits: List[int] = []
+        target = self.chunk_seconds
+        total_seconds = len(samples) / self.sample_rate
+        search = self.silence_search_seconds
+        while target < total_seconds - search:
+            lo = int(max(0.0, target - search) / FRAME_SECONDS)
+            hi = int(min(total_seconds, target + search) / FRAME_SECONDS)
+            quietest = lo + int(np.argmin(energy[lo:hi])) if hi > lo else int(target / FRAME_SECONDS)
+            splits.append(quietest * frame)
+            target = quietest * FRAME_SECONDS + self.chunk_seconds
+        return splits
+
+    def plan_chunks(self, samples: np.ndarray) -> List[AudioChunk]:
+        boundaries = [0, *self.find_split_points(samples), len(samples)]
+        overlap = int(self.overlap_seconds * self.sample_rate)
+        chunks = []
+        for index, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+            start = max(0, start - overlap) if index else start
+            chunks.append(AudioChunk(index, start / self.sample_rate, end / self.sample_rate))
+        return chunks
+
+    def write_wav(self, samples: np.ndarray, path: str) -> None:
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(pcm.tobytes())
+
+    # ---------------------------
+    # Transcription
+    # ---------------------------
+    async def transcribe_samples(self, samples: np.ndarray) -> str:
+        chunks = self.plan_chunks(samples)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        work_dir = tempfile.mkdtemp(prefix="transcribe-")
+        started = time.perf_counter()
+
+        async def transcribe_chunk(chunk: AudioChunk) -> str:
+            async with semaphore:
+                start = int(chunk.start_seconds * self.sample_rate)
+                end = int(chunk.end_seconds * self.sample_rate)
+                chunk.path = os.path.join(work_dir, f"chunk-{chunk.index:04d}.wav")
+                await asyncio.to_thread(self.write_wav, samples[start:end], chunk.path)
+                text = await self.transcriber(chunk)
+                os.unlink(chunk.path)
+                return text
+
+        try:
+            parts = await asyncio.gather(*(transcribe_chunk(chunk) for chunk in chunks))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        logger.info(
+            f"STAGE ✅: Transcribed {len(chunks)} chunk(s) of {self.chunk_seconds}s "
+            f"(parallel={self.max_parallel}) in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return stitch_transcripts([part.strip() for part in parts])
+
+    async def transcribe_file(self, media_path: str) -> str:
+        samples = await asyncio.to_thread(self.load_audio, media_path)
+        logger.info(f"STAGE ✅: Extracted {len(samples) / self.sample_rate:.1f}s of audio from {media_path}")
+        return await self.transcribe_samples(samples)
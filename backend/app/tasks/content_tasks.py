@@ -0,0 +1,47 @@
+import logging
+from typing import Dict
+from uuid import UUID
+
+from app.core.database import WorkerSessionLocal
+from app.services.quota_service import quota_service, QuotaReservation
+from app.services.media_ingest import SpooledMedia
+from app.services.repurpose_service import repurpose_service, ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# ✅ Repurpose Video Job (Background mode for /repurpose-video)
+# =========================================================
+async def run_repurpose_job(job: Dict, progress: ProgressCallback) -> Dict:
+    """
+    Runs the repurposing pipeline for a spooled upload.
+    The quota unit was reserved by the endpoint; it is refunded here if the pipeline fails.
+    """
+    user_id = UUID(job["user_id"])
+    media = SpooledMedia(job["media_path"], job["media_size"], job["media_sha256"])
+    logger.info(f"[TRACE {job['trace_id']}] STAGE ✅: Background repurpose job started for {user_id}")
+
+    async with WorkerSessionLocal() as session:
+        try:
+            response = await repurpose_service.run(
+                db=session,
+                user_id=user_id,
+                media=media,
+                original_filename=job["original_filename"],
+                title=job["title"],
+                description=job.get("description"),
+                platforms=job["platforms"],
+                tone=job["tone"],
+                trace_id=job["trace_id"],
+                progress=progress
+            )
+            return response.model_dump(mode="json")
+
+        except Exception as e:
+            logger.error(f"[TRACE {job['trace_id']}] ❌ Background repurpose job failed: {e}")
+            await session.rollback()
+            await quota_service.refund(session, QuotaReservation(user_id, "video_repurposes", 1, 0))
+            raise
+
+        finally:
+            media.discard()
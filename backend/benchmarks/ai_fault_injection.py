@@ -0,0 +1,136 @@
+"""
+Fault-injection harness for the OpenAI resilience layer (breaker, AIMD limiter, retries).
+
+A fake chat client walks through phases - healthy, latency spike, 429 storm, 5xx storm,
+recovery - while --concurrency workers keep calling generate_content_ideas with distinct
+topics (no caching, no single-flight coalescing). Timeouts and the breaker are scaled down
+so a run takes seconds. Per phase it reports latency, fallback rate, upstream calls, the
+breaker state and the concurrency limit:
+
+    python -m benchmarks.ai_fault_injection --phase-seconds 3 --concurrency 24
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.services.ai_service import AIService
+from app.services.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, ResilientCaller
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+IDEAS = json.dumps([{"title": "Idea", "description": "Hook.", "engagement_score": 80, "hashtags": ["#a"]}])
+
+# name, base latency (s), error rate, status code of injected errors
+PHASES = [
+    ("healthy", 0.05, 0.0, None),
+    ("latency_spike", 0.6, 0.0, None),
+    ("429_storm", 0.02, 0.9, 429),
+    ("5xx_storm", 0.05, 0.8, 503),
+    ("recovery", 0.05, 0.0, None),
+]
+
+
+class InjectedError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"injected {status_code}")
+        self.status_code = status_code
+
+
+class FaultyCompletions:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.phase = PHASES[0]
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        _, latency, error_rate, status_code = self.phase
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # ✅ Latency grows with load so the limiter has something to react to
+            await asyncio.sleep(latency * (1 + self.in_flight / 32) * self.rng.uniform(0.8, 1.2))
+            if status_code and self.rng.random() < error_rate:
+                raise InjectedError(status_code)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=IDEAS))],
+                usage=SimpleNamespace(prompt_tokens=60, completion_tokens=40)
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def make_service(args: argparse.Namespace):
+    completions = FaultyCompletions(args.seed)
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service.breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=20, window_seconds=2.0, open_seconds=1.0)
+    service.chat_caller = ResilientCaller(
+        "chat",
+        breaker=service.breaker,
+        limiter=AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2, max_limit=64, latency_target_ms=300),
+        attempt_timeout_seconds=1.0,
+        deadline_seconds=2.0,
+        max_retries=2,
+        retry_base_seconds=0.05,
+        retry_max_seconds=0.4
+    )
+    return service, completions
+
+
+async def main(args: argparse.Namespace) -> None:
+    service, completions = make_service(args)
+    topics = itertools.count()
+    samples = []  # (phase, latency_s, fallback)
+
+    async def worker() -> None:
+        while True:
+            topic = f"topic {next(topics)}"
+            start = time.perf_counter()
+            ideas = await service.generate_content_ideas(topic, "fitness", "parents", 1, use_cache=False)
+            samples.append((completions.phase[0], time.perf_counter() - start, ideas[0]["title"] != "Idea"))
+            await asyncio.sleep(args.think_ms / 1000)
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+    for phase in PHASES:
+        completions.phase = phase
+        calls_before, opened_before = completions.calls, service.breaker.times_opened
+        completions.peak_in_flight = completions.in_flight
+        await asyncio.sleep(args.phase_seconds)
+
+        latencies = sorted(latency for name, latency, _ in samples if name == phase[0])
+        fallbacks = sum(1 for name, _, fallback in samples if name == phase[0] and fallback)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        logger.info(
+            f"{phase[0]:<14} requests={len(latencies):<5} "
+            f"p50={statistics.median(latencies) * 1000 if latencies else 0:>6.0f}ms p95={p95 * 1000:>6.0f}ms "
+            f"fallback={fallbacks / max(len(latencies), 1):>5.1%} upstream_calls={completions.calls - calls_before:<5} "
+            f"peak_in_flight={completions.peak_in_flight:<3} breaker={service.breaker.state:<9} "
+            f"opened={service.breaker.times_opened - opened_before} limit={service.chat_caller.limiter.limit:.1f}"
+        )
+
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    logger.info(f"totals {service.resilience_stats()}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)  # ✅ Per-call fallback errors drown the table
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phase-seconds", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--think-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
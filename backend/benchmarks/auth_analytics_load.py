@@ -0,0 +1,94 @@
+"""
+Load benchmark for /auth/login and /analytics/ on a running CreatorHub.ai backend.
+
+Run it against the server before and after a change and compare requests/sec and latency:
+
+    python -m benchmarks.auth_analytics_load --base-url http://localhost:8000 \
+        --email bench@creatorhub.ai --password Bench12345 --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def summarize(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict:
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "endpoint": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round((len(latencies) + errors) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(ordered) * 1000, 1),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1),
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    name: str,
+    method: str,
+    url: str,
+    total: int,
+    concurrency: int,
+    json: Optional[Dict] = None,
+    headers: Optional[Dict] = None,
+) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, json=json, headers=headers)
+            # 404 on /analytics/ just means the bench user has no rows; it still exercises the full path
+            if response.status_code >= 500 or response.status_code in (401, 403):
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total)))
+    return summarize(name, latencies, errors, time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace) -> None:
+    credentials = {"email": args.email, "password": args.password}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        await client.post("/api/v1/auth/signup", json={**credentials, "full_name": "Bench User"})
+        login = await client.post("/api/v1/auth/login", json=credentials)
+        login.raise_for_status()
+        auth_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = [
+            await run_load(client, "POST /auth/login", "POST", "/api/v1/auth/login",
+                           args.requests, args.concurrency, json=credentials),
+            await run_load(client, "GET /analytics/", "GET", "/api/v1/analytics/",
+                           args.requests, args.concurrency, headers=auth_headers),
+        ]
+
+    for result in results:
+        logger.info(
+            f"{result['endpoint']:<18} rps={result['rps']:<8} p50={result['p50_ms']}ms "
+            f"p99={result['p99_ms']}ms errors={result['errors']}/{result['requests']}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="bench@creatorhub.ai")
+    parser.add_argument("--password", default="Bench12345")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
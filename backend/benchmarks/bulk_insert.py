@@ -0,0 +1,121 @@
+"""
+Bulk write throughput for generated_content: ORM add_all vs Core multi-row INSERT vs asyncpg COPY.
+
+Inserts idea-shaped rows for one throwaway user into the configured DATABASE_URL with each
+path in turn (fresh session, commit included), deleting them between runs. COPY needs
+PostgreSQL + asyncpg and is skipped elsewhere:
+
+    python -m benchmarks.bulk_insert --rows 10 1000 100000 --repeat 3
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, func, select
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.content import ContentType, GeneratedContent
+from app.models.user import User
+from app.services.content_service import content_service
+
+logger = logging.getLogger(__name__)
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"bulk-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Bulk Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def clear_content(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.commit()
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    await clear_content(user_id)
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+def idea_rows(user_id: uuid.UUID, count: int):
+    return [
+        {
+            "user_id": user_id,
+            "content_type": ContentType.IDEA,
+            "title": f"Idea {i}: a compelling hook for busy parents",
+            "content": "Two sentences about the angle and why it resonates with the audience.",
+            "content_metadata": {"topic": f"topic {i % 50}", "niche": "fitness", "platform": None, "engagement_potential": 80}
+        }
+        for i in range(count)
+    ]
+
+
+async def insert_orm(user_id: uuid.UUID, rows) -> int:
+    async with AsyncSessionLocal() as session:
+        records = [GeneratedContent(**row) for row in rows]
+        if not await content_service.bulk_insert_content(session, records):
+            raise RuntimeError("ORM bulk insert failed")
+        return len(records)
+
+
+def insert_core(method: str):
+    async def run(user_id: uuid.UUID, rows) -> int:
+        async with AsyncSessionLocal() as session:
+            return len(await content_service.bulk_insert_rows(session, rows, method=method))
+    return run
+
+
+async def stored(user_id: uuid.UUID) -> int:
+    async with AsyncSessionLocal() as session:
+        stmt = select(func.count()).select_from(GeneratedContent).where(GeneratedContent.user_id == user_id)
+        return await session.scalar(stmt)
+
+
+async def main(args: argparse.Namespace) -> None:
+    paths = [("orm_add_all", insert_orm), ("core_values", insert_core("values"))]
+    if async_engine.dialect.driver == "asyncpg":
+        paths.append(("asyncpg_copy", insert_core("copy")))
+    else:
+        logger.info(f"COPY skipped: driver is {async_engine.dialect.driver}, not asyncpg")
+
+    user_id = await create_user()
+    try:
+        for count in args.rows:
+            rows = idea_rows(user_id, count)
+            for name, path in paths:
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    inserted = await path(user_id, rows)
+                    timings.append(time.perf_counter() - start)
+                    assert inserted == count == await stored(user_id)
+                    await clear_content(user_id)
+                best, median = min(timings), statistics.median(timings)
+                logger.info(
+                    f"rows={count:<7} {name:<13} best={best * 1000:>9.1f}ms median={median * 1000:>9.1f}ms "
+                    f"rows_per_s={count / best:>10.0f}"
+                )
+    finally:
+        await drop_user(user_id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
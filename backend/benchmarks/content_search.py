@@ -0,0 +1,206 @@
+"""
+Library search latency on a large table: Postgres tsvector/GIN (+ pg_trgm when installed)
+through SearchService, first and deeper keyset pages, plus the in-process fallback index.
+
+Seeds --rows generated_content rows for one throwaway user (worst case: the user_id filter
+excludes nothing). Titles, tags and content mix common creator-topic words with synthetic
+"niche" words drawn from a Zipf distribution, so queries range from a handful of matches
+to a fifth of the table. Each query runs --repeat times; p50/p95 are reported per page:
+
+    python -m benchmarks.content_search --rows 1000000 --repeat 20 --memory-rows 20000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import delete, func, literal_column, select, text
+
+from app.core.cursor import SearchPosition
+from app.core.database import AsyncSessionLocal
+from app.models.content import SEARCH_TEXT_CONFIG, ContentType, GeneratedContent
+from app.models.user import User
+from app.services.content_service import content_service
+from app.services.search_index import InMemorySearchIndex
+from app.services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+SEED_CHUNK = 50000
+COMMON = (
+    "morning routine fitness budget productivity recipe travel parenting skincare podcast "
+    "garden coffee running yoga camera editing thumbnail newsletter marketing finance "
+    "minimalism journaling baking cycling hiking reading meditation cleaning fashion gaming "
+    "photography woodworking language coding investing sleep nutrition pets music writing"
+).split()
+HOOKS = ["How I", "Why you should try", "10 ideas for", "The truth about", "Beginner guide to", "What nobody says about"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "ze", "tu", "vo", "ni", "pe", "sa", "do", "ri", "ku", "ma", "te", "bo"]
+NICHE_WORDS = 20000
+
+
+def niche_word(rank: int) -> str:
+    return "".join(SYLLABLES[(rank >> shift) & 15] for shift in (0, 4, 8, 12)) + "x"
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"search-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Search Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+def make_rows(user_id, start: int, count: int, rng: random.Random, niche_cum):
+    base = datetime(2025, 1, 1)
+    niches = rng.choices(range(1, NICHE_WORDS + 1), cum_weights=niche_cum, k=count * 2)
+    rows = []
+    for i in range(count):
+        n = start + i
+        words = rng.sample(COMMON, 8)
+        niche = niche_word(niches[2 * i])
+        body = f"Today we talk {words[2]} and {words[3]} with a {words[4]} twist, {words[5]} tips and {niche_word(niches[2 * i + 1])}."
+        video = n % 20 == 0
+        rows.append({
+            "user_id": user_id,
+            "content_type": ContentType.REPURPOSED_VIDEO if video else (ContentType.BLOG_POST if n % 7 == 0 else ContentType.IDEA),
+            "title": f"{rng.choice(HOOKS)} {words[0]} {words[1]} {niche}",
+            "summary": f"A {words[6]} angle on {words[0]}." if n % 5 == 0 else None,
+            "content": (body + " ") * (20 if video else 1),
+            "tags": [words[6], words[7]],
+            "created_at": base + timedelta(seconds=n * 30)
+        })
+    return rows
+
+
+async def seed(user_id: uuid.UUID, rows: int) -> None:
+    rng = random.Random(7)
+    niche_cum = list(accumulate(1 / rank for rank in range(1, NICHE_WORDS + 1)))
+    for offset in range(0, rows, SEED_CHUNK):
+        chunk = make_rows(user_id, offset, min(SEED_CHUNK, rows - offset), rng, niche_cum)
+        async with AsyncSessionLocal() as session:
+            await content_service.bulk_insert_rows(session, chunk)
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("ANALYZE generated_content"))
+        await session.commit()
+
+
+QUERIES = [
+    ("rare niche", niche_word(4000), None),
+    ("medium niche", niche_word(12), None),
+    ("common word", "fitness", None),
+    ("two common", "coffee yoga", None),
+    ("phrase", '"morning routine"', None),
+    ("or", f"{niche_word(900)} or {niche_word(901)}", None),
+    ("negation", "budget -travel", None),
+    ("common+type", "podcast", "blog_post"),
+    ("no match", "qwertyuiop", None),
+]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_postgres(service: SearchService, user_id: uuid.UUID, repeat: int, pages: int) -> None:
+    for label, query, content_type in QUERIES:
+        async with AsyncSessionLocal() as session:
+            tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig"), query)
+            matches = (await session.execute(
+                select(func.count()).select_from(GeneratedContent).where(
+                    GeneratedContent.user_id == user_id,
+                    literal_column("search_vector").op("@@")(tsquery)
+                )
+            )).scalar()
+
+            timings = [[] for _ in range(pages)]
+            hits_seen = 0
+            for _ in range(repeat):
+                after = None
+                hits_seen = 0
+                for page in range(pages):
+                    start = time.perf_counter()
+                    hits = await service.search(session, user_id, query, content_type, limit=20, after=after)
+                    timings[page].append((time.perf_counter() - start) * 1000)
+                    hits_seen += len(hits)
+                    if len(hits) < 20:
+                        break
+                    after = SearchPosition(hits[-1].score, hits[-1].id)
+
+        pages_run = [t for t in timings if t]
+        cells = "  ".join(
+            f"p{page + 1} p50={statistics.median(t):6.1f}ms p95={percentile(t, 0.95):6.1f}ms"
+            for page, t in enumerate(pages_run)
+        )
+        logger.info(f"{label:<13} {query!r:<24} matches={matches:<7} hits={hits_seen:<4} {cells}")
+
+
+def run_memory(rows: int, repeat: int) -> None:
+    rng = random.Random(7)
+    niche_cum = list(accumulate(1 / rank for rank in range(1, NICHE_WORDS + 1)))
+    user_id = uuid.uuid4()
+    index = InMemorySearchIndex()
+    data = make_rows(user_id, 0, rows, rng, niche_cum)
+    start = time.perf_counter()
+    for row in data:
+        index.add(uuid.uuid4(), row["content_type"], row["title"], row["created_at"],
+                  row["summary"], row["content"], row["tags"], {})
+    logger.info(f"in-process index: built {rows} documents in {time.perf_counter() - start:.1f}s")
+    for label, query, content_type in QUERIES:
+        parsed_type = ContentType(content_type) if content_type else None
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = index.search(query, parsed_type, limit=20)
+            timings.append((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"in-process {label:<13} hits={len(hits):<3} p50={statistics.median(timings):6.1f}ms "
+            f"p95={percentile(timings, 0.95):6.1f}ms"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    service = SearchService(max_candidates=args.max_candidates, recent_rows=args.recent_rows)
+    user_id = await create_user()
+    try:
+        started = time.perf_counter()
+        await seed(user_id, args.rows)
+        logger.info(
+            f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s "
+            f"(max_candidates={args.max_candidates}, recent_rows={args.recent_rows})"
+        )
+        await run_postgres(service, user_id, args.repeat, args.pages)
+    finally:
+        await drop_user(user_id)
+    if args.memory_rows:
+        run_memory(args.memory_rows, args.repeat)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--max-candidates", type=int, default=1000)
+    parser.add_argument("--recent-rows", type=int, default=20000)
+    parser.add_argument("--memory-rows", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,149 @@
+"""
+Fairness check for the per-platform repurposing fan-out (FanOutExecutor).
+
+A fake AsyncOpenAI client answers each repurpose prompt after an injected delay and
+tracks calls in flight, overall and per user. One heavy user fans out --heavy-platforms
+platforms; --light-users users with --light-platforms platforms each start shortly after.
+Limits are scaled down (--global-limit, --per-user-limit) so a run takes seconds. One
+platform of the heavy user is slower than --timeout-ms to exercise the fallback.
+
+Checks that no limit is exceeded, that the light users finish within a couple of call
+delays (their platforms are never stuck behind the heavy user's queued ones) and that
+the timed-out platform gets a fallback; exits non-zero otherwise:
+
+    python -m benchmarks.fanout_fairness --global-limit 4 --per-user-limit 2 --delay-ms 200
+"""
+import argparse
+import asyncio
+import logging
+import re
+import sys
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+from app.services.ai_service import AIService
+from app.services.fanout import FanOutExecutor
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_USER = re.compile(r"Title: (\S+)")
+_PLATFORM = re.compile(r"Repurpose the following video for (\S+) ")
+
+
+class FakeCompletions:
+    """chat.completions.create with an injected delay per platform; tracks concurrency."""
+
+    def __init__(self, delay_seconds: float, slow_platform: str, slow_seconds: float):
+        self.delay_seconds = delay_seconds
+        self.slow_platform = slow_platform
+        self.slow_seconds = slow_seconds
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.user_in_flight = defaultdict(int)
+        self.peak_user_in_flight = defaultdict(int)
+
+    async def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        user = _USER.search(prompt).group(1)
+        platform = _PLATFORM.search(prompt).group(1)
+        if platform == self.slow_platform:
+            # ✅ Abandoned by the fan-out at its timeout (single-flight lets the call finish for
+            # other waiters), so it no longer holds a slot: kept out of the concurrency peaks
+            await asyncio.sleep(self.slow_seconds)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=""))],
+                usage=SimpleNamespace(prompt_tokens=80, completion_tokens=0)
+            )
+        self.in_flight += 1
+        self.user_in_flight[user] += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.peak_user_in_flight[user] = max(self.peak_user_in_flight[user], self.user_in_flight[user])
+        try:
+            await asyncio.sleep(self.delay_seconds)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=f"{platform} caption #a #b"))],
+                usage=SimpleNamespace(prompt_tokens=80, completion_tokens=20)
+            )
+        finally:
+            self.in_flight -= 1
+            self.user_in_flight[user] -= 1
+
+
+def make_service(args: argparse.Namespace):
+    completions = FakeCompletions(args.delay_ms / 1000, "heavy0", args.timeout_ms / 1000 * 3)
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service.fanout = FanOutExecutor(
+        global_limit=args.global_limit,
+        per_user_limit=args.per_user_limit,
+        timeout_seconds=args.timeout_ms / 1000
+    )
+    return service, completions
+
+
+async def repurpose(service: AIService, user: str, platforms: int):
+    started = time.perf_counter()
+    result = await service.repurpose_content_with_report(
+        transcript="A short transcript.",
+        original_title=user,  # ✅ Lets the fake client attribute calls to users
+        original_description="",
+        target_platforms=[f"{user}{i}" for i in range(platforms)],
+        user_id=user
+    )
+    return time.perf_counter() - started, result
+
+
+async def main(args: argparse.Namespace) -> None:
+    service, completions = make_service(args)
+    heavy = asyncio.create_task(repurpose(service, "heavy", args.heavy_platforms))
+    await asyncio.sleep(args.delay_ms / 1000 / 4)
+    light = await asyncio.gather(*(repurpose(service, f"light{i}", args.light_platforms) for i in range(args.light_users)))
+    heavy_seconds, heavy_result = await heavy
+
+    delay = args.delay_ms / 1000
+    light_seconds = [seconds for seconds, _ in light]
+    # ✅ Light users never wait on the heavy user's queue: at most one round behind the
+    # global slots it already holds, plus their own per-user rounds
+    light_budget = delay * (1 + -(-args.light_platforms // args.per_user_limit)) * 1.5
+    peak_user = max(completions.peak_user_in_flight.values())
+    logger.info(
+        f"heavy: {args.heavy_platforms} platforms in {heavy_seconds * 1000:.0f}ms "
+        f"(timed out: {heavy_result.timed_out})"
+    )
+    logger.info(
+        f"light: {args.light_users} users x {args.light_platforms} platforms, slowest {max(light_seconds) * 1000:.0f}ms "
+        f"(budget {light_budget * 1000:.0f}ms)"
+    )
+    logger.info(f"peak in flight: {completions.peak_in_flight} global, {peak_user} per user")
+
+    failures = []
+    if completions.peak_in_flight > args.global_limit:
+        failures.append(f"global limit exceeded ({completions.peak_in_flight} > {args.global_limit})")
+    if peak_user > args.per_user_limit:
+        failures.append(f"per-user limit exceeded ({peak_user} > {args.per_user_limit})")
+    if max(light_seconds) > light_budget:
+        failures.append("light users waited behind the heavy user's queued platforms")
+    if heavy_result.timed_out != ["heavy0"] or not heavy_result.results["heavy0"].startswith("Fallback"):
+        failures.append(f"expected a fallback for the timed-out platform, got {heavy_result.timed_out}")
+    for failure in failures:
+        logger.error(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    logger.info("OK")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--global-limit", type=int, default=4)
+    parser.add_argument("--per-user-limit", type=int, default=2)
+    parser.add_argument("--heavy-platforms", type=int, default=12)
+    parser.add_argument("--light-users", type=int, default=2)
+    parser.add_argument("--light-platforms", type=int, default=2)
+    parser.add_argument("--delay-ms", type=float, default=200.0)
+    parser.add_argument("--timeout-ms", type=float, default=500.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""
+Content history page latency at increasing depth: OFFSET vs keyset cursor.
+
+Seeds --rows generated_content rows for one throwaway user (COPY via bulk_insert_rows; a
+share of rows share timestamps so the id tie-break matters), then times
+ContentService.get_user_content_history for one page at each --depths row offset, once
+with offset= and once with the keyset position of the row just before that depth:
+
+    python -m benchmarks.history_pagination --rows 1000000 --depths 0 10000 100000 500000 790000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+
+from app.core.cursor import KeysetPosition
+from app.core.database import AsyncSessionLocal
+from app.models.content import ContentType, GeneratedContent
+from app.models.user import User
+from app.services.content_service import content_service
+
+logger = logging.getLogger(__name__)
+
+SEED_CHUNK = 50000
+CONTENT_TYPES = [ContentType.IDEA] * 8 + [ContentType.REPURPOSED_VIDEO, ContentType.SOCIAL_POST]
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"history-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="History Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def seed(user_id: uuid.UUID, rows: int) -> None:
+    start = datetime.utcnow() - timedelta(seconds=rows)
+    for offset in range(0, rows, SEED_CHUNK):
+        chunk = [
+            {
+                "user_id": user_id,
+                "content_type": CONTENT_TYPES[i % len(CONTENT_TYPES)],
+                "title": f"Idea {i}",
+                "content": "Two sentences about the angle and why it resonates.",
+                # ✅ Pairs of rows share a timestamp
+                "created_at": start + timedelta(seconds=i // 2)
+            }
+            for i in range(offset, min(offset + SEED_CHUNK, rows))
+        ]
+        async with AsyncSessionLocal() as session:
+            await content_service.bulk_insert_rows(session, chunk)
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("ANALYZE generated_content"))
+        await session.commit()
+
+
+async def timed_page(user_id: uuid.UUID, content_type, limit: int, repeat: int, **page):
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            start = time.perf_counter()
+            records = await content_service.get_user_content_history(
+                session, user_id, content_type=content_type, limit=limit, **page
+            )
+            timings.append(time.perf_counter() - start)
+    return records, statistics.median(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await create_user()
+    try:
+        started = time.perf_counter()
+        await seed(user_id, args.rows)
+        logger.info(f"seeded rows={args.rows} in {time.perf_counter() - started:.1f}s")
+
+        for content_type in (None, "idea"):
+            for depth in args.depths:
+                offset_page, offset_s = await timed_page(user_id, content_type, args.limit, args.repeat, offset=depth)
+                after = None
+                if depth:
+                    previous, _ = await timed_page(user_id, content_type, 1, 1, offset=depth - 1)
+                    if not previous:
+                        continue
+                    after = KeysetPosition(previous[0].created_at, previous[0].id)
+                keyset_page, keyset_s = await timed_page(user_id, content_type, args.limit, args.repeat, after=after)
+                same = [r.id for r in offset_page] == [r.id for r in keyset_page]
+                logger.info(
+                    f"type={content_type or 'all':<5} depth={depth:<8} offset={offset_s * 1000:>8.1f}ms "
+                    f"keyset={keyset_s * 1000:>6.1f}ms same_page={same}"
+                )
+    finally:
+        await drop_user(user_id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 10000, 100000, 500000, 790000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
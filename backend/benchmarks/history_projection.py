@@ -0,0 +1,183 @@
+"""
+Content history page cost: full ORM entities vs deferred heavy columns vs column projection.
+
+Seeds --rows generated_content rows (repurposed videos carry a --content-kb transcript plus
+summary, prompt and performance JSON), then fetches --pages history pages of --limit rows
+through each path and maps them to ContentHistoryResponse. The database connection goes
+through a local TCP proxy that counts bytes sent by PostgreSQL; tracemalloc measures peak
+Python allocation per page:
+
+    python -m benchmarks.history_projection --rows 2000 --limit 100 --pages 20 --content-kb 20
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import undefer_group
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.content import ContentType, GeneratedContent
+from app.models.user import User
+from app.schemas.content import ContentHistoryResponse
+from app.services.content_service import content_service
+
+logger = logging.getLogger(__name__)
+
+
+class CountingProxy:
+    """TCP pass-through to PostgreSQL that counts server -> client bytes."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.bytes_from_server = 0
+
+    async def start(self) -> int:
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return server.sockets[0].getsockname()[1]
+
+    async def _handle(self, client_reader, client_writer) -> None:
+        server_reader, server_writer = await asyncio.open_connection(self.host, self.port)
+        await asyncio.gather(
+            self._pipe(client_reader, server_writer, count=False),
+            self._pipe(server_reader, client_writer, count=True)
+        )
+
+    async def _pipe(self, reader, writer, count: bool) -> None:
+        try:
+            while data := await reader.read(65536):
+                if count:
+                    self.bytes_from_server += len(data)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"projection-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Projection Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def seed(user_id: uuid.UUID, rows: int, content_kb: int) -> None:
+    transcript = ("so today we are talking about morning routines " * (content_kb * 22))[:content_kb * 1024]
+    records = []
+    for i in range(rows):
+        video = i % 4 == 0
+        records.append({
+            "user_id": user_id,
+            "content_type": ContentType.REPURPOSED_VIDEO if video else ContentType.IDEA,
+            "title": f"Item {i}",
+            "content": transcript if video else "Two sentences about the angle and why it resonates.",
+            "summary": transcript[:1024] if video else None,
+            "generation_prompt": "Generate viral content ideas about " + "context " * 250,
+            "performance_data": {"daily_views": list(range(60))},
+            "content_metadata": {"topic": f"topic {i}", "platforms": ["tiktok", "instagram"]}
+        })
+    async with AsyncSessionLocal() as session:
+        await content_service.bulk_insert_rows(session, records)
+
+
+def to_response(item) -> ContentHistoryResponse:
+    return ContentHistoryResponse(
+        id=item.id,
+        content_type=item.content_type.value,
+        title=item.title or "",
+        created_at=item.created_at,
+        metadata=item.content_metadata or {}
+    )
+
+
+async def entity_full(session, user_id, limit, offset):
+    """The pre-projection route: whole entities, every column."""
+    stmt = content_service._history_statement(
+        select(GeneratedContent).options(undefer_group("body")), user_id, None, limit, offset, None
+    )
+    return [to_response(item) for item in (await session.execute(stmt)).scalars().all()]
+
+
+async def entity_deferred(session, user_id, limit, offset):
+    records = await content_service.get_user_content_history(session, user_id, limit=limit, offset=offset)
+    return [to_response(item) for item in records]
+
+
+async def projection(session, user_id, limit, offset):
+    rows = await content_service.get_user_content_history_rows(session, user_id, limit=limit, offset=offset)
+    return [to_response(row) for row in rows]
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = make_url(settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"))
+    proxy = CountingProxy(url.host or "localhost", url.port or 5432)
+    engine = create_async_engine(url.set(host="127.0.0.1", port=await proxy.start()), pool_size=1)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    user_id = await create_user()
+    try:
+        await seed(user_id, args.rows, args.content_kb)
+        offsets = [(page * args.limit) % max(args.rows - args.limit, 1) for page in range(args.pages)]
+
+        for name, path in (("entity_full", entity_full), ("entity_deferred", entity_deferred), ("projection", projection)):
+            async with sessions() as session:
+                await path(session, user_id, args.limit, 0)  # ✅ warm the connection and statement cache
+
+            sent, peaks, timings = [], [], []
+            for offset in offsets:
+                async with sessions() as session:
+                    before = proxy.bytes_from_server
+                    tracemalloc.start()
+                    items = await path(session, user_id, args.limit, offset)
+                    peaks.append(tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+                    sent.append(proxy.bytes_from_server - before)
+                assert len(items) == args.limit
+            for offset in offsets:
+                async with sessions() as session:
+                    start = time.perf_counter()
+                    await path(session, user_id, args.limit, offset)
+                    timings.append(time.perf_counter() - start)
+
+            logger.info(
+                f"{name:<16} bytes_from_pg/page={statistics.mean(sent) / 1024:>8.1f}KiB "
+                f"peak_alloc/page={statistics.mean(peaks) / 1024:>8.1f}KiB "
+                f"latency p50={statistics.median(timings) * 1000:>6.1f}ms"
+            )
+    finally:
+        await drop_user(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--content-kb", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
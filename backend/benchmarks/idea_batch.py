@@ -0,0 +1,107 @@
+"""
+Per-idea latency and cost: /generate-ideas once per topic vs one /generate-ideas/batch call.
+
+Runs both route handlers against the configured DATABASE_URL (quota reservation, AI call,
+commit / bulk insert) with the local AI simulator as the model, response caching off. The
+single path issues one request per topic with --concurrency in flight; the batch path sends
+every topic in one request:
+
+    python -m benchmarks.idea_batch --topics 10 40 --count 3 --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from app.api.content import generate_content_ideas, generate_content_ideas_batch
+from app.core.database import AsyncSessionLocal
+from app.core.token_cache import UserSnapshot
+from app.models.content import GeneratedContent
+from app.models.user import SubscriptionPlan, User
+from app.schemas.content import ContentIdeaBatchRequest, ContentIdeaRequest
+from app.services.ai_provider import SimulatedAIClient
+from app.services.ai_service import ai_service
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+async def create_user() -> UserSnapshot:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"batch-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Batch Bench",
+            hashed_password="x",
+            subscription_plan=SubscriptionPlan.ENTERPRISE,
+            subscription_end_date=datetime.utcnow() + timedelta(days=30)
+        )
+        session.add(user)
+        await session.commit()
+        return UserSnapshot.from_user(user)
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+def requests_for(topics: int, count: int):
+    return [ContentIdeaRequest(topic=f"topic {i}", niche="fitness", audience="parents", count=count) for i in range(topics)]
+
+
+async def single(user: UserSnapshot, items, concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item) -> int:
+        async with semaphore, AsyncSessionLocal() as session:
+            return len(await generate_content_ideas(item, current_user=user, db=session))
+
+    return sum(await asyncio.gather(*(one(item) for item in items)))
+
+
+async def batch(user: UserSnapshot, items, concurrency: int) -> int:
+    async with AsyncSessionLocal() as session:
+        response = await generate_content_ideas_batch(ContentIdeaBatchRequest(items=items), current_user=user, db=session)
+        return response.total_ideas
+
+
+async def main(args: argparse.Namespace) -> None:
+    ai_service.response_cache = ResponseCache(0, 0, 0, 1.0, similarity_enabled=False)
+    user = await create_user()
+    try:
+        for topics in args.topics:
+            items = requests_for(topics, args.count)
+            for name, path in (("single", single), ("batch", batch)):
+                client = SimulatedAIClient(latency_ms=args.latency_ms, ms_per_token=args.ms_per_token)
+                ai_service.client = client
+                start = time.perf_counter()
+                ideas = await path(user, items, args.concurrency)
+                elapsed = time.perf_counter() - start
+                stats = client.stats()
+                tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+                logger.info(
+                    f"topics={topics:<4} {name:<7} ideas={ideas:<5} wall={elapsed:>6.2f}s "
+                    f"per_idea={elapsed / max(ideas, 1) * 1000:>7.1f}ms completions={stats['calls']:<4} "
+                    f"prompt_tokens={stats['prompt_tokens']:<7} tokens_per_idea={tokens / max(ideas, 1):>6.1f}"
+                )
+    finally:
+        await drop_user(user.id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, nargs="+", default=[10, 40])
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--ms-per-token", type=float, default=15.0)
+    asyncio.run(main(parser.parse_args()))
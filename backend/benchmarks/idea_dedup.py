@@ -0,0 +1,255 @@
+"""
+Near-duplicate idea detection: MinHash/LSH (content_minhash_bands) against brute-force
+pairwise comparison, as one user's idea library grows.
+
+Seeds ideas for one throwaway user through content_service.bulk_insert_rows (signatures
+and band rows included) in stages up to each --sizes value. Ideas are drawn from a skewed
+vocabulary, so unrelated ideas share common words; --dup-share of them are light rewrites
+(a few words swapped) of an earlier idea. At each size, --queries probe ideas (half
+rewrites of stored ideas, half new) are checked by:
+
+  lsh          idea_dedup.find_repeats: band-key probes + candidate signatures
+  brute-sig    every stored signature fetched and compared (numpy)
+  brute-exact  exact Jaccard against every stored idea's shingle set (in memory)
+
+and recall/precision of lsh are measured against brute-exact. Insert cost is reported
+with and without signatures. Finally all pairs of --pairs-rows ideas are found with the
+in-process MinHashLSH versus an all-pairs signature comparison:
+
+    python -m benchmarks.idea_dedup --sizes 1000 10000 100000 --queries 200 --pairs-rows 5000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+import uuid
+from itertools import accumulate
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.content import ContentType, GeneratedContent
+from app.models.user import User
+from app.services.content_service import content_service
+from app.services.idea_dedup import (
+    IdeaDedupService, MinHashLSH, idea_signature, minhash, shingles
+)
+
+logger = logging.getLogger(__name__)
+
+SEED_CHUNK = 5000
+HOOKS = ["How I", "Why you should try", "10 ideas for", "The truth about", "Beginner guide to", "What nobody says about"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "ze", "tu", "vo", "ni", "pe", "sa", "do", "ri", "ku", "ma", "te", "bo"]
+VOCABULARY = 5000
+
+
+def word(rank: int) -> str:
+    return "".join(SYLLABLES[(rank >> shift) & 15] for shift in (0, 4, 8)) + "n"
+
+
+class IdeaGenerator:
+    def __init__(self, seed: int = 7):
+        self.rng = random.Random(seed)
+        self.cum = list(accumulate(1 / rank ** 0.8 for rank in range(1, VOCABULARY + 1)))
+        self.ideas = []
+
+    def _words(self, count: int):
+        return [word(rank) for rank in self.rng.choices(range(VOCABULARY), cum_weights=self.cum, k=count)]
+
+    def fresh(self):
+        return {
+            "title": f"{self.rng.choice(HOOKS)} {' '.join(self._words(3))}",
+            "description": " ".join(self._words(self.rng.randint(20, 35))) + "."
+        }
+
+    def rewrite(self, idea):
+        """A few words of the description replaced or inserted: Jaccard mostly 0.5-0.9."""
+        words = idea["description"].rstrip(".").split()
+        for _ in range(self.rng.randint(1, 6)):
+            position = self.rng.randrange(len(words))
+            if self.rng.random() < 0.5:
+                words[position] = self._words(1)[0]
+            else:
+                words.insert(position, self._words(1)[0])
+        return {"title": idea["title"], "description": " ".join(words) + "."}
+
+    def next(self, dup_share: float):
+        idea = self.rewrite(self.rng.choice(self.ideas)) if self.ideas and self.rng.random() < dup_share else self.fresh()
+        self.ideas.append(idea)
+        return idea
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"dedup-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Dedup Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+def idea_row(user_id: uuid.UUID, idea, signed: bool = True):
+    return {
+        "user_id": user_id,
+        "content_type": ContentType.IDEA,
+        "title": idea["title"],
+        "content": idea["description"],
+        "minhash": idea_signature(idea["title"], idea["description"]) if signed else None
+    }
+
+
+async def insert(user_id: uuid.UUID, ideas, signed: bool = True) -> float:
+    """Seconds to sign (optionally) and insert ideas, in SEED_CHUNK batches."""
+    started = time.perf_counter()
+    for offset in range(0, len(ideas), SEED_CHUNK):
+        rows = [idea_row(user_id, idea, signed) for idea in ideas[offset:offset + SEED_CHUNK]]
+        async with AsyncSessionLocal() as session:
+            await content_service.bulk_insert_rows(session, rows)
+    return time.perf_counter() - started
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def timing(samples) -> str:
+    return f"p50={statistics.median(samples):8.2f}ms p95={percentile(samples, 0.95):8.2f}ms"
+
+
+def jaccard(a, b) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+async def run_queries(service: IdeaDedupService, user_id: uuid.UUID, generator: IdeaGenerator, stored_sets, queries: int):
+    rng = random.Random(len(stored_sets))
+    probes = [
+        generator.rewrite(rng.choice(generator.ideas)) if i % 2 == 0 else generator.fresh()
+        for i in range(queries)
+    ]
+    lsh_ms, sig_ms, exact_ms = [], [], []
+    true_positive = false_positive = false_negative = 0
+    async with AsyncSessionLocal() as session:
+        for probe in probes:
+            started = time.perf_counter()
+            repeat = (await service.find_repeats(session, user_id, [probe]))[0]
+            lsh_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            signature = minhash(shingles(probe["title"], probe["description"]))
+            stored = (await session.execute(
+                select(GeneratedContent.minhash).where(
+                    GeneratedContent.user_id == user_id, GeneratedContent.minhash.isnot(None)
+                )
+            )).scalars().all()
+            matrix = np.frombuffer(b"".join(stored), dtype="<u4").reshape(len(stored), -1)
+            bool(((matrix == signature).mean(axis=1) >= service.threshold).any())
+            sig_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            probe_set = shingles(probe["title"], probe["description"])
+            expected = any(jaccard(probe_set, other) >= service.threshold for other in stored_sets)
+            exact_ms.append((time.perf_counter() - started) * 1000)
+
+            true_positive += repeat and expected
+            false_positive += repeat and not expected
+            false_negative += expected and not repeat
+
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 1.0
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 1.0
+    return lsh_ms, sig_ms, exact_ms, recall, precision
+
+
+def run_pairs(rows: int, threshold: float) -> None:
+    generator = IdeaGenerator(seed=11)
+    ideas = [generator.next(0.2) for _ in range(rows)]
+    signatures = [minhash(shingles(idea["title"], idea["description"])) for idea in ideas]
+
+    started = time.perf_counter()
+    index = MinHashLSH(threshold)
+    lsh_pairs = set()
+    for position, signature in enumerate(signatures):
+        lsh_pairs.update((key, position) for key, _ in index.query(signature))
+        index.add(position, signature)
+    lsh_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix = np.stack(signatures)
+    brute_pairs = set()
+    for position in range(1, rows):
+        similar = np.nonzero((matrix[:position] == matrix[position]).mean(axis=1) >= threshold)[0]
+        brute_pairs.update((int(other), position) for other in similar)
+    brute_seconds = time.perf_counter() - started
+
+    found = len(lsh_pairs & brute_pairs)
+    logger.info(
+        f"all pairs of {rows} ideas: lsh {lsh_seconds:.2f}s, brute-force signatures {brute_seconds:.2f}s "
+        f"({rows * (rows - 1) // 2} comparisons); {len(brute_pairs)} pairs >= {threshold}, "
+        f"lsh found {found} ({found / len(brute_pairs) if brute_pairs else 1:.1%})"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    service = IdeaDedupService()
+    generator = IdeaGenerator()
+    sign_started = time.perf_counter()
+    for _ in range(1000):
+        idea = generator.fresh()
+        idea_signature(idea["title"], idea["description"])
+    logger.info(f"signature: {(time.perf_counter() - sign_started) * 1000 / 1000:.3f}ms per idea (title + description)")
+
+    user_id = await create_user()
+    plain_user = await create_user()
+    try:
+        sample = [generator.fresh() for _ in range(min(args.sizes[0], 10000))]
+        plain = await insert(plain_user, sample, signed=False)
+        signed = await insert(plain_user, sample, signed=True)
+        logger.info(
+            f"insert {len(sample)} ideas: {plain / len(sample) * 1e6:.0f}us/idea unsigned, "
+            f"{signed / len(sample) * 1e6:.0f}us/idea with signature + bands"
+        )
+
+        generator = IdeaGenerator()
+        stored_sets = []
+        for size in sorted(args.sizes):
+            new = [generator.next(args.dup_share) for _ in range(size - len(stored_sets))]
+            await insert(user_id, new)
+            stored_sets.extend(shingles(idea["title"], idea["description"]) for idea in new)
+
+            lsh_ms, sig_ms, exact_ms, recall, precision = await run_queries(
+                service, user_id, generator, stored_sets, args.queries
+            )
+            logger.info(f"library {size:>7}: lsh         {timing(lsh_ms)}  recall={recall:.1%} precision={precision:.1%}")
+            logger.info(f"library {size:>7}: brute-sig   {timing(sig_ms)}")
+            logger.info(f"library {size:>7}: brute-exact {timing(exact_ms)}")
+    finally:
+        await drop_user(user_id)
+        await drop_user(plain_user)
+
+    if args.pairs_rows:
+        run_pairs(args.pairs_rows, service.threshold)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dup-share", type=float, default=0.2)
+    parser.add_argument("--pairs-rows", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
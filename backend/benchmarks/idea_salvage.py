@@ -0,0 +1,143 @@
+"""
+Idea JSON salvage vs the old strict json.loads path, over a corpus of noisy model outputs.
+
+A stub chat client answers every idea request with one of the shapes models really return -
+clean arrays, ```json fences, prose around the JSON, a {"ideas": [...]} wrapper, trailing
+commas, truncation at max_tokens, or an item that fails validation - drawn with --noise
+probability. The old path (json.loads, then placeholder ideas and a full paid retry on any
+failure) is replayed on the same responses:
+
+    python -m benchmarks.idea_salvage --requests 2000 --noise 0.3 --count 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from types import SimpleNamespace
+
+from app.schemas.content import GeneratedIdea
+from app.services.ai_service import AIService
+from app.services.idea_salvage import idea_salvage_stats
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_COUNT = re.compile(r"Generate (\d+) viral content ideas")
+TOKENS_PER_IDEA = 90
+
+
+def ideas_json(count: int, rng: random.Random) -> list:
+    return [
+        {
+            "title": f"Idea {rng.randrange(10 ** 6)}: a compelling hook",
+            "description": "Two sentences about the angle and why it resonates.",
+            "engagement_score": rng.randint(50, 95),
+            "hashtags": ["#creator", "#growth", "#tips"]
+        }
+        for _ in range(count)
+    ]
+
+
+def noisy(ideas: list, shape: str, rng: random.Random) -> str:
+    text = json.dumps(ideas, indent=2)
+    if shape == "fenced":
+        return f"```json\n{text}\n```"
+    if shape == "prose":
+        return f"Here are your ideas!\n\n{text}\n\nLet me know if you want more."
+    if shape == "wrapped":
+        return json.dumps({"ideas": ideas})
+    if shape == "trailing_comma":
+        return text[:-1].rstrip() + ",\n]"
+    if shape == "truncated":
+        return text[:int(len(text) * rng.uniform(0.55, 0.9))]
+    if shape == "invalid_item":
+        ideas[rng.randrange(len(ideas))]["engagement_score"] = 150
+        return json.dumps(ideas)
+    return text
+
+
+NOISE_SHAPES = ["fenced", "prose", "wrapped", "trailing_comma", "truncated", "invalid_item"]
+
+
+class NoisyCompletions:
+    def __init__(self, noise: float, seed: int):
+        self.rng = random.Random(seed)
+        self.noise = noise
+        self.first_responses = []
+        self.calls = 0
+        self.tokens = 0
+
+    async def create(self, messages, max_tokens, **kwargs):
+        count = int(_COUNT.search(messages[-1]["content"]).group(1))
+        shape = self.rng.choice(NOISE_SHAPES) if self.rng.random() < self.noise else "clean"
+        text = noisy(ideas_json(count, self.rng), shape, self.rng)
+        self.calls += 1
+        self.tokens += 120 + count * TOKENS_PER_IDEA
+        if "Do not repeat" not in messages[-1]["content"]:
+            self.first_responses.append(text)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=count * TOKENS_PER_IDEA)
+        )
+
+
+def legacy_ok(text: str) -> bool:
+    """The old path: json.loads on the stripped text, then every idea must fit the response schema."""
+    try:
+        ideas = json.loads(text.strip())
+        return isinstance(ideas, list) and all(GeneratedIdea(**idea) for idea in ideas)
+    except Exception:
+        return False
+
+
+async def main(args: argparse.Namespace) -> None:
+    completions = NoisyCompletions(args.noise, args.seed)
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    full, short, fallback = 0, 0, 0
+    for i in range(args.requests):
+        ideas = await service.generate_content_ideas(f"topic {i}", "fitness", "parents", args.count, use_cache=False)
+        if ideas[0]["title"].startswith("Content Idea #"):
+            fallback += 1
+        elif len(ideas) == args.count:
+            full += 1
+        else:
+            short += 1
+
+    # ✅ Replay each request's first response through the old path
+    started = time.perf_counter()
+    legacy_failures = sum(1 for text in completions.first_responses if not legacy_ok(text))
+    legacy_us = (time.perf_counter() - started) / max(args.requests, 1) * 1e6
+    success_rate = 1 - legacy_failures / max(args.requests, 1)
+    legacy_calls = f"{args.requests / success_rate:.0f}" if success_rate else "unbounded"  # retry until clean
+    stats = idea_salvage_stats.stats()
+
+    logger.info(f"requests={args.requests} count={args.count} noise={args.noise:.0%}")
+    logger.info(
+        f"old path  : failed responses={legacy_failures} ({legacy_failures / args.requests:.1%}) -> placeholder ideas; "
+        f"~{legacy_calls} upstream calls if each failure is regenerated ({legacy_us:.0f}us/parse)"
+    )
+    logger.info(
+        f"salvage   : full sets={full} short sets={short} placeholders={fallback} upstream calls={completions.calls} "
+        f"(re-asks={stats['reasks']}) tokens={completions.tokens}"
+    )
+    logger.info(
+        f"            salvage_rate={stats['salvage_rate']} items_valid={stats['items_valid']}/{stats['items_seen']} "
+        f"regenerations_avoided={stats['regenerations_avoided']}"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,180 @@
+"""
+Time-to-first-idea benchmark: blocking generate_content_ideas vs stream_content_ideas.
+
+A stub chat client "generates" a JSON array of N ideas at --tokens-per-second (one token
+~ 4 characters). The blocking path only returns after the full completion; the streaming
+path yields each idea once its closing brace arrives. Caching is disabled so every run hits
+the stub:
+
+    python -m benchmarks.idea_streaming --ideas 5 10 --tokens-per-second 60
+
+With --http, POST /api/v1/content/generate-ideas/stream is also sent through the whole app
+(every middleware, Accept-Encoding: gzip) for a throwaway user, and idea events are timed
+as they reach the client - once with the app as deployed and once with Starlette's plain
+GZipMiddleware in front, which holds the events in its zlib buffer until the stream ends
+(needs the database):
+
+    python -m benchmarks.idea_streaming --ideas 5 --tokens-per-second 20 --http
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import uuid
+import zlib
+from types import SimpleNamespace
+
+from starlette.middleware.gzip import GZipMiddleware
+
+from app.services.ai_service import AIService, ai_service
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+def completion_text(count: int) -> str:
+    ideas = [
+        {
+            "title": f"Idea {i + 1}: a compelling hook about the topic",
+            "description": "Two or three sentences describing the angle, the format and why it will resonate "
+                           "with the audience on this platform.",
+            "engagement_score": 70 + i,
+            "hashtags": ["#creator", "#growth", "#viral", "#tips"]
+        }
+        for i in range(count)
+    ]
+    return json.dumps(ideas, indent=2)
+
+
+class StubCompletions:
+    def __init__(self, text: str, tokens_per_second: float):
+        self.text = text
+        self.token_seconds = 1.0 / tokens_per_second
+
+    async def _stream(self):
+        for offset in range(0, len(self.text), CHARS_PER_TOKEN):
+            await asyncio.sleep(self.token_seconds)
+            delta = SimpleNamespace(content=self.text[offset:offset + CHARS_PER_TOKEN])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def create(self, stream: bool = False, **kwargs):
+        if stream:
+            return self._stream()
+        token_count = -(-len(self.text) // CHARS_PER_TOKEN)
+        await asyncio.sleep(token_count * self.token_seconds)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))],
+            usage=SimpleNamespace(total_tokens=token_count)
+        )
+
+
+def make_service(count: int, tokens_per_second: float) -> AIService:
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    completions = StubCompletions(completion_text(count), tokens_per_second)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+async def stream_over_http(app, token: str, count: int):
+    """Seconds at which each idea event reached the client, and the response's Content-Encoding."""
+    body = json.dumps({"topic": "morning routines", "count": count, "use_cache": False}).encode()
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/api/v1/content/generate-ideas/stream", "raw_path": b"/api/v1/content/generate-ideas/stream",
+        "query_string": b"", "root_path": "", "client": ("10.0.0.1", 1234), "server": ("testserver", 80),
+        "headers": [
+            (b"host", b"testserver"), (b"accept-encoding", b"gzip"), (b"content-type", b"application/json"),
+            (b"authorization", f"Bearer {token}".encode())
+        ]
+    }
+    start = time.perf_counter()
+    arrivals, encoding, decoder = [], None, None
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.sleep(3600)
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal encoding, decoder
+        if message["type"] == "http.response.start":
+            encoding = dict(message["headers"]).get(b"content-encoding", b"").decode() or None
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+            return
+        chunk = message.get("body", b"")
+        text = (decoder.decompress(chunk) if decoder else chunk).decode()
+        arrivals.extend(time.perf_counter() - start for _ in range(text.count("event: idea")))
+
+    await app(scope, receive, send)
+    return arrivals, encoding
+
+
+async def main_http(args: argparse.Namespace) -> None:
+    from sqlalchemy import delete
+
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.models.content import GeneratedContent
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        user = User(email=f"stream-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai", full_name="Stream Bench", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+    token = create_access_token({"sub": str(user_id)})
+    settings.IDEA_DEDUP_ENABLED = False  # ✅ Every run streams the same stub ideas
+    try:
+        for count in args.ideas:
+            for label, stack in (("app", app), ("plain GZipMiddleware", GZipMiddleware(app, minimum_size=1000))):
+                ai_service.client = make_service(count, args.tokens_per_second).client
+                arrivals, encoding = await stream_over_http(stack, token, count)
+                logger.info(
+                    f"ideas={count:<3} http via {label:<20}: first={arrivals[0]:.2f}s last={arrivals[-1]:.2f}s "
+                    f"({len(arrivals)} ideas, content-encoding={encoding})"
+                )
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    for count in args.ideas:
+        service = make_service(count, args.tokens_per_second)
+        start = time.perf_counter()
+        ideas = await service.generate_content_ideas("morning routines", "fitness", "parents", count)
+        blocking = time.perf_counter() - start
+
+        service = make_service(count, args.tokens_per_second)
+        start = time.perf_counter()
+        arrivals = []
+        async for _ in service.stream_content_ideas("morning routines", "fitness", "parents", count):
+            arrivals.append(time.perf_counter() - start)
+
+        logger.info(
+            f"ideas={count:<3} blocking: first=all={blocking:.2f}s ({len(ideas)} ideas) | "
+            f"streaming: first={arrivals[0]:.2f}s last={arrivals[-1]:.2f}s ({len(arrivals)} ideas) | "
+            f"time-to-first-idea {blocking / arrivals[0]:.1f}x faster"
+        )
+    if args.http:
+        await main_http(args)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ideas", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--tokens-per-second", type=float, default=60)
+    parser.add_argument("--http", action="store_true")
+    asyncio.run(main(parser.parse_args()))
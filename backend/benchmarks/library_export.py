@@ -0,0 +1,140 @@
+"""
+Whole-library export: streaming server-side cursor vs load-everything, peak RSS and throughput.
+
+Seeds --rows generated_content rows (every 20th a repurposed video with a --content-kb
+transcript) and one content_analytics row per 10 items for a throwaway user, then exports
+them through ExportService.stream (gzipped NDJSON of everything, gzipped CSV of content)
+and through the naive path (fetch all rows, serialize, gzip). RSS is sampled from
+/proc/self/statm after every chunk; growth is reported over the RSS before each export:
+
+    python -m benchmarks.library_export --rows 500000 --batch-rows 1000
+"""
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import time
+import uuid
+
+from sqlalchemy import delete, insert
+
+from app.core.database import AsyncSessionLocal
+from app.models.content import ContentAnalytics, ContentType, GeneratedContent
+from app.models.user import User
+from app.services.content_service import content_service
+from app.services.export_service import ExportService, _ndjson_batch, _ndjson_encoders
+
+logger = logging.getLogger(__name__)
+
+SEED_CHUNK = 50000
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"export-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Export Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def seed(user_id: uuid.UUID, rows: int, content_kb: int) -> int:
+    transcript = ("so today we are talking about morning routines " * (content_kb * 22))[:content_kb * 1024]
+    analytics = 0
+    for offset in range(0, rows, SEED_CHUNK):
+        chunk = []
+        for i in range(offset, min(offset + SEED_CHUNK, rows)):
+            video = i % 20 == 0
+            chunk.append({
+                "user_id": user_id,
+                "content_type": ContentType.REPURPOSED_VIDEO if video else ContentType.IDEA,
+                "title": f"Item {i}: a compelling hook",
+                "content": transcript if video else "Two sentences about the angle and why it resonates.",
+                "content_metadata": {"topic": f"topic {i % 500}", "engagement_potential": i % 100}
+            })
+        async with AsyncSessionLocal() as session:
+            ids = await content_service.bulk_insert_rows(session, chunk, commit=False)
+            stats = [
+                {"content_id": content_id, "platform": "tiktok", "views": i * 7, "likes": i, "audience_data": {"US": 0.6}}
+                for i, content_id in enumerate(ids[::10])
+            ]
+            await session.execute(insert(ContentAnalytics), stats)
+            await session.commit()
+            analytics += len(stats)
+    return analytics
+
+
+async def streamed(service: ExportService, user_id: uuid.UUID, fmt: str, resource: str):
+    peak = sent = 0
+    async for chunk in service.stream(user_id, fmt, resource):
+        sent += len(chunk)
+        peak = max(peak, rss_bytes())
+    return sent, peak
+
+
+async def naive(service: ExportService, user_id: uuid.UUID, fmt: str, resource: str):
+    parts = []
+    peak = 0
+    async with AsyncSessionLocal() as session:
+        for record, stmt, raw_json in service._statements(user_id, resource, None):
+            result = await session.execute(stmt)
+            columns = list(result.keys())
+            rows = result.all()
+            peak = max(peak, rss_bytes())
+            parts.append(_ndjson_batch(record, columns, rows, _ndjson_encoders(stmt, raw_json)))
+            peak = max(peak, rss_bytes())
+    body = gzip.compress("".join(parts).encode(), compresslevel=6)
+    return len(body), max(peak, rss_bytes())
+
+
+async def main(args: argparse.Namespace) -> None:
+    service = ExportService(batch_rows=args.batch_rows)
+    user_id = await create_user()
+    try:
+        started = time.perf_counter()
+        analytics = await seed(user_id, args.rows, args.content_kb)
+        logger.info(f"seeded content={args.rows} analytics={analytics} in {time.perf_counter() - started:.1f}s")
+
+        # ✅ Streaming first: RSS the naive path grows is not returned to the OS afterwards
+        runs = [("stream", streamed, "ndjson", "all"), ("stream", streamed, "csv", "content"), ("naive", naive, "ndjson", "all")]
+        for name, path, fmt, resource in runs:
+            rows = args.rows + (analytics if resource == "all" else 0)
+            before = rss_bytes()
+            start = time.perf_counter()
+            sent, peak = await path(service, user_id, fmt, resource)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{name:<6} {fmt:<6} {resource:<7} rows={rows:<7} time={elapsed:>6.1f}s rows_per_s={rows / elapsed:>8.0f} "
+                f"gzip={sent / 2 ** 20:>6.1f}MiB rss_before={before / 2 ** 20:>6.0f}MiB "
+                f"peak_rss_growth={(peak - before) / 2 ** 20:>6.1f}MiB"
+            )
+    finally:
+        await drop_user(user_id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    parser.add_argument("--content-kb", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Login burst benchmark: inline bcrypt vs the async PasswordHasher pool.
+
+Fires a burst of concurrent password verifications while a heartbeat coroutine measures
+event-loop lag, and reports per-login p50/p99 plus the worst stall seen by other coroutines:
+
+    python -m benchmarks.password_hashing_burst --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+from passlib.context import CryptContext
+
+from app.core.password_hashing import PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+
+async def heartbeat(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_burst(name: str, verify, hashed: str, logins: int) -> Dict:
+    stop = asyncio.Event()
+    lags: List[float] = []
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0)
+
+    # ✅ Latency is measured from burst arrival, so time spent queued behind a blocked loop counts
+    burst_start = time.perf_counter()
+
+    async def one_login() -> float:
+        await verify("CorrectHorse9", hashed)
+        return time.perf_counter() - burst_start
+
+    latencies = await asyncio.gather(*(one_login() for _ in range(logins)))
+    stop.set()
+    await monitor
+    return {
+        "mode": name,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "max_loop_lag_ms": round(max(lags or [0.0]) * 1000, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    hashed = context.hash("CorrectHorse9")
+
+    async def inline_verify(password: str, hashed_password: str) -> bool:
+        return context.verify(password, hashed_password)
+
+    hasher = PasswordHasher(context, max_workers=args.workers, max_concurrency=args.workers, max_queue=args.logins)
+    results = [
+        await run_burst("inline", inline_verify, hashed, args.logins),
+        await run_burst(f"pool[{args.workers}]", hasher.verify, hashed, args.logins),
+    ]
+    hasher.shutdown()
+
+    for result in results:
+        logger.info(
+            f"{result['mode']:<10} p50={result['p50_ms']}ms p99={result['p99_ms']}ms "
+            f"max_loop_lag={result['max_loop_lag_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
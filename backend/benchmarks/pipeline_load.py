@@ -0,0 +1,116 @@
+"""
+Offline load test of the content pipeline against the local AI simulator (no credits spent).
+
+--users virtual creators run for --seconds each, looping over the two pipelines:
+  ideas      generate_content_ideas (cache off) for a distinct topic
+  repurpose  Whisper on a synthetic --minutes media file, map-reduce summary, then
+             repurposing for --platforms platforms
+Simulator latency, speed and error rate are flags, so capacity can be planned for a given
+upstream profile. Same --seed, same outputs:
+
+    python -m benchmarks.pipeline_load --users 10 50 --seconds 10 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import math
+import os
+import statistics
+import tempfile
+import time
+
+from app.services.ai_provider import AUDIO_BYTES_PER_SECOND, SimulatedAIClient
+from app.services.ai_service import AIService
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ["youtube", "instagram", "tiktok", "linkedin", "twitter", "facebook"]
+
+
+def percentile(values, fraction: float) -> float:
+    return sorted(values)[max(0, math.ceil(len(values) * fraction) - 1)] if values else 0.0
+
+
+async def run(args: argparse.Namespace, users: int, media_path: str) -> None:
+    client = SimulatedAIClient(
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        ms_per_token=args.ms_per_token,
+        error_rate=args.error_rate,
+        transcribe_realtime_factor=args.realtime_factor
+    )
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False), client=client)
+    platforms = PLATFORMS[:args.platforms]
+    topics = itertools.count()
+    latencies = {"ideas": [], "repurpose": []}
+    failures = {"ideas": 0, "repurpose": 0}
+    stop_at = time.perf_counter() + args.seconds
+
+    async def ideas() -> None:
+        await service.generate_content_ideas(f"topic {next(topics)}", "fitness", "parents", 5, use_cache=False)
+
+    async def repurpose() -> None:
+        transcript = await service.transcribe_file(media_path)
+        summary = await service.summarize_transcript(transcript)
+        await service.repurpose_content_with_report(
+            transcript, f"Video {next(topics)}", "", platforms, "casual", summary=summary
+        )
+
+    async def user(index: int) -> None:
+        for step in itertools.count(index):
+            if time.perf_counter() >= stop_at:
+                return
+            name, pipeline = ("repurpose", repurpose) if step % args.repurpose_every == 0 else ("ideas", ideas)
+            start = time.perf_counter()
+            try:
+                await pipeline()
+                latencies[name].append(time.perf_counter() - start)
+            except Exception:
+                failures[name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - start
+
+    for name, values in latencies.items():
+        logger.info(
+            f"users={users:<4} {name:<9} done={len(values):<5} failed={failures[name]:<3} "
+            f"throughput={len(values) / elapsed:>6.2f}/s p50={statistics.median(values) if values else 0:>6.2f}s "
+            f"p95={percentile(values, 0.95):>6.2f}s"
+        )
+    stats = client.stats()
+    logger.info(
+        f"users={users:<4} upstream calls={stats['calls']} errors={stats['errors']} "
+        f"tokens={stats['prompt_tokens'] + stats['completion_tokens']} breaker={service.breaker.state} "
+        f"chat_limit={service.chat_caller.limiter.limit:.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as media:
+        media.write(os.urandom(int(args.minutes * 60 * AUDIO_BYTES_PER_SECOND)))
+        media.flush()
+        for users in args.users:
+            await run(args, users, media.name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--minutes", type=float, default=8.0, help="Media duration for repurposing")
+    parser.add_argument("--platforms", type=int, default=4)
+    parser.add_argument("--repurpose-every", type=int, default=5, help="Every Nth request is a repurpose")
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--ms-per-token", type=float, default=15.0)
+    parser.add_argument("--realtime-factor", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Concurrency + latency benchmark for quota accounting against the configured DATABASE_URL.
+
+Creates a FREE-plan user, fires N concurrent "generate" requests through the legacy ORM
+read-modify-write path and through QuotaService.reserve, and reports how many were granted
+(should equal the plan limit) and the mean time per check-and-consume:
+
+    python -m benchmarks.quota_concurrency --requests 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import delete, select
+
+from app.core.config import SUBSCRIPTION_QUOTAS
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.quota_service import quota_service
+
+logger = logging.getLogger(__name__)
+
+
+async def create_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"quota-bench-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Quota Bench",
+            hashed_password="x"
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_user(user_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def legacy_consume(user_id: uuid.UUID) -> bool:
+    async with AsyncSessionLocal() as session:
+        user = (await session.execute(select(User).where(User.id == user_id))).scalars().one()
+        if not user.can_generate_content_ideas():
+            return False
+        user.increment_content_ideas_used()
+        await session.commit()
+        return True
+
+
+async def atomic_consume(user_id: uuid.UUID) -> bool:
+    async with AsyncSessionLocal() as session:
+        return await quota_service.reserve(session, user_id, "content_ideas") is not None
+
+
+async def run(name: str, consume, requests: int) -> None:
+    user_id = await create_user()
+    try:
+        start = time.perf_counter()
+        granted = await asyncio.gather(*(consume(user_id) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        limit = SUBSCRIPTION_QUOTAS["FREE"]["content_ideas_per_month"]
+        logger.info(
+            f"{name:<8} granted={sum(granted)}/{requests} (limit {limit}) "
+            f"mean={elapsed / requests * 1000:.2f}ms/op total={elapsed * 1000:.0f}ms"
+        )
+    finally:
+        await drop_user(user_id)
+
+
+async def main(args: argparse.Namespace) -> None:
+    await run("legacy", legacy_consume, args.requests)
+    await run("atomic", atomic_consume, args.requests)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,174 @@
+"""
+Multi-worker check for the sliding-window rate limiter (RateLimitMiddleware + Redis backend).
+
+Each simulated uvicorn worker is its own RateLimitMiddleware and RateLimiter with its own
+Redis client; all clients share one fakeredis server (the Lua script runs through lupa),
+as real workers share one Redis. Requests are spread round-robin over --workers workers
+and sent concurrently through the ASGI middleware. Checks:
+
+  shared limit   one client IP gets exactly --limit requests per window across all
+                 workers (the in-memory backend, per process, is shown for contrast)
+  sliding window requests are allowed again once the window has passed
+  headers        RateLimit-* on every response, Retry-After on 429s
+  paid plan      a PRO user whose token is not in token_cache yet gets the PRO limit
+                 from the first request (needs the database; skip with --no-db)
+  fail-open      requests pass when Redis is unreachable
+
+Exits non-zero if any check fails:
+
+    python -m benchmarks.rate_limit_workers --workers 4 --limit 20 --window-seconds 2
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import uuid
+
+import fakeredis
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimiter, RateLimitMiddleware, RedisRateLimitBackend
+from app.core.token_cache import token_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, ip: str = "10.0.0.1", token: str = None):
+    """One GET through an ASGI app: (status, headers)."""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/content/history", "headers": headers, "client": (ip, 1234)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}
+
+
+def workers(backends, limit: int, window_seconds: int):
+    return [
+        RateLimitMiddleware(
+            ok_app,
+            limiter=RateLimiter(backend, default_limit=limit, plan_limits=settings.RATE_LIMIT_PLAN_OVERRIDES, window_seconds=window_seconds)
+        )
+        for backend in backends
+    ]
+
+
+async def burst(apps, requests: int, **kwargs):
+    return await asyncio.gather(*(call(apps[i % len(apps)], **kwargs) for i in range(requests)))
+
+
+class DownRedis:
+    """A Redis client whose every script call fails (connection refused)."""
+
+    def register_script(self, script):
+        async def run(keys, args):
+            raise ConnectionError("Connection refused")
+        return run
+
+
+async def check_paid_plan(apps, failures) -> None:
+    from app.core.database import AsyncSessionLocal
+    from app.core.security import create_access_token
+    from app.models.user import SubscriptionPlan, User
+
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=f"ratelimit-check-{uuid.uuid4().hex[:8]}@creatorhub.ai",
+            full_name="Rate Limit Check",
+            hashed_password="x",
+            subscription_plan=SubscriptionPlan.PRO
+        )
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+    try:
+        token = create_access_token({"sub": str(user_id)})
+        token_cache.clear()
+        pro_limit = settings.RATE_LIMIT_PLAN_OVERRIDES["PRO"]
+        status, headers = await call(apps[0], token=token)
+        results = [(status, headers)] + await burst(apps, pro_limit + 10, token=token)
+        allowed = sum(status == 200 for status, _ in results)
+        logger.info(f"paid plan: first response RateLimit-Limit={headers.get('ratelimit-limit')}, {allowed} allowed")
+        if headers.get("ratelimit-limit") != str(pro_limit) or allowed != pro_limit:
+            failures.append(f"uncached PRO token limited to {headers.get('ratelimit-limit')} ({allowed} allowed), expected {pro_limit}")
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    failures = []
+    server = fakeredis.FakeServer()
+    redis_workers = workers(
+        [RedisRateLimitBackend(fakeredis.aioredis.FakeRedis(server=server)) for _ in range(args.workers)],
+        args.limit, args.window_seconds
+    )
+    memory_workers = workers([InMemoryRateLimitBackend() for _ in range(args.workers)], args.limit, args.window_seconds)
+
+    # ✅ Shared limit across workers
+    results = await burst(redis_workers, args.limit * 3)
+    allowed = sum(status == 200 for status, _ in results)
+    memory_allowed = sum(status == 200 for status, _ in await burst(memory_workers, args.limit * 3))
+    logger.info(
+        f"shared limit: {args.limit * 3} requests over {args.workers} workers -> {allowed} allowed with redis, "
+        f"{memory_allowed} with per-process memory (limit {args.limit})"
+    )
+    if allowed != args.limit:
+        failures.append(f"{allowed} requests allowed across workers, expected {args.limit}")
+
+    # ✅ Headers
+    limited = [headers for status, headers in results if status == 429]
+    if not all("ratelimit-limit" in headers for _, headers in results):
+        failures.append("RateLimit-* headers missing")
+    if not limited or not all(int(headers.get("retry-after", 0)) >= 1 for headers in limited):
+        failures.append("Retry-After missing on 429 responses")
+
+    # ✅ Sliding window
+    await asyncio.sleep(args.window_seconds + 0.2)
+    allowed_again = sum(status == 200 for status, _ in await burst(redis_workers, args.limit))
+    logger.info(f"sliding window: {allowed_again}/{args.limit} allowed after {args.window_seconds}s")
+    if allowed_again != args.limit:
+        failures.append(f"only {allowed_again} requests allowed after the window passed")
+
+    # ✅ Paid plan before the token is cached
+    if not args.no_db:
+        await check_paid_plan(redis_workers, failures)
+
+    # ✅ Fail-open
+    down = workers([RedisRateLimitBackend(DownRedis())], args.limit, args.window_seconds)
+    statuses = {status for status, _ in await burst(down, args.limit * 2)}
+    logger.info(f"fail-open: statuses with redis down {sorted(statuses)}")
+    if statuses != {200}:
+        failures.append(f"requests rejected while redis is down: {sorted(statuses)}")
+
+    for failure in failures:
+        logger.error(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    logger.info("OK")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--window-seconds", type=int, default=2)
+    parser.add_argument("--no-db", action="store_true")
+    asyncio.run(main(parser.parse_args()))
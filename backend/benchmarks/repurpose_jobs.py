@@ -0,0 +1,163 @@
+"""
+End-to-end check of background repurpose jobs with Celery in eager mode.
+
+Runs the whole app in-process (TestClient): Celery runs tasks eagerly with an in-memory
+result backend and job_registry uses fakeredis, so neither a broker nor Redis is needed.
+For two throwaway users it submits POST /repurpose-video/jobs (synthetic MP4, the AI
+simulator does the transcription and repurposing) and checks:
+
+  owner          GET /jobs/{id} is completed with a result; /jobs/{id}/events streams
+                 progress events and ends with `done`
+  other user     404 on both endpoints for a job someone else submitted
+  unknown id     404 on both endpoints (Celery alone would report it as queued)
+  deadline       /events for a job that never leaves the queue ends with `timeout`
+                 after JOB_EVENTS_MAX_SECONDS (set to --deadline-seconds)
+
+Spooled uploads and cached transcripts go to a temporary directory, not uploads/.
+Needs the database and the simulator; exits non-zero if any check fails:
+
+    AI_PROVIDER=simulator python -m benchmarks.repurpose_jobs --deadline-seconds 2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import fakeredis
+from sqlalchemy import delete
+from starlette.testclient import TestClient
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import create_access_token
+from app.main import app
+from app.models.content import GeneratedContent
+from app.models.user import User
+from app.services.job_registry import job_registry
+from app.services.media_ingest import media_ingestor
+from app.services.transcript_cache import transcript_cache
+
+logger = logging.getLogger(__name__)
+
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+
+async def create_user(label: str) -> uuid.UUID:
+    async with AsyncSessionLocal() as session:
+        user = User(email=f"jobs-check-{label}-{uuid.uuid4().hex[:8]}@creatorhub.ai", full_name="Jobs Check", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def drop_users(user_ids) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(GeneratedContent).where(GeneratedContent.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+def auth(user_id: uuid.UUID):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def events(client: TestClient, job_id: str, headers):
+    """(status, [(event, data)]) of /jobs/{job_id}/events."""
+    with client.stream("GET", f"/api/v1/content/jobs/{job_id}/events", headers=headers) as response:
+        if response.status_code != 200:
+            return response.status_code, []
+        received = []
+        for block in response.read().decode().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+            if "event" in lines:
+                received.append((lines["event"], lines.get("data")))
+        return response.status_code, received
+
+
+def main(args: argparse.Namespace) -> None:
+    if settings.AI_PROVIDER != "simulator":
+        logger.error("FAIL: run with AI_PROVIDER=simulator")
+        sys.exit(1)
+    celery_app.conf.update(task_always_eager=True, result_backend="cache+memory://")
+    job_registry.client = fakeredis.aioredis.FakeRedis()
+    settings.JOB_EVENTS_MAX_SECONDS = args.deadline_seconds
+    work_dir = tempfile.TemporaryDirectory(prefix="jobs-check-")
+    media_ingestor.spool_dir = os.path.join(work_dir.name, "spool")
+    transcript_cache.directory = os.path.join(work_dir.name, "transcripts")
+
+    failures = []
+    # ✅ One event loop (the client's portal) for the app, the database and fakeredis
+    with work_dir, TestClient(app) as client:
+        owner_id, other_id = client.portal.call(create_user, "owner"), client.portal.call(create_user, "other")
+        try:
+            run_checks(client, args, owner_id, other_id, failures)
+        finally:
+            client.portal.call(drop_users, [owner_id, other_id])
+    for failure in failures:
+        logger.error(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    logger.info("OK")
+
+
+def run_checks(client: TestClient, args: argparse.Namespace, owner_id, other_id, failures) -> None:
+    owner, other = auth(owner_id), auth(other_id)
+    started = time.perf_counter()
+    response = client.post(
+        "/api/v1/content/repurpose-video/jobs",
+        headers=owner,
+        data={"title": "Morning routine", "target_platforms": "youtube,tiktok"},
+        files={"video_file": ("clip.mp4", MP4_HEADER + os.urandom(args.kilobytes * 1024), "video/mp4")}
+    )
+    logger.info(f"submit: {response.status_code} in {(time.perf_counter() - started) * 1000:.0f}ms")
+    if response.status_code != 202:
+        failures.append(f"submit returned {response.status_code}: {response.text}")
+        return
+    job_id = response.json()["job_id"]
+
+    # ✅ Owner
+    job = client.get(f"/api/v1/content/jobs/{job_id}", headers=owner).json()
+    logger.info(f"owner status: state={job.get('state')} stage={job.get('stage')} progress={job.get('progress')}")
+    if job.get("state") != "completed" or not job.get("result"):
+        failures.append(f"owner got {job}, expected a completed job with a result")
+    status, received = events(client, job_id, owner)
+    names = [name for name, _ in received]
+    logger.info(f"owner events: {status} {names}")
+    if status != 200 or names[-1:] != ["done"] or "progress" not in names:
+        failures.append(f"owner events ended with {names}, expected progress then done")
+
+    # ✅ Other user and unknown id
+    unknown = str(uuid.uuid4())
+    statuses = {
+        "other user status": client.get(f"/api/v1/content/jobs/{job_id}", headers=other).status_code,
+        "other user events": events(client, job_id, other)[0],
+        "unknown id status": client.get(f"/api/v1/content/jobs/{unknown}", headers=owner).status_code,
+        "unknown id events": events(client, unknown, owner)[0],
+    }
+    logger.info(f"not found: {statuses}")
+    failures.extend(f"{check} returned {code}, expected 404" for check, code in statuses.items() if code != 404)
+
+    # ✅ Deadline: an issued id that is never picked up stays PENDING
+    stuck = str(uuid.uuid4())
+    client.portal.call(job_registry.register, stuck, owner_id)
+    started = time.perf_counter()
+    status, received = events(client, stuck, owner)
+    seconds = time.perf_counter() - started
+    names = [name for name, _ in received]
+    logger.info(f"queued job events: {status} {names} after {seconds:.1f}s")
+    if names[-1:] != ["timeout"] or seconds > args.deadline_seconds + 2:
+        failures.append(f"events for a queued job ended with {names} after {seconds:.1f}s, expected timeout")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deadline-seconds", type=int, default=2)
+    parser.add_argument("--kilobytes", type=int, default=256)
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing check for AIService.generate_content_ideas with a fake client.
+
+Fires N concurrent identical requests (plus variants that only differ in case/whitespace)
+at an AIService whose chat client sleeps for --latency seconds, with the response cache
+disabled so only coalescing is measured. Reports upstream calls, wall time and whether all
+callers got the same ideas; then repeats with a failing client to show every caller gets
+the same exception path (fallback ideas) from one upstream attempt. The fake returns a
+full set of ideas (a short one would trigger a re-ask); exits non-zero unless each run
+makes exactly one upstream call and every caller gets the same result:
+
+    python -m benchmarks.single_flight --callers 50 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+from app.services.ai_service import AIService
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_COUNT = re.compile(r"Generate (\d+) viral content ideas")
+
+
+class FakeCompletions:
+    def __init__(self, latency: float, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        count = int(_COUNT.search(messages[-1]["content"]).group(1))
+        ideas = [
+            {"title": f"Idea {self.calls}.{i + 1}", "description": "d", "engagement_score": 80, "hashtags": []}
+            for i in range(count)
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(ideas)))],
+            usage=SimpleNamespace(total_tokens=400)
+        )
+
+
+async def run(callers: int, latency: float, fail: bool, failures) -> None:
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    completions = FakeCompletions(latency, fail)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    topics = ["Morning routines", "  morning ROUTINES ", "morning routines!"]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        service.generate_content_ideas(topics[i % len(topics)], "fitness", "busy parents", 5, "TikTok")
+        for i in range(callers)
+    ))
+    elapsed = time.perf_counter() - start
+
+    identical = all(result == results[0] for result in results)
+    logger.info(
+        f"{'failing' if fail else 'healthy':<8} callers={callers:<4} upstream_calls={completions.calls} "
+        f"wall={elapsed:.2f}s identical_results={identical} stats={service.single_flight.stats()}"
+    )
+    mode = "failing" if fail else "healthy"
+    if completions.calls != 1:
+        failures.append(f"{mode}: {callers} identical callers made {completions.calls} upstream calls, expected 1")
+    if not identical:
+        failures.append(f"{mode}: callers got different results")
+
+
+async def main(args: argparse.Namespace) -> None:
+    failures = []
+    await run(args.callers, args.latency, fail=False, failures=failures)
+    await run(args.callers, args.latency, fail=True, failures=failures)
+    for failure in failures:
+        logger.error(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    logger.info("OK")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+"""
+Map-reduce summarization vs per-platform full-transcript prompting, with a stub chat client.
+
+Builds a synthetic transcript of --minutes of speech (~150 words/minute) and repurposes it
+for --platforms platforms three ways:
+  full      every platform prompt carries the whole transcript
+  summary   one map-reduce summary per video, shared by every platform prompt
+  gated     what the app does: summary only at/above AI_SUMMARY_MIN_TRANSCRIPT_TOKENS,
+            otherwise the transcript fitted into each platform prompt
+The stub bills prompt/completion tokens (counted with the prompt builder's encoder) and
+sleeps in proportion to them, so both token spend and wall-clock are comparable:
+
+    python -m benchmarks.transcript_summarization --minutes 10 60 --platforms 4
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.prompt_builder import count_tokens
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = (
+    "today we talk about building a morning routine that sticks protein sleep energy focus habit "
+    "workout coffee journaling walk sunlight phone notifications deep work break stretch water"
+).split()
+PLATFORMS = ["youtube", "instagram", "tiktok", "linkedin", "twitter", "facebook"]
+
+
+def synthetic_transcript(minutes: float, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    words, sentences = int(minutes * WORDS_PER_MINUTE), []
+    while words > 0:
+        length = rng.randint(8, 22)
+        sentences.append(" ".join(rng.choice(VOCABULARY) for _ in range(length)).capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+class BillingStub:
+    def __init__(self, prompt_seconds_per_token: float, completion_seconds_per_token: float):
+        self.prompt_seconds = prompt_seconds_per_token
+        self.completion_seconds = completion_seconds_per_token
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    async def create(self, messages, max_tokens, **kwargs):
+        prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+        completion_tokens = min(max_tokens, 400)
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        await asyncio.sleep(prompt_tokens * self.prompt_seconds + completion_tokens * self.completion_seconds)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="summary " * completion_tokens))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        )
+
+
+def make_service(args: argparse.Namespace, min_summary_tokens: int):
+    stub = BillingStub(args.prompt_ms_per_token / 1000, args.completion_ms_per_token / 1000)
+    service = AIService(response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False))
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=stub))
+    service.summarizer.min_transcript_tokens = min_summary_tokens
+    return service, stub
+
+
+async def full_transcript(service: AIService, transcript: str, platforms) -> None:
+    await asyncio.gather(*(
+        service._repurpose_for_platform(platform, transcript, "Morning routine", "", "casual")
+        for platform in platforms
+    ))
+
+
+async def map_reduce(service: AIService, transcript: str, platforms) -> None:
+    summary = await service.summarize_transcript(transcript)
+    await service.repurpose_content_with_report(
+        transcript, "Morning routine", "", platforms, "casual", summary=summary
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    platforms = PLATFORMS[:args.platforms]
+    for minutes in args.minutes:
+        transcript = synthetic_transcript(minutes)
+        logger.info(f"--- {minutes} min transcript, {count_tokens(transcript)} tokens, {len(platforms)} platforms")
+        for name, strategy, min_summary_tokens in (
+            ("full", full_transcript, 0),
+            ("summary", map_reduce, 0),
+            ("gated", map_reduce, settings.AI_SUMMARY_MIN_TRANSCRIPT_TOKENS),
+        ):
+            service, stub = make_service(args, min_summary_tokens)
+            start = time.perf_counter()
+            await strategy(service, transcript, platforms)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{name:<8} calls={stub.calls:<3} prompt_tokens={stub.prompt_tokens:<8} "
+                f"completion_tokens={stub.completion_tokens:<6} total={stub.prompt_tokens + stub.completion_tokens:<8} "
+                f"wall={elapsed:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[10, 60])
+    parser.add_argument("--platforms", type=int, default=4)
+    parser.add_argument("--prompt-ms-per-token", type=float, default=0.05)
+    parser.add_argument("--completion-ms-per-token", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
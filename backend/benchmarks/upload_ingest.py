@@ -0,0 +1,125 @@
+"""
+Upload ingestion benchmark: legacy UploadFile + temp-copy path vs the streaming ingestor.
+
+Feeds the same multipart body (synthetic MP4 header + padding) through both paths in
+64KB receive chunks. The legacy path parses with Starlette (spooled temp file), then copies
+into a NamedTemporaryFile once per transcription attempt; the streaming path writes one
+hashed spool file that every attempt reuses. Reports wall time, peak Python allocations
+(tracemalloc) and bytes written by the process (/proc/self/io wchar):
+
+    python -m benchmarks.upload_ingest --megabytes 20 100 --attempts 2
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from starlette.requests import Request
+
+from app.services.media_ingest import MediaIngestor
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY = b"benchmarkboundary"
+RECEIVE_CHUNK = 64 * 1024
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+
+def build_body(megabytes: int) -> bytes:
+    media = MP4_HEADER + os.urandom(1024) * (megabytes * 1024)
+    return (
+        b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="title"\r\n\r\nBenchmark\r\n'
+        b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="video_file"; filename="clip.mp4"\r\n'
+        b"Content-Type: video/mp4\r\n\r\n" + media + b"\r\n--" + BOUNDARY + b"--\r\n"
+    )
+
+
+def make_request(body: bytes) -> Request:
+    view = memoryview(body)
+    offset = 0
+
+    async def receive():
+        nonlocal offset
+        # ✅ Slice lazily so the benchmark itself never holds a second copy of the body
+        chunk = bytes(view[offset:offset + RECEIVE_CHUNK])
+        offset += len(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": offset < len(body)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)],
+    }
+    return Request(scope, receive)
+
+
+def bytes_written() -> int:
+    try:
+        with open("/proc/self/io") as io_stats:
+            for line in io_stats:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+async def legacy_path(body: bytes, attempts: int, work_dir: str) -> None:
+    form = await make_request(body).form()
+    upload = form["video_file"]
+    for _ in range(attempts):
+        with tempfile.NamedTemporaryFile(dir=work_dir, delete=False, suffix=".mp4") as temp_file:
+            await upload.seek(0)
+            shutil.copyfileobj(upload.file, temp_file)
+        os.unlink(temp_file.name)
+    await form.close()
+
+
+async def streaming_path(body: bytes, attempts: int, work_dir: str) -> None:
+    ingestor = MediaIngestor(spool_dir=work_dir, max_bytes=len(body))
+    upload = await ingestor.ingest(make_request(body))
+    for _ in range(attempts):
+        with upload.media.open() as handle:
+            handle.read(RECEIVE_CHUNK)  # ✅ Retries just reopen the same spool file
+    upload.media.discard()
+
+
+async def measure(name: str, path, body: bytes, attempts: int) -> None:
+    work_dir = tempfile.mkdtemp(prefix="ingest-bench-")
+    try:
+        tracemalloc.start()
+        written = bytes_written()
+        start = time.perf_counter()
+        await path(body, attempts, work_dir)
+        elapsed = time.perf_counter() - start
+        written = bytes_written() - written
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    logger.info(
+        f"{name:<10} body={len(body) / 1e6:>7.1f}MB time={elapsed:6.2f}s "
+        f"peak_alloc={peak / 1e6:7.2f}MB written={written / 1e6:8.1f}MB "
+        f"({written / len(body):.2f}x body)"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    for megabytes in args.megabytes:
+        body = build_body(megabytes)
+        await measure("legacy", legacy_path, body, args.attempts)
+        await measure("streaming", streaming_path, body, args.attempts)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--attempts", type=int, default=2, help="transcription attempts reading the upload")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+import asyncio
+import re
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_service import AIService, platform_timeout_seconds
+from app.services.fanout import FanOutExecutor
+from app.services.response_cache import ResponseCache
+
+DELAY_SECONDS = 0.1
+TIMEOUT_SECONDS = 0.5
+
+_USER = re.compile(r"Title: (\S+)")
+_PLATFORM = re.compile(r"Repurpose the following video for (\S+) ")
+
+
+class FakeCompletions:
+    """AsyncOpenAI chat.completions stand-in: one repurpose prompt per call, concurrency tracked."""
+
+    def __init__(self, failing=(), slow=()):
+        self.failing = set(failing)
+        self.slow = set(slow)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.user_in_flight = defaultdict(int)
+        self.peak_user_in_flight = defaultdict(int)
+
+    async def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        user, platform = _USER.search(prompt).group(1), _PLATFORM.search(prompt).group(1)
+        self.in_flight += 1
+        self.user_in_flight[user] += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.peak_user_in_flight[user] = max(self.peak_user_in_flight[user], self.user_in_flight[user])
+        try:
+            await asyncio.sleep(TIMEOUT_SECONDS * 2 if platform in self.slow else DELAY_SECONDS)
+            if platform in self.failing:
+                raise ValueError("invalid request")  # ✅ Not retryable: fails on the first attempt
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=f"{platform} caption #a #b"))],
+                usage=SimpleNamespace(prompt_tokens=80, completion_tokens=20)
+            )
+        finally:
+            self.in_flight -= 1
+            self.user_in_flight[user] -= 1
+
+
+def make_service(completions: FakeCompletions, global_limit: int = 4, per_user_limit: int = 2) -> AIService:
+    service = AIService(
+        response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False),
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+    service.fanout = FanOutExecutor(global_limit=global_limit, per_user_limit=per_user_limit, timeout_seconds=TIMEOUT_SECONDS)
+    return service
+
+
+async def repurpose(service: AIService, user: str, platforms):
+    started = time.perf_counter()
+    result = await service.repurpose_content_with_report(
+        transcript="A short transcript.",
+        original_title=user,  # ✅ Lets the fake client attribute calls to users
+        original_description="",
+        target_platforms=list(platforms),
+        user_id=user
+    )
+    return time.perf_counter() - started, result
+
+
+async def test_concurrency_caps_hold():
+    completions = FakeCompletions()
+    service = make_service(completions, global_limit=4, per_user_limit=2)
+
+    await asyncio.gather(*(repurpose(service, f"user{u}", [f"u{u}p{i}" for i in range(5)]) for u in range(4)))
+
+    assert completions.peak_in_flight == 4
+    assert max(completions.peak_user_in_flight.values()) == 2
+    assert service.fanout._user_semaphores == {}
+
+
+async def test_light_user_is_not_queued_behind_heavy_user():
+    completions = FakeCompletions()
+    service = make_service(completions, global_limit=4, per_user_limit=2)
+
+    heavy = asyncio.create_task(repurpose(service, "heavy", [f"heavy{i}" for i in range(12)]))
+    await asyncio.sleep(DELAY_SECONDS / 4)
+    light_seconds, light = await repurpose(service, "light", ["light0", "light1"])
+    heavy_seconds, _ = await heavy
+
+    # ✅ At most one round behind the global slots the heavy user already holds, plus its own
+    assert light_seconds < DELAY_SECONDS * 3
+    assert heavy_seconds > DELAY_SECONDS * 5
+    assert light.errors == {}
+
+
+async def test_failed_and_timed_out_platforms_get_fallbacks():
+    completions = FakeCompletions(failing={"broken"}, slow={"stuck"})
+    service = make_service(completions)
+
+    _, result = await repurpose(service, "user", ["youtube", "broken", "stuck", "tiktok"])
+
+    assert list(result.results) == ["youtube", "broken", "stuck", "tiktok"]
+    assert result.results["youtube"] == "youtube caption #a #b"
+    assert result.results["tiktok"] == "tiktok caption #a #b"
+    assert result.results["broken"].startswith("Fallback")
+    assert result.results["stuck"].startswith("Fallback")
+    assert result.timed_out == ["stuck"]
+    assert sorted(result.errors) == ["broken", "stuck"]
+    assert result.succeeded == ["youtube", "tiktok"]
+
+    # ✅ The abandoned call keeps running for single-flight joiners; let it finish
+    await asyncio.sleep(TIMEOUT_SECONDS * 2)
+    assert completions.in_flight == 0
+
+
+@pytest.mark.parametrize("platform_timeout, deadline, expected", [(45.0, 60.0, 60.0), (90.0, 60.0, 90.0)])
+def test_platform_timeout_never_undercuts_the_call_deadline(monkeypatch, platform_timeout, deadline, expected):
+    monkeypatch.setattr(settings, "AI_PLATFORM_TIMEOUT_SECONDS", platform_timeout)
+    monkeypatch.setattr(settings, "AI_CALL_DEADLINE_SECONDS", deadline)
+
+    assert platform_timeout_seconds() == expected
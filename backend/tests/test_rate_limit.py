@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.core.rate_limit import RateLimiter, RateLimitMiddleware, RedisRateLimitBackend
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+
+LIMIT = 5
+WINDOW_SECONDS = 1
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, ip: str = "10.0.0.1", token: str = None):
+    """One GET through an ASGI app: (status, headers)."""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/content/history", "headers": headers, "client": (ip, 1234)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+
+
+def worker(server: fakeredis.FakeServer, limit: int = LIMIT) -> RateLimitMiddleware:
+    """One simulated uvicorn worker: its own middleware, limiter and Redis client on the shared server."""
+    backend = RedisRateLimitBackend(fakeredis.aioredis.FakeRedis(server=server))
+    return RateLimitMiddleware(ok_app, limiter=RateLimiter(backend, default_limit=limit, plan_limits={}, window_seconds=WINDOW_SECONDS))
+
+
+async def burst(workers, requests: int, **kwargs):
+    return await asyncio.gather(*(call(workers[i % len(workers)], **kwargs) for i in range(requests)))
+
+
+@pytest.fixture
+def workers():
+    server = fakeredis.FakeServer()
+    return [worker(server) for _ in range(4)]
+
+
+async def test_limit_is_shared_across_workers(workers):
+    results = await burst(workers, LIMIT * 3)
+
+    assert sum(status == 200 for status, _ in results) == LIMIT
+    assert all(headers["ratelimit-limit"] == str(LIMIT) for _, headers in results)
+    assert all(int(headers["retry-after"]) >= 1 for status, headers in results if status == 429)
+
+
+async def test_clients_are_limited_separately(workers):
+    first = await burst(workers, LIMIT + 1, ip="10.0.0.1")
+    second = await burst(workers, LIMIT, ip="10.0.0.2")
+
+    assert [status for status, _ in first].count(429) == 1
+    assert all(status == 200 for status, _ in second)
+
+
+async def test_window_slides(workers):
+    await burst(workers, LIMIT)
+    assert (await call(workers[0]))[0] == 429
+
+    await asyncio.sleep(WINDOW_SECONDS + 0.1)
+    results = await burst(workers, LIMIT)
+
+    assert all(status == 200 for status, _ in results)
+
+
+async def test_backend_errors_fail_open():
+    class DownRedis:
+        def register_script(self, script):
+            async def run(keys, args):
+                raise ConnectionError("Connection refused")
+            return run
+
+    down = RateLimitMiddleware(ok_app, limiter=RateLimiter(RedisRateLimitBackend(DownRedis()), default_limit=1, plan_limits={}))
+
+    assert {status for status, _ in await burst([down], 5)} == {200}
+
+
+async def test_unknown_user_token_is_looked_up_once(monkeypatch, workers):
+    lookups = []
+
+    class NoUserSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def execute(self, statement):
+            lookups.append(statement)
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: None))
+
+    monkeypatch.setattr("app.core.database.AsyncSessionLocal", NoUserSession)
+    token_cache.clear()
+    token = create_access_token({"sub": str(uuid.uuid4())})
+
+    results = [await call(workers[i % len(workers)], token=token) for i in range(len(workers) * 2)]
+
+    assert all(status == 200 for status, _ in results[:LIMIT])
+    # ✅ One lookup per worker; later requests hit that worker's negative cache
+    assert len(lookups) == len(workers)
@@ -0,0 +1,84 @@
+import os
+import uuid
+
+import fakeredis
+import pytest
+from sqlalchemy import select
+
+from app.core.celery_app import celery_app
+from app.core.database import AsyncSessionLocal
+from app.core.security import create_access_token
+from app.models.user import User
+from app.services.job_registry import job_registry
+
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+
+@pytest.fixture(autouse=True)
+def eager_celery(monkeypatch):
+    """Tasks run in-process on apply_async with an in-memory result backend; job owners in fakeredis."""
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setitem(celery_app.conf, "result_backend", "cache+memory://")
+    monkeypatch.setattr(job_registry, "client", fakeredis.aioredis.FakeRedis())
+
+
+def auth(user_id: uuid.UUID):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def submit(client, user_id: uuid.UUID):
+    return client.post(
+        "/api/v1/content/repurpose-video/jobs",
+        headers=auth(user_id),
+        data={"title": "Morning routine", "target_platforms": "youtube,tiktok"},
+        files={"video_file": ("clip.mp4", MP4_HEADER + os.urandom(64 * 1024), "video/mp4")}
+    )
+
+
+def repurposes_used(client, user_id: uuid.UUID) -> int:
+    async def read() -> int:
+        async with AsyncSessionLocal() as session:
+            return (await session.execute(
+                select(User.video_repurposing_used_this_month).where(User.id == user_id)
+            )).scalar_one()
+    return client.portal.call(read)
+
+
+def test_submitted_job_completes(client, make_user):
+    user_id = make_user()
+
+    response = submit(client, user_id)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status_url"] == f"/api/v1/content/jobs/{body['job_id']}"
+
+    job = client.get(body["status_url"], headers=auth(user_id)).json()
+    assert job["state"] == "completed"
+    assert job["progress"] == 100
+    assert set(job["result"]["repurposed_content"]) == {"youtube", "tiktok"}
+    assert repurposes_used(client, user_id) == 1
+
+
+def test_failed_job_refunds_the_reservation(client, make_user, monkeypatch):
+    async def broken_pipeline(**kwargs):
+        raise RuntimeError("transcription backend down")
+
+    monkeypatch.setattr("app.tasks.content_tasks.repurpose_service.run", broken_pipeline)
+    user_id = make_user()
+
+    response = submit(client, user_id)
+    assert response.status_code == 202
+
+    job = client.get(response.json()["status_url"], headers=auth(user_id)).json()
+    assert job["state"] == "failed"
+    assert job["error"] == "transcription backend down"
+    assert job["result"] is None
+    assert repurposes_used(client, user_id) == 0
+
+
+def test_job_is_visible_to_its_owner_only(client, make_user):
+    owner_id, other_id = make_user(), make_user()
+    job_id = submit(client, owner_id).json()["job_id"]
+
+    assert client.get(f"/api/v1/content/jobs/{job_id}", headers=auth(other_id)).status_code == 404
+    assert client.get(f"/api/v1/content/jobs/{uuid.uuid4()}", headers=auth(owner_id)).status_code == 404
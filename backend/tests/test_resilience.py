@@ -0,0 +1,187 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.resilience import (
+    AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, DeadlineExceededError, ResilientCaller
+)
+
+OPEN_SECONDS = 0.05
+
+
+class UpstreamError(Exception):
+    """Injected upstream failure; status_code decides whether it is retryable."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+
+
+class FaultyUpstream:
+    """Scripted upstream: raises the queued faults in order, then answers 'ok'."""
+
+    def __init__(self, *faults, delay_seconds: float = 0.0):
+        self.faults = list(faults)
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay_seconds)
+        if self.faults:
+            raise self.faults.pop(0)
+        return "ok"
+
+
+def make_caller(breaker: CircuitBreaker = None, **kwargs) -> ResilientCaller:
+    options = {"attempt_timeout_seconds": 1.0, "deadline_seconds": 2.0, "max_retries": 2, "retry_base_seconds": 0.01}
+    options.update(kwargs)
+    return ResilientCaller(
+        "test",
+        breaker=breaker or CircuitBreaker(min_calls=1000),
+        limiter=AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=8),
+        **options
+    )
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=4, open_seconds=OPEN_SECONDS, half_open_max_calls=2)
+    for _ in range(4):
+        breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+# =========================================================
+# ✅ CIRCUIT BREAKER STATES
+# =========================================================
+def test_breaker_opens_on_failure_rate_and_rejects():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=4, open_seconds=60)
+    for ok in (True, True, False):
+        breaker.record(ok)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(False)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+async def test_open_then_half_open_then_closed():
+    breaker = open_breaker()
+    caller = make_caller(breaker)
+    upstream = FaultyUpstream()
+
+    with pytest.raises(CircuitOpenError):
+        await caller.call(upstream)
+    assert upstream.calls == 0
+
+    await asyncio.sleep(OPEN_SECONDS)
+    assert await caller.call(upstream) == "ok"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert await caller.call(upstream) == "ok"
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+async def test_failed_probe_reopens():
+    breaker = open_breaker()
+    caller = make_caller(breaker, max_retries=0)
+    await asyncio.sleep(OPEN_SECONDS)
+
+    with pytest.raises(UpstreamError):
+        await caller.call(FaultyUpstream(UpstreamError(503)))
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+
+
+async def test_cancelled_probe_does_not_close_the_breaker():
+    breaker = open_breaker()
+    caller = make_caller(breaker)
+    await asyncio.sleep(OPEN_SECONDS)
+
+    probes = [asyncio.create_task(caller.call(FaultyUpstream(delay_seconds=10))) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert breaker.allow() is False  # ✅ Both probe slots taken
+    for probe in probes:
+        probe.cancel()
+    await asyncio.gather(*probes, return_exceptions=True)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert await caller.call(FaultyUpstream()) == "ok"  # ✅ Slots were freed for real probes
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+async def test_non_retryable_errors_do_not_count_against_upstream():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=2)
+    caller = make_caller(breaker)
+    upstream = FaultyUpstream(UpstreamError(400), UpstreamError(400))
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            await caller.call(upstream)
+
+    assert upstream.calls == 2  # ✅ Not retried
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+# =========================================================
+# ✅ RETRIES AND DEADLINE
+# =========================================================
+async def test_transient_failures_are_retried():
+    upstream = FaultyUpstream(UpstreamError(503), UpstreamError(429))
+    caller = make_caller()
+
+    assert await caller.call(upstream) == "ok"
+    assert upstream.calls == 3
+    assert caller.stats()["retries"] == 2
+
+
+async def test_retries_exhausted_raise_the_last_error():
+    upstream = FaultyUpstream(*(UpstreamError(503) for _ in range(5)))
+    caller = make_caller(max_retries=2)
+
+    with pytest.raises(UpstreamError):
+        await caller.call(upstream)
+
+    assert upstream.calls == 3
+    assert caller.stats()["failures"] == 1
+
+
+async def test_retries_stop_at_the_deadline():
+    upstream = FaultyUpstream(*(UpstreamError(503) for _ in range(50)), delay_seconds=0.05)
+    caller = make_caller(deadline_seconds=0.3, max_retries=50, retry_base_seconds=0.02)
+
+    started = time.monotonic()
+    # ✅ The last attempt is clipped to what is left of the deadline
+    with pytest.raises((UpstreamError, asyncio.TimeoutError)):
+        await caller.call(upstream)
+
+    assert time.monotonic() - started < 0.3 + 0.1
+    assert 1 < upstream.calls < 50
+
+
+async def test_slow_attempt_is_cut_at_the_deadline():
+    caller = make_caller(attempt_timeout_seconds=5.0, deadline_seconds=0.1)
+
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        await caller.call(FaultyUpstream(delay_seconds=5))
+
+    assert time.monotonic() - started < 0.1 + 0.1
+
+
+async def test_deadline_runs_out_waiting_for_capacity():
+    caller = make_caller(deadline_seconds=0.05)
+    caller.limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=1)
+    busy = asyncio.create_task(caller.call(FaultyUpstream(delay_seconds=0.2), deadline_seconds=1.0))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(DeadlineExceededError):
+        await caller.call(FaultyUpstream())
+
+    assert await busy == "ok"
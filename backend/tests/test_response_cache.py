@@ -0,0 +1,116 @@
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.response_cache import ResponseCache, embed_text, normalize_text
+
+_COUNT = re.compile(r"Generate (\d+) viral content ideas")
+_TOPIC = re.compile(r"Topic: (.*)")
+
+# ✅ One word apart in meaning; the hashed n-gram embedding scores these 0.58-0.91
+NEAR_MISSES = [
+    ("gain weight", "lose weight"),
+    ("how to gain weight as a skinny guy", "how to lose weight as a skinny guy"),
+    ("meal plan to gain weight for beginners", "meal plan to lose weight for beginners"),
+    ("best exercises to gain weight at home", "best exercises to lose weight at home"),
+    ("high protein vegan recipes for muscle gain", "high protein vegan recipes for muscle loss"),
+]
+# ✅ Same request worded slightly differently
+NEAR_DUPLICATES = [
+    ("easy healthy breakfast ideas for busy mornings", "easy healthy breakfast ideas for busy morning"),
+    ("budget friendly meal prep ideas for college students", "budget friendly meal prep ideas for college student"),
+    ("beginner guide to investing in index funds", "beginners guide to investing in index funds"),
+]
+
+
+class FakeCompletions:
+    """AsyncOpenAI chat.completions stand-in: a full set of ideas for the prompt's topic."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        count, topic = int(_COUNT.search(prompt).group(1)), _TOPIC.search(prompt).group(1).strip()
+        ideas = [
+            {"title": f"{topic} #{i + 1}", "description": f"Idea {i + 1} about {topic}.", "engagement_score": 80, "hashtags": ["#a"]}
+            for i in range(count)
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(ideas)))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=300)
+        )
+
+
+@pytest.fixture
+def service():
+    cache = ResponseCache(
+        max_entries=100,
+        similarity_max_entries=100,
+        ttl_seconds=3600,
+        similarity_threshold=settings.AI_SIMILARITY_CACHE_THRESHOLD
+    )
+    return AIService(response_cache=cache, client=SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions())))
+
+
+async def ideas(service: AIService, topic: str, audience: str = "busy parents"):
+    return await service.generate_content_ideas(topic, "fitness", audience, 3, "TikTok")
+
+
+async def test_exact_hit(service):
+    first = await ideas(service, "Morning routines")
+    second = await ideas(service, "  morning ROUTINES! ")
+
+    assert second == first
+    assert service.client.chat.completions.calls == 1
+    assert service.response_cache.stats()["exact_hits"] == 1
+
+
+@pytest.mark.parametrize("topic, variant", NEAR_DUPLICATES)
+async def test_similarity_hit(service, topic, variant):
+    first = await ideas(service, topic)
+    second = await ideas(service, variant)
+
+    assert second == first
+    assert service.client.chat.completions.calls == 1
+    assert service.response_cache.stats()["similarity_hits"] == 1
+
+
+@pytest.mark.parametrize("topic, other", NEAR_MISSES)
+async def test_near_miss_topics_stay_misses(service, topic, other):
+    first = await ideas(service, topic)
+    second = await ideas(service, other)
+
+    assert second != first
+    assert service.client.chat.completions.calls == 2
+    assert service.response_cache.stats()["similarity_hits"] == 0
+
+
+async def test_other_audience_is_a_miss(service):
+    await ideas(service, "Morning routines", audience="busy parents")
+    await ideas(service, "Morning routines", audience="college students")
+
+    assert service.client.chat.completions.calls == 2
+
+
+async def test_use_cache_false_bypasses_both_tiers(service):
+    await ideas(service, "Morning routines")
+    await service.generate_content_ideas("Morning routines", "fitness", "busy parents", 3, "TikTok", use_cache=False)
+
+    assert service.client.chat.completions.calls == 2
+    assert service.response_cache.stats()["bypassed"] == 1
+
+
+def test_threshold_margin():
+    """Every near-miss scores below the threshold and every near-duplicate above it."""
+    def score(a: str, b: str) -> float:
+        return float(embed_text(normalize_text(a)) @ embed_text(normalize_text(b)))
+
+    threshold = settings.AI_SIMILARITY_CACHE_THRESHOLD
+    assert max(score(a, b) for a, b in NEAR_MISSES) < threshold
+    assert min(score(a, b) for a, b in NEAR_DUPLICATES) >= threshold
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_service import AIService
+from app.services.response_cache import ResponseCache
+from app.services.single_flight import SingleFlight
+
+CALLERS = 20
+_COUNT = re.compile(r"Generate (\d+) viral content ideas")
+
+
+class FakeCompletions:
+    """AsyncOpenAI chat.completions stand-in: a full batch of ideas after a delay, or an error."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        count = int(_COUNT.search(messages[-1]["content"]).group(1))
+        ideas = [
+            {"title": f"Idea {self.calls}.{i + 1}", "description": "d", "engagement_score": 80, "hashtags": ["#a"]}
+            for i in range(count)
+        ]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(ideas)))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=300)
+        )
+
+
+def make_service(completions: FakeCompletions) -> AIService:
+    # ✅ Cache disabled: only coalescing can keep the upstream call count at one
+    return AIService(
+        response_cache=ResponseCache(0, 0, 0, 1.0, similarity_enabled=False),
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+
+
+async def test_identical_concurrent_calls_make_one_upstream_request():
+    completions = FakeCompletions()
+    service = make_service(completions)
+    topics = ["Morning routines", "  morning ROUTINES ", "morning routines!"]
+
+    results = await asyncio.gather(*(
+        service.generate_content_ideas(topics[i % len(topics)], "fitness", "busy parents", 5, "TikTok")
+        for i in range(CALLERS)
+    ))
+
+    assert completions.calls == 1
+    assert all(result == results[0] for result in results)
+    assert len(results[0]) == 5
+
+
+async def test_failing_upstream_is_tried_once_for_all_callers():
+    completions = FakeCompletions(fail=True)
+    service = make_service(completions)
+
+    results = await asyncio.gather(*(
+        service.generate_content_ideas("Morning routines", "fitness", "busy parents", 5, "TikTok")
+        for _ in range(CALLERS)
+    ))
+
+    assert completions.calls == 1
+    assert all(result == results[0] for result in results)
+    assert results[0][0]["title"].startswith("Content Idea #1")  # ✅ Fallback ideas
+
+
+async def test_different_requests_are_not_coalesced():
+    completions = FakeCompletions()
+    service = make_service(completions)
+
+    await asyncio.gather(
+        service.generate_content_ideas("Morning routines", "fitness", "busy parents", 5, "TikTok"),
+        service.generate_content_ideas("Evening routines", "fitness", "busy parents", 5, "TikTok"),
+        service.generate_content_ideas("Morning routines", "fitness", "busy parents", 3, "TikTok"),
+    )
+
+    assert completions.calls == 3
+
+
+async def test_shared_call_shares_the_exception():
+    flight, calls = SingleFlight(), []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("key", fail) for _ in range(5)), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "coalesced": 4}
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight, started = SingleFlight(), asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", slow))
+    await started.wait()
+    second = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_finished_call_is_not_reused():
+    flight, calls = SingleFlight(), []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    assert await flight.do("key", work) == 1
+    assert await flight.do("key", work) == 2
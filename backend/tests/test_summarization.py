@@ -0,0 +1,40 @@
+from app.services.prompt_builder import count_tokens
+from app.services.summarization import TranscriptSummarizer
+
+SENTENCE = "Today we build a morning routine that sticks with sleep, sunlight and a short walk. "
+
+
+def make_summarizer(min_transcript_tokens: int):
+    calls = []
+
+    async def summarize(text: str, target_tokens: int) -> str:
+        calls.append(count_tokens(text))
+        return "A short summary."
+
+    summarizer = TranscriptSummarizer(
+        summarize, chunk_tokens=500, summary_tokens=100, min_transcript_tokens=min_transcript_tokens
+    )
+    return summarizer, calls
+
+
+async def test_short_transcript_keeps_the_direct_path():
+    transcript = SENTENCE * 60
+    summarizer, calls = make_summarizer(min_transcript_tokens=count_tokens(transcript) + 1)
+
+    assert await summarizer.summarize_transcript(transcript, budget_tokens=200) is None
+    assert calls == []
+
+
+async def test_long_transcript_is_map_reduced():
+    transcript = SENTENCE * 60
+    summarizer, calls = make_summarizer(min_transcript_tokens=count_tokens(transcript) - 1)
+
+    assert await summarizer.summarize_transcript(transcript, budget_tokens=200) == "A short summary."
+    assert len(calls) > 2  # ✅ Several chunk summaries, then the reduce
+
+
+async def test_transcript_within_budget_is_never_summarized():
+    summarizer, calls = make_summarizer(min_transcript_tokens=0)
+
+    assert await summarizer.summarize_transcript(SENTENCE, budget_tokens=200) is None
+    assert calls == []